@@ -1,34 +1,98 @@
 from flask import Flask
-from flasgger import Swagger
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from datetime import timedelta
-from flask_migrate import Migrate
+import os
 
 db = SQLAlchemy()
 jwt = JWTManager()
 
 
-def create_app() :
+def create_app(config_name=None) :
+    """
+    Build the app for the named profile (development, testing, production),
+    defaulting to the STEAM_RECAP_CONFIG environment variable.
+    """
+    from sqlalchemy.exc import DBAPIError
+    from .config import config_by_name
+    from .utils.database import engine_options, install_sqlite_pragmas
+
     app = Flask(__name__)
-    app.config['SECRET_KEY'] = 'secret'
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///steam_recap.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.from_object(config_by_name[config_name or os.environ.get('STEAM_RECAP_CONFIG', 'development')])
+    app.config.from_prefixed_env('STEAM_RECAP')
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    if not app.config['RECOMMENDATION_LSH_PATH']:
+        app.config['RECOMMENDATION_LSH_PATH'] = os.path.join(app.instance_path, 'lsh_index')
+
+    if app.config['FAST_JSON']:
+        from .utils.json_provider import FastJSONProvider
+        app.json = FastJSONProvider(app)
 
     db.init_app(app)
-    migrate = Migrate(app, db)
+    with app.app_context():
+        install_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
+        from .services.instrumentation import instrumentation
+        instrumentation.init_app(app, db.engine)
+    from .services.passwords import password_hasher
+    password_hasher.init_app(app)
     jwt.init_app(app)
-    
-    swagger = Swagger(app)
+    from .services.token_blocklist import token_blocklist
+    token_blocklist.init_app(app)
+    jwt.token_in_blocklist_loader(token_blocklist.token_in_blocklist)
+    from .services.identity import identity_cache
+    identity_cache.init_app(app)
+    jwt.user_lookup_loader(identity_cache.user_lookup)
+    from .services.apidocs import api_docs
+    api_docs.init_app(app)
 
     from .blueprints.user import user_bp
     from .blueprints.genre import genre_bp
+    from .blueprints.recommendation import recommendation_bp
+    from .blueprints.recap import recap_bp
     app.register_blueprint(user_bp, url_prefix='/api')
     app.register_blueprint(genre_bp, url_prefix='/api')
+    app.register_blueprint(recommendation_bp, url_prefix='/api')
+    app.register_blueprint(recap_bp, url_prefix='/api')
+
+    from .commands import apidocs_cli, migrate_cli, recap_cli, recommendations_cli, steam_cli
+    app.cli.add_command(migrate_cli)
+    app.cli.add_command(recommendations_cli)
+    app.cli.add_command(steam_cli)
+    app.cli.add_command(recap_cli)
+    app.cli.add_command(apidocs_cli)
 
     with app.app_context():
         from .models.user import User
-        db.create_all()
+        from .models.genre import Genre
+        from .models.recommendation import Recommendation
+        from .models.recap import RecapSummary
+        if app.config['CREATE_ALL']:
+            db.create_all()
+
+        from .services.events import genres_changed
+        from .services.genre_index import genre_index
+        from .services.recommender import recommendation_service
+        from .services.refresh import recommendation_refresher
+        from .services.response_cache import response_cache
+        from .services.recap import recap_service
+        from .services.vocabulary import genre_vocabulary
+        genre_vocabulary.init_app(app)
+        try:
+            genre_vocabulary.load()
+            genre_index.build_from_db()
+        except DBAPIError as e:
+            # Keep booting so that `flask db upgrade` can still run
+            db.session.rollback()
+            app.logger.warning('Could not load the genre index, is the schema migrated? %s', e.orig)
+        recommendation_service.init_app(app)
+        recommendation_refresher.init_app(app)
+        response_cache.init_app(app)
+        recap_service.init_app(app)
+        genres_changed.connect(genre_index.on_genres_changed)
+        genres_changed.connect(recommendation_service.on_genres_changed)
+        genres_changed.connect(recommendation_refresher.on_genres_changed)
+        genres_changed.connect(response_cache.on_genres_changed)
+        genres_changed.connect(recap_service.on_genres_changed)
 
     return app
 
@@ -0,0 +1,265 @@
+#Import Library
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from a2wsgi import WSGIMiddleware
+from flask import jsonify
+from sqlalchemy import select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from werkzeug.exceptions import InternalServerError
+
+#Import Dependencies
+from app.models.genre import Genre, GenreTitle
+from app.models.user import User
+from app.services.events import GenreChange, genres_changed
+from app.services.genre_index import genre_index
+from app.services.passwords import PasswordPoolBusy, password_hasher
+from app.services.recommender import parse_limit, recommendation_service
+from app.services.response_cache import response_cache
+from app.services.token_blocklist import issue_tokens
+from app.utils.asgi import Request, input_terminated, read_body, replay, send_response
+from app.utils.database import async_database_uri, install_sqlite_pragmas
+from app.utils.titles import parse_titles
+
+
+class AsyncApi:
+    """
+    ASGI front end for the Flask app, served from asgi.py.
+
+    The login, user and genre create, genre lookup and recommendation
+    views have async versions here. They use an async SQLAlchemy engine
+    (aiosqlite for SQLite) and hand CPU-bound work to pools -- bcrypt to
+    the password hasher's, similarity scoring to ASGI_CPU_WORKERS threads
+    -- so a slow query or a hash parks a coroutine instead of holding a
+    worker thread. Every other request, and any request these views would
+    reject, goes to the Flask app through a2wsgi on ASGI_SYNC_THREADS
+    threads, so the blueprints' contract is unchanged either way. Only the
+    async views read the body up front; Flask views get it streamed, so
+    NDJSON bulk uploads are parsed as they arrive.
+
+    The async views skip Flask's request hooks (instrumentation and
+    profiling). None of the views they replace is response-cached.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        config = flask_app.config
+        uri = make_url(config['ASYNC_DATABASE_URI'] or async_database_uri(config['SQLALCHEMY_DATABASE_URI']))
+        if uri.get_backend_name() == 'sqlite' and uri.database in (None, '', ':memory:'):
+            raise ValueError('An in-memory SQLite database cannot be shared with the async engine')
+        self.engine = create_async_engine(uri, **config['SQLALCHEMY_ENGINE_OPTIONS'])
+        install_sqlite_pragmas(self.engine.sync_engine, config['SQLITE_PRAGMAS'])
+        self.sessions = async_sessionmaker(self.engine)
+        self.wsgi = WSGIMiddleware(input_terminated(flask_app), workers=config['ASGI_SYNC_THREADS'])
+        # Signal receivers and cache calls share the Flask fallback's threads
+        self._threads = self.wsgi.executor
+        self._cpu = ThreadPoolExecutor(config['ASGI_CPU_WORKERS'], thread_name_prefix='asgi-cpu')
+        self.routes = [(method, _route(pattern), view) for method, pattern, view in (
+            ('POST', '/api/user/create', self.create_user),
+            ('POST', '/api/user/login', self.login),
+            ('POST', '/api/genre/create', self.create_genre),
+            ('GET', '/api/genre/users', self.users_by_genre),
+            ('GET', '/api/recommendation/user/<user_id>', self.recommendation_for_user),
+            ('GET', '/api/recommendation/user/<user_id>/similar', self.similar_users),
+        )]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError('Unsupported ASGI scope type %s' % scope['type'])
+
+        view, kwargs = self._match(scope)
+        if view is not None:
+            body = await read_body(receive)
+            try:
+                response = await view(Request(scope, body), **kwargs)
+            except PasswordPoolBusy:
+                response = self._json({'error': 'Too many password operations in progress, retry shortly'}, 503)
+                response.headers['Retry-After'] = '1'
+            except Exception:
+                self.flask_app.logger.exception('Exception on %s [%s]', scope['path'], scope['method'])
+                response = InternalServerError().get_response()
+            if response is not None:
+                return await send_response(send, response)
+            receive = replay(body, receive)
+        await self.wsgi(scope, receive, send)
+
+    async def close(self):
+        await self.engine.dispose()
+        self._threads.shutdown(wait=False)
+        self._cpu.shutdown(wait=False)
+
+    # USER
+
+    async def create_user(self, request):
+        data = request.json()
+        if data is None or not {'user_name', 'user_email', 'user_password'} <= data.keys() \
+                or not isinstance(data['user_password'], str):
+            return None
+
+        new_user = User(user_name=data['user_name'], user_email=data['user_email'],
+                        user_password_hash=await password_hasher.hash_async(data['user_password']))
+        async with self.sessions() as session:
+            session.add(new_user)
+            await session.commit()
+            await session.refresh(new_user)
+        await self._call(self._threads, response_cache.invalidate, 'user')
+        return self._json(new_user.to_dict(), 201)
+
+    async def login(self, request):
+        data = request.json()
+        if data is None:
+            return None
+        email = data.get('user_email', None)
+        password = data.get('user_password', None)
+        if not email or not password:
+            return self._json({'error': 'Email and password are required'}, 400)
+        if not isinstance(password, str):
+            return None
+
+        async with self.sessions() as session:
+            user = (await session.execute(
+                select(User.user_id, User.user_password_hash).where(User.user_email == email).limit(1)
+            )).first()
+            if not user or not await password_hasher.verify_async(password, user.user_password_hash):
+                return self._json({'error': 'Invalid credentials'}, 401)
+
+            # Upgrade hashes made with an older cost factor while we have the password
+            if password_hasher.needs_rehash(user.user_password_hash):
+                password_hash = await password_hasher.hash_async(password)
+                await session.execute(
+                    update(User).where(User.user_id == user.user_id).values(user_password_hash=password_hash))
+                await session.commit()
+
+        with self.flask_app.app_context():
+            access_token, refresh_token = issue_tokens(user.user_id)
+            return self._json({'access_token': access_token, 'refresh_token': refresh_token})
+
+    # GENRE
+
+    async def create_genre(self, request):
+        data = request.json()
+        if data is None or 'genre_titles' not in data or 'user_id' not in data:
+            return None
+        try:
+            genre_titles = parse_titles(data['genre_titles'])
+        except (ValueError, SyntaxError):
+            return self._json({'error': 'genre_titles must be a list'}, 400)
+
+        async with self.sessions() as session:
+            try:
+                genre, changes = await session.run_sync(_create_genre, data['user_id'], genre_titles)
+            except IntegrityError as e:
+                return self._json({'error': 'Write violates a database constraint', 'detail': str(e.orig)}, 409)
+        # Receivers update in-memory indexes and may write (recaps), so
+        # they run as they do under Flask, only off the event loop
+        await self._call(self._threads, genres_changed.send, self.flask_app, changes=changes)
+        return self._json(genre, 201)
+
+    async def users_by_genre(self, request):
+        titles = request.args.get('title', [])
+        mode = request.arg('mode', 'and').lower()
+        if not titles:
+            return self._json({'error': 'At least one title is required'}, 400)
+        if mode not in ('and', 'or'):
+            return self._json({'error': 'mode must be and or or'}, 400)
+
+        user_ids = await self._call(self._cpu, genre_index.users_for, titles, mode == 'and')
+        return self._json({'user_ids': user_ids, 'count': len(user_ids)})
+
+    # RECOMMENDATION
+
+    async def recommendation_for_user(self, request, user_id):
+        try:
+            limit = parse_limit(request.arg('limit'))
+        except ValueError as e:
+            return self._json({'error': str(e)}, 400)
+
+        titles = recommendation_service.cache.get(user_id)
+        if titles is None:
+            async with self.sessions() as session:
+                owned = (await session.execute(
+                    select(GenreTitle.title_id).where(GenreTitle.user_id == user_id).distinct()
+                )).scalars().all()
+            if not owned:
+                return self._json({'error': 'No genres found for user'}, 404)
+            titles = await self._call(self._cpu, recommendation_service.recommend_for_title_ids, user_id, owned)
+        return self._json({'user_id': user_id, 'recommendation_titles': titles[:limit]})
+
+    async def similar_users(self, request, user_id):
+        try:
+            limit = parse_limit(request.arg('limit'))
+        except ValueError as e:
+            return self._json({'error': str(e)}, 400)
+
+        similar = await self._call(self._cpu, recommendation_service.similar_users, user_id, limit)
+        return self._json({'user_id': user_id, 'similar_users': [{'user_id': u, 'score': s} for u, s in similar]})
+
+    def _match(self, scope):
+        path = scope['path']
+        root_path = scope.get('root_path', '')
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        for method, pattern, view in self.routes:
+            if method == scope['method']:
+                match = pattern.fullmatch(path)
+                if match is not None:
+                    return view, match.groupdict()
+        return None, {}
+
+    def _json(self, obj, status=200):
+        with self.flask_app.app_context():
+            response = jsonify(obj)
+        response.status_code = status
+        return response
+
+    async def _call(self, executor, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) on `executor` inside an app context.
+        """
+        def call():
+            with self.flask_app.app_context():
+                return func(*args, **kwargs)
+
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def _route(pattern):
+    # <name> matches one path segment, like Flask's string converter
+    return re.compile(re.sub(r'<(\w+)>', r'(?P<\1>[^/]+)', pattern))
+
+
+def _create_genre(session, user_id, genre_titles):
+    """
+    Insert a Genre through the sync side of an AsyncSession (run_sync).
+    Returns its dict and the change to announce once committed.
+    """
+    new_genres = Genre(user_id=user_id)
+    new_genres.assign_titles(genre_titles, session)
+    session.add(new_genres)
+    session.flush()
+    changes = [GenreChange(new_genres.genre_id, None, new_genres.user_id, genre_titles)]
+    session.commit()
+    return new_genres.to_dict(), changes
+
+
+def create_asgi_app(config_name=None):
+    """
+    Build the Flask app for the named profile and wrap it in AsyncApi.
+    """
+    from app import create_app
+
+    return AsyncApi(create_app(config_name))
@@ -1,48 +1,112 @@
 #Import Library
-import ast
-import json
-from flask import Blueprint, jsonify, request
-from flasgger import swag_from
-from datetime import datetime
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
 
 #Import Dependencies
 from app import db
-from app.models.genre import Genre
+from app.models.genre import Genre, GenreTitle, GenreVocabulary
+from app.services.events import GenreChange, genres_changed
+from app.services.genre_index import genre_index
+from app.services.response_cache import response_cache
+from app.services.vocabulary import genre_vocabulary
+from app.utils.apispec import swag_from
+from app.utils.bulk import BulkError, TitleListUpsert, read_bulk_items
+from app.utils.json_provider import json_list
+from app.utils.titles import parse_titles
+from app.utils.pagination import (
+    STREAM_BATCH_SIZE, PaginationError, encode_cursor, keyset_filter, ndjson_response,
+    parse_page_args, wants_stream
+)
+from app.utils.serialization import titled_row_serializer, titles_json
 
 
 genre_bp = Blueprint('genre_bp', __name__)
 
+
+@genre_bp.errorhandler(IntegrityError)
+def integrity_error(e):
+    # e.g. a user_id that does not exist once foreign keys are enforced
+    db.session.rollback()
+    return jsonify({'error': 'Write violates a database constraint', 'detail': str(e.orig)}), 409
+
 # GET GENRES
 @genre_bp.route('/genre/get', methods=['GET'])
 @swag_from({
-
+    'parameters': [
+        {
+            'in': 'query',
+            'name': 'limit',
+            'type': 'integer',
+            'required': False,
+            'description': 'Page size (default 100, max 1000)'
+        },
+        {
+            'in': 'query',
+            'name': 'cursor',
+            'type': 'string',
+            'required': False,
+            'description': 'Opaque cursor returned as next_cursor by the previous page'
+        },
+        {
+            'in': 'query',
+            'name': 'format',
+            'type': 'string',
+            'required': False,
+            'description': 'Set to ndjson to stream every genre from the cursor onwards, one per line'
+        }
+    ],
     'responses' : {
         200: {
-            'description' : 'List of genres',
+            'description' : 'Page of genres',
             'examples' : {
-                'application/json' : [
-                    {
-                        'genre_id' : '101',
-                        'genre_titles': 'John Doe',
-                        'user_id' : '1'
-                    },
-                    {
-                        'genre_id' : '102',
-                        'genre_titles': 'John Doe',
-                        'user_id' : '2'
-                    }
-                ]
+                'application/json' : {
+                    'items': [
+                        {
+                            'genre_id' : '101',
+                            'genre_titles': ['Action', 'RPG'],
+                            'user_id' : '1',
+                            'genre_date_added': '2024-05-17T10:12:25'
+                        }
+                    ],
+                    'next_cursor': 'WyIyMDI0LTA1LTE3VDEwOjEyOjI1IiwgIjEwMSJd'
+                }
             }
+        },
+        400: {
+            'description': 'Invalid limit or cursor'
         }
-        
     }
 })
+@response_cache.cached('genre')
 def get_genres():
     """
-    Get all genres based on users.
+    Get genres based on users, ordered by date added, one page at a time.
     """
-    genres = Genre.query.all()
-    return jsonify([g.to_dict() for g in genres])
+    try:
+        limit, after = parse_page_args()
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Titles are aggregated to JSON text by the database and spliced into the
+    # response bytes as-is, so no ORM objects are built for a listing.
+    titles = titles_json(GenreTitle, Genre.genre_id, db.engine.dialect.name, GenreVocabulary).label('genre_titles')
+    columns = select(Genre.genre_id, Genre.user_id, Genre.genre_date_added, titles)
+    query = keyset_filter(columns, Genre.genre_date_added, Genre.genre_id, after)
+    serialize = titled_row_serializer('genre_titles')
+
+    if wants_stream():
+        streamed = query.execution_options(yield_per=STREAM_BATCH_SIZE)
+        return ndjson_response(lambda: db.session.execute(streamed), serialize)
+
+    rows = db.session.execute(query.limit(limit)).all()
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.genre_date_added, last.genre_id)
+
+    body = json_list([serialize(row) for row in rows], next_cursor=next_cursor)
+    return current_app.response_class(body, mimetype='application/json')
     
 # CREATE GENRES
 @genre_bp.route('/genre/create', methods=['POST'])
@@ -80,16 +144,18 @@ def create_genres():
     Add Genres.
     """
     data = request.get_json()
-    genre_titles = data['genre_titles']
-    if isinstance(genre_titles, list):
-        serialized_titles = json.dumps(genre_titles)
-    else:
-        serialized_titles = json.dumps(ast.literal_eval(genre_titles))
-        
-    new_genres = Genre(genre_titles=serialized_titles, user_id=data['user_id'])
+    try:
+        genre_titles = parse_titles(data['genre_titles'])
+    except (ValueError, SyntaxError):
+        return jsonify({'error': 'genre_titles must be a list'}), 400
+
+    new_genres = Genre(user_id=data['user_id'], genre_titles=genre_titles)
     
     db.session.add(new_genres)
+    db.session.flush()
+    changes = [GenreChange(new_genres.genre_id, None, new_genres.user_id, genre_titles)]
     db.session.commit()
+    _notify(changes)
     return jsonify(new_genres.to_dict()), 201
 
 # UPDATE GENRES BY GENRE_ID
@@ -129,18 +195,23 @@ def edit_genres_by_genreId(genre_id):
     """
     Update genre by genre_id
     """
-    genre = Genre.query.get(genre_id)
+    genre = db.session.get(Genre, genre_id)
     if not genre:
         return jsonify({'error': 'User not found'}), 404
     
     data = request.get_json()
+    before = _snapshot([genre])
     if 'genre_titles' in data:
-        serialized_titles = json.dumps(data['genre_titles'])  # Serialize the array
-        genre.genre_titles = serialized_titles
+        try:
+            genre.genre_titles = parse_titles(data['genre_titles'])
+        except (ValueError, SyntaxError):
+            return jsonify({'error': 'genre_titles must be a list'}), 400
     if 'user_id' in data:
         genre.user_id = data['user_id']
     
+    changes = _changes(before)
     db.session.commit()
+    _notify(changes)
     return '', 200
 
 # DELETE GENRES BY GENRE_ID
@@ -169,11 +240,13 @@ def delete_genres(genre_id):
     """
     Delete genres by genre_id
     """
-    genre = Genre.query.get(genre_id)
+    genre = db.session.get(Genre, genre_id)
     if not genre:
         return jsonify({'error':'User not found'}), 404
+    changes = [GenreChange(genre.genre_id, genre.user_id, genre.user_id, None)]
     db.session.delete(genre)
     db.session.commit()
+    _notify(changes)
     return '', 204
 
 
@@ -215,17 +288,150 @@ def edit_genres_by_userId(user_id):
     Update genre by user_id
     """
     genres = Genre.query.filter_by(user_id=user_id).all()
-    if not genre:
+    if not genres:
         return jsonify({'error': 'User not found'}), 404
     
     data = request.get_json()
+    before = _snapshot(genres)
     if 'genre_titles' in data:
-        serialized_titles = json.dumps(data['genre_titles'])  # Serialize the array
+        try:
+            genre_titles = parse_titles(data['genre_titles'])
+        except (ValueError, SyntaxError):
+            return jsonify({'error': 'genre_titles must be a list'}), 400
         for genre in genres:
-            genre.genre_titles = serialized_titles
+            genre.genre_titles = genre_titles
     if 'genre_id' in data:
         for genre in genres:
             genre.genre_id = data['genre_id']
     
+    changes = _changes(before)
     db.session.commit()
+    _notify(changes)
     return '', 200
+
+# BULK CREATE OR UPDATE GENRES
+@genre_bp.route('/genre/bulk', methods=['POST'])
+@swag_from({
+    'consumes': ['application/json', 'application/x-ndjson'],
+    'parameters': [
+        {
+            'in': 'body',
+            'name': 'genres',
+            'description': 'Array of genre objects, or one object per line with Content-Type application/x-ndjson. '
+                           'Items with an existing genre_id replace that genre, the rest are created.',
+            'schema': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'genre_id': {'type': 'string'},
+                        'genre_titles': {'type': 'array', 'items': {'type': 'string'}},
+                        'user_id': {'type': 'string'}
+                    },
+                    'required': ['genre_titles', 'user_id']
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Counts of created and updated genres, and the items that failed',
+            'examples': {
+                'application/json': {
+                    'created': 2,
+                    'updated': 1,
+                    'errors': [{'index': 3, 'error': 'user_id is required'}]
+                }
+            }
+        },
+        400: {
+            'description': 'Body is not a JSON array or NDJSON'
+        }
+    }
+})
+def bulk_genres():
+    """
+    Create or update many genres in chunked transactions.
+    """
+    upsert = TitleListUpsert(Genre, GenreTitle, 'genre_id', 'genre_date_added', 'genre_titles', genre_vocabulary)
+    try:
+        summary, written = upsert.run(read_bulk_items(), current_app.config['BULK_CHUNK_SIZE'])
+    except BulkError as e:
+        return jsonify({'error': str(e)}), 400
+
+    _notify([GenreChange(*change) for change in written])
+    return jsonify(summary), 200
+
+# USERS BY GENRE TITLES
+@genre_bp.route('/genre/users', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'in': 'query',
+            'name': 'title',
+            'type': 'array',
+            'items': {'type': 'string'},
+            'collectionFormat': 'multi',
+            'required': True,
+            'description': 'Genre title to look up, repeat for several titles'
+        },
+        {
+            'in': 'query',
+            'name': 'mode',
+            'type': 'string',
+            'enum': ['and', 'or'],
+            'required': False,
+            'description': 'and (default) returns users having every title, or returns users having any'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Users whose genres match the titles',
+            'examples': {
+                'application/json': {
+                    'user_ids': ['1', '2'],
+                    'count': 2
+                }
+            }
+        },
+        400: {
+            'description': 'No title given or unknown mode'
+        }
+    }
+})
+def get_users_by_genre():
+    """
+    Get the users sharing one or more genre titles.
+    """
+    titles = request.args.getlist('title')
+    mode = request.args.get('mode', 'and').lower()
+    if not titles:
+        return jsonify({'error': 'At least one title is required'}), 400
+    if mode not in ('and', 'or'):
+        return jsonify({'error': 'mode must be and or or'}), 400
+
+    user_ids = genre_index.users_for(titles, match_all=(mode == 'and'))
+    return jsonify({'user_ids': user_ids, 'count': len(user_ids)})
+
+
+def _snapshot(genres):
+    return [(genre, genre.genre_id, genre.user_id) for genre in genres]
+
+
+def _changes(snapshot):
+    """
+    Describe the edits made to the snapshotted rows. A changed genre_id is
+    reported as the old row going away and a new one appearing.
+    """
+    changes = []
+    for genre, genre_id, user_id in snapshot:
+        if genre.genre_id != genre_id:
+            changes.append(GenreChange(genre_id, user_id, user_id, None))
+            changes.append(GenreChange(genre.genre_id, None, genre.user_id, genre.genre_titles))
+        else:
+            changes.append(GenreChange(genre_id, user_id, genre.user_id, genre.genre_titles))
+    return changes
+
+
+def _notify(changes):
+    genres_changed.send(current_app._get_current_object(), changes=changes)
@@ -0,0 +1,69 @@
+#Import Library
+from flask import Blueprint, current_app, jsonify
+from flask_jwt_extended import jwt_required
+
+#Import Dependencies
+from app import db
+from app.models.recap import RecapSummary
+from app.utils.apispec import swag_from
+
+recap_bp = Blueprint('recap_bp', __name__)
+
+# GET RECAP
+@recap_bp.route('/recap/<string:user_id>', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'in': 'header',
+            'name': 'Authorization',
+            'type': 'string',
+            'required': True,
+            'description': 'JWT token. Format: Bearer <access_token>'
+        },
+        {
+            'in': 'path',
+            'name': 'user_id',
+            'type': 'string',
+            'required': True,
+            'description': 'ID of the user'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Recap of the user\'s genres',
+            'examples': {
+                'application/json': {
+                    'user_id': '1',
+                    'genre_count': 3,
+                    'title_count': 8,
+                    'top_genres': [
+                        {'title': 'RPG', 'count': 3, 'share': 0.375},
+                        {'title': 'Action', 'count': 2, 'share': 0.25}
+                    ],
+                    'changes': {
+                        'new': ['Action'],
+                        'dropped': ['Puzzle'],
+                        'share_delta': {'RPG': 0.125, 'Action': 0.25, 'Puzzle': -0.2}
+                    },
+                    'period_start': '2024-05-01T00:00:00',
+                    'updated_at': '2024-05-17T10:12:25'
+                }
+            }
+        },
+        404: {
+            'description': 'No recap for this user yet'
+        }
+    }
+})
+@jwt_required()
+def get_recap(user_id):
+    """
+    Get a user's recap: top genres, their share, and changes since the
+    start of the current period. Served as stored, in one key lookup.
+    """
+    payload = db.session.execute(
+        db.select(RecapSummary.payload).where(RecapSummary.user_id == user_id)
+    ).scalar_one_or_none()
+    if payload is None:
+        return jsonify({'error': 'No recap for this user yet'}), 404
+    return current_app.response_class(payload, mimetype='application/json')
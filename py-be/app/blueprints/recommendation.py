@@ -1,27 +1,47 @@
 #Import Library
-import ast
-import json
-from flask import Blueprint, jsonify, request
-from flasgger import swag_from
-from datetime import datetime
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
 
 #Import Dependencies
 from app import db
-from app.models.recommendation import Recommendation
+from app.models.recommendation import Recommendation, RecommendationTitle
+from app.services.recommender import parse_limit, recommendation_service
+from app.services.response_cache import response_cache
+from app.utils.apispec import swag_from
+from app.utils.bulk import BulkError, TitleListUpsert, read_bulk_items
+from app.utils.serialization import titled_row_serializer, titles_json
+from app.utils.titles import parse_titles
 
 recommendation_bp = Blueprint('recommendation_bp', __name__)
 
+
+@recommendation_bp.errorhandler(IntegrityError)
+def integrity_error(e):
+    # e.g. a user_id that does not exist once foreign keys are enforced
+    db.session.rollback()
+    return jsonify({'error': 'Write violates a database constraint', 'detail': str(e.orig)}), 409
+
 # GET RECOMMENDATION
 @recommendation_bp.route('/recommendation/get', methods=['GET'])
 @swag_from({
 
 })
+@response_cache.cached('recommendation')
 def get_recommendation():
     """
     Get recommendation for users.
     """
-    recommendations = Recommendation.query.all()
-    return jsonify([r.to_dict() for r in recommendations ])
+    titles = titles_json(RecommendationTitle, Recommendation.recommendation_id, db.engine.dialect.name)
+    query = select(
+        Recommendation.recommendation_id,
+        Recommendation.user_id,
+        Recommendation.recommendation_date_added,
+        titles.label('recommendation_titles')
+    )
+    serialize = titled_row_serializer('recommendation_titles')
+    body = b'[' + b','.join(serialize(row) for row in db.session.execute(query)) + b']'
+    return current_app.response_class(body, mimetype='application/json')
 
 # CREATE RECOMMENDATION
 @recommendation_bp.route('/recommendation/create', methods=['POST'])
@@ -33,18 +53,169 @@ def create_recommendation():
     Create new recommendation for user
     """
     data = request.get_json()
-    recommendation_titles = data['recommendation_titles']
-    if isinstance(recommendation_titles, list):
-        serialized_titles = json.dumps(recommendation_titles)
-    else:
-        serialized_titles = json.dumps(ast.literal_eval(recommendation_titles))
+    try:
+        recommendation_titles = parse_titles(data['recommendation_titles'])
+    except (ValueError, SyntaxError):
+        return jsonify({'error': 'recommendation_titles must be a list'}), 400
 
-    new_recommendation = Recommendation(recommendation_titles=serialized_titles, user_id=data['user_id'])
+    new_recommendation = Recommendation(user_id=data['user_id'], recommendation_titles=recommendation_titles)
 
     db.session.add(new_recommendation)
     db.session.commit()
+    response_cache.invalidate('recommendation')
     return jsonify(new_recommendation.to_dict()), 201
 
+# BULK CREATE OR UPDATE RECOMMENDATIONS
+@recommendation_bp.route('/recommendation/bulk', methods=['POST'])
+@swag_from({
+    'consumes': ['application/json', 'application/x-ndjson'],
+    'parameters': [
+        {
+            'in': 'body',
+            'name': 'recommendations',
+            'description': 'Array of recommendation objects, or one object per line with Content-Type '
+                           'application/x-ndjson. Items with an existing recommendation_id replace it, '
+                           'the rest are created.',
+            'schema': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'recommendation_id': {'type': 'string'},
+                        'recommendation_titles': {'type': 'array', 'items': {'type': 'string'}},
+                        'user_id': {'type': 'string'}
+                    },
+                    'required': ['recommendation_titles', 'user_id']
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Counts of created and updated recommendations, and the items that failed',
+            'examples': {
+                'application/json': {
+                    'created': 2,
+                    'updated': 0,
+                    'errors': []
+                }
+            }
+        },
+        400: {
+            'description': 'Body is not a JSON array or NDJSON'
+        }
+    }
+})
+def bulk_recommendation():
+    """
+    Create or update many recommendations in chunked transactions.
+    """
+    upsert = TitleListUpsert(Recommendation, RecommendationTitle, 'recommendation_id', 'recommendation_date_added',
+                             'recommendation_titles')
+    try:
+        summary, _ = upsert.run(read_bulk_items(), current_app.config['BULK_CHUNK_SIZE'])
+    except BulkError as e:
+        return jsonify({'error': str(e)}), 400
+    response_cache.invalidate('recommendation')
+    return jsonify(summary), 200
+
+# GET RECOMMENDATION BY USER_ID
+@recommendation_bp.route('/recommendation/user/<string:user_id>', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'in': 'path',
+            'name': 'user_id',
+            'description': 'ID of the user to recommend for',
+            'required': True,
+            'type': 'string'
+        },
+        {
+            'in': 'query',
+            'name': 'limit',
+            'type': 'integer',
+            'required': False,
+            'description': 'Number of titles to return (default 10, max 50)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Recommended titles computed from the user genres',
+            'examples': {
+                'application/json': {
+                    'user_id': '1',
+                    'recommendation_titles': ['Strategy', 'Simulation']
+                }
+            }
+        },
+        400: {
+            'description': 'Invalid limit'
+        },
+        404: {
+            'description': 'User has no genres'
+        }
+    }
+})
+def get_recommendation_by_userId(user_id):
+    """
+    Compute recommendations for a user from their genres.
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    titles = recommendation_service.recommend_for_user(user_id, limit)
+    if titles is None:
+        return jsonify({'error': 'No genres found for user'}), 404
+    return jsonify({'user_id': user_id, 'recommendation_titles': titles})
+
+# GET SIMILAR USERS BY USER_ID
+@recommendation_bp.route('/recommendation/user/<string:user_id>/similar', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'in': 'path',
+            'name': 'user_id',
+            'description': 'ID of the user to find similar users for',
+            'required': True,
+            'type': 'string'
+        },
+        {
+            'in': 'query',
+            'name': 'limit',
+            'type': 'integer',
+            'required': False,
+            'description': 'Number of users to return (default 10, max 50)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Users with the most similar genres, best first',
+            'examples': {
+                'application/json': {
+                    'user_id': '1',
+                    'similar_users': [{'user_id': '2', 'score': 0.75}]
+                }
+            }
+        },
+        400: {
+            'description': 'Invalid limit'
+        }
+    }
+})
+def get_similar_users_by_userId(user_id):
+    """
+    Find the users whose genres are most similar to a user's.
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    similar = recommendation_service.similar_users(user_id, limit)
+    return jsonify({'user_id': user_id, 'similar_users': [{'user_id': u, 'score': s} for u, s in similar]})
+
 # UPDATE RECOMMENDATION
 
 # DELETE RECOMMENDATION
\ No newline at end of file
@@ -1,15 +1,37 @@
 #Import Library
-from flask import Blueprint, jsonify, request
-from flasgger import swag_from
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import (
+    create_access_token, current_user, jwt_required, get_jwt
+)
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 
 
 #Import Dependencies
 from app import db
+from app.models.genre import Genre
 from app.models.user import User
+from app.services.events import GenreChange, genres_changed
+from app.services.identity import identity_cache
+from app.services.passwords import PasswordPoolBusy
+from app.services.response_cache import response_cache
+from app.services.token_blocklist import issue_tokens, session_claims, token_blocklist
+from app.utils.apispec import swag_from
+from app.utils.pagination import (
+    STREAM_BATCH_SIZE, PaginationError, encode_cursor, keyset_filter, ndjson_response,
+    parse_page_args, wants_stream
+)
 
 user_bp = Blueprint('user_bp', __name__)
 
+
+@user_bp.errorhandler(PasswordPoolBusy)
+def password_pool_busy(e):
+    response = jsonify({'error': 'Too many password operations in progress, retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 # GET USERS
 @user_bp.route('/user/get', methods=['GET'])
 @swag_from({
@@ -20,41 +42,105 @@ user_bp = Blueprint('user_bp', __name__)
             'type': 'string',
             'required': True,
             'description': 'JWT token. Format: Bearer <access_token>'
+        },
+        {
+            'in': 'query',
+            'name': 'fields',
+            'type': 'string',
+            'required': False,
+            'description': 'Comma separated columns to return (user_id, user_name, user_email, user_date_added)'
+        },
+        {
+            'in': 'query',
+            'name': 'limit',
+            'type': 'integer',
+            'required': False,
+            'description': 'Page size (default 100, max 1000)'
+        },
+        {
+            'in': 'query',
+            'name': 'cursor',
+            'type': 'string',
+            'required': False,
+            'description': 'Opaque cursor returned as next_cursor by the previous page'
+        },
+        {
+            'in': 'query',
+            'name': 'format',
+            'type': 'string',
+            'required': False,
+            'description': 'Set to ndjson to stream every user from the cursor onwards, one per line'
         }
     ],
     'responses' : {
         200: {
-            'description' : 'List of users',
+            'description' : 'Page of users',
             'examples' : {
-                'application/json' : [
-                    {
-                        'user_id' : 1,
-                        'user_name': 'John Doe',
-                        'user_email' : 'john@email.com'
-                    },
-                    {
-                        'user_id' : 2,
-                        'user_name': 'Jane Doe',
-                        'user_email' : 'jane@email.com', 
-                    }
-                ]
+                'application/json' : {
+                    'items': [
+                        {
+                            'user_id' : 1,
+                            'user_name': 'John Doe',
+                            'user_email' : 'john@email.com'
+                        },
+                        {
+                            'user_id' : 2,
+                            'user_name': 'Jane Doe',
+                            'user_email' : 'jane@email.com', 
+                        }
+                    ],
+                    'next_cursor': 'WyIyMDI0LTA1LTE3VDEwOjEyOjI1IiwgIjIiXQ'
+                }
             }
+        },
+        400: {
+            'description': 'Unknown field, invalid limit or invalid cursor'
         }
         
     }
 })
 
 @jwt_required()
+@response_cache.cached('user')
 def get_users():
     """
-    Get all user.
+    Get users, ordered by date added, one page at a time.
+    Only the requested columns are selected; no ORM objects are built.
+    The caller was already resolved (from the identity cache) by @jwt_required.
     """
-    current_user_id = get_jwt_identity()
-    if current_user_id is None:
-        return jsonify({'error': 'Invalid access token'}),401
-    
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    fields = request.args.get('fields')
+    fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else list(User.PUBLIC_FIELDS)
+    unknown = [f for f in fields if f not in User.PUBLIC_FIELDS]
+    if unknown:
+        return jsonify({'error': 'Unknown fields: ' + ', '.join(unknown)}), 400
+
+    try:
+        limit, after = parse_page_args()
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # The keyset columns are always selected so the next cursor can be built
+    columns = User.__table__.c
+    selected = list(dict.fromkeys(fields + ['user_date_added', 'user_id']))
+    query = keyset_filter(select(*[columns[f] for f in selected]), User.user_date_added, User.user_id, after)
+
+    def serialize(row):
+        return {f: _json_value(row._mapping[f]) for f in fields}
+
+    if wants_stream():
+        streamed = query.execution_options(yield_per=STREAM_BATCH_SIZE)
+        return ndjson_response(lambda: db.session.execute(streamed), serialize)
+
+    rows = db.session.execute(query.limit(limit)).all()
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1].user_date_added, rows[-1].user_id)
+
+    return jsonify({'items': [serialize(row) for row in rows], 'next_cursor': next_cursor})
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
 
 
 # ADD USER
@@ -86,6 +172,9 @@ def get_users():
                     'user_email': 'john@example.com'
                 }
             }
+        },
+        503: {
+            'description': 'Password hashing queue is full, retry after Retry-After seconds'
         }
     }
 })
@@ -99,6 +188,7 @@ def create_user():
 
     db.session.add(new_user)
     db.session.commit()
+    response_cache.invalidate('user')
     return jsonify(new_user.to_dict()), 201
 
 # DELETE USER
@@ -131,17 +221,25 @@ def create_user():
     }
 })
 
-@jwt_required
+@jwt_required()
 def delete_user(user_id):
     """
     Delete a user by ID.
     """
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
+    # The user's genres go with it (ON DELETE CASCADE), so the in-memory
+    # index, recommendation cache and recaps hear about them as deletions
+    genre_ids = db.session.execute(select(Genre.genre_id).where(Genre.user_id == user_id)).scalars().all()
+    changes = [GenreChange(genre_id, user_id, user_id, None) for genre_id in genre_ids]
     db.session.delete(user)
     db.session.commit()
+    identity_cache.invalidate(user_id)
+    response_cache.invalidate('user', 'genre', 'recommendation')
+    if changes:
+        genres_changed.send(current_app._get_current_object(), changes=changes)
     return '',204
 
 # UPDATE USER
@@ -190,7 +288,7 @@ def edit_user(user_id):
     """
     Edit user data by ID.
     """
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
@@ -198,13 +296,91 @@ def edit_user(user_id):
     if 'user_name' in data:
         user.user_name = data['user_name']
     if 'user_email' in data:
-        user.email = data['user_email']
+        user.user_email = data['user_email']
     if 'user_password' in data:
         user.set_password(data['user_password'])
 
     db.session.commit()
+    identity_cache.invalidate(user_id)
+    response_cache.invalidate('user')
     return '', 200
 
+# GET USER PROFILE
+@user_bp.route('/user/<string:user_id>/profile', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'in': 'header',
+            'name': 'Authorization',
+            'type': 'string',
+            'required': True,
+            'description': 'JWT token. Format: Bearer <access_token>'
+        },
+        {
+            'in': 'path',
+            'name': 'user_id',
+            'description': 'ID of the user',
+            'required': True,
+            'type': 'string'
+        },
+        {
+            'in': 'query',
+            'name': 'recommendations',
+            'type': 'integer',
+            'required': False,
+            'description': 'Number of latest recommendations to include (default 5)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'User with their genres and latest recommendations',
+            'examples': {
+                'application/json': {
+                    'user_id': '1',
+                    'user_name': 'John Doe',
+                    'user_email': 'john@email.com',
+                    'user_date_added': '2024-05-17T10:12:25',
+                    'genres': [
+                        {'genre_id': '101', 'genre_titles': ['Action', 'RPG'], 'user_id': '1',
+                         'genre_date_added': '2024-05-17T10:12:25'}
+                    ],
+                    'recommendations': [
+                        {'recommendation_id': '201', 'recommendation_titles': ['Strategy'], 'user_id': '1',
+                         'recommendation_date_added': '2024-05-17T10:12:25'}
+                    ]
+                }
+            }
+        },
+        404: {
+            'description': 'User not found'
+        }
+    }
+})
+@jwt_required()
+def get_user_profile(user_id):
+    """
+    Get a user with their genres and latest recommendations.
+    Loads everything in a fixed number of queries however many rows the user has.
+    """
+    try:
+        n_recommendations = int(request.args.get('recommendations', 5))
+    except ValueError:
+        return jsonify({'error': 'recommendations must be an integer'}), 400
+
+    user = db.session.execute(
+        select(User).where(User.user_id == user_id).options(
+            joinedload(User.genres),
+            selectinload(User.recommendations),
+        )
+    ).unique().scalar_one_or_none()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    profile = user.to_dict()
+    profile['genres'] = [g.to_dict() for g in user.genres]
+    profile['recommendations'] = [r.to_dict() for r in user.recommendations[:max(n_recommendations, 0)]]
+    return jsonify(profile)
+
 # LOGIN USER
 @user_bp.route('/user/login', methods=['POST'])
 @swag_from({
@@ -228,12 +404,16 @@ def edit_user(user_id):
             'description': 'Login successful',
             'examples': {
                 'application/json': {
-                    'access_token': 'jwt_access_token'
+                    'access_token': 'jwt_access_token',
+                    'refresh_token': 'jwt_refresh_token'
                 }
             }
         },
         401: {
             'description': 'Invalid credentials'
+        },
+        503: {
+            'description': 'Password hashing queue is full, retry after Retry-After seconds'
         }
     }
 })
@@ -251,8 +431,50 @@ def login():
     user = User.query.filter_by(user_email=email).first()
     if not user or not user.check_password(password):
         return jsonify({'error': 'Invalid credentials'}), 401
+
+    # Upgrade hashes made with an older cost factor while we have the password
+    if user.password_needs_rehash():
+        user.set_password(password)
+        db.session.commit()
     
-    access_token = create_access_token(identity=user.user_id)
+    access_token, refresh_token = issue_tokens(user.user_id)
+    return jsonify({'access_token': access_token, 'refresh_token': refresh_token}), 200
+
+# REFRESH ACCESS TOKEN
+@user_bp.route('/user/refresh', methods=['POST'])
+@swag_from({
+    'parameters': [
+        {
+            'in': 'header',
+            'name': 'Authorization',
+            'type': 'string',
+            'required': True,
+            'description': 'Refresh token. Format: Bearer <refresh_token>'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'New access token',
+            'examples': {
+                'application/json': {
+                    'access_token': 'jwt_access_token'
+                }
+            }
+        },
+        401: {
+            'description': 'Missing, expired or revoked refresh token, or the user no longer exists'
+        },
+        422: {
+            'description': 'An access token was sent instead of a refresh token'
+        }
+    }
+})
+@jwt_required(refresh=True)
+def refresh():
+    """
+    Exchange a refresh token for a new short-lived access token.
+    """
+    access_token = create_access_token(identity=current_user.user_id, additional_claims=session_claims(get_jwt()))
     return jsonify({'access_token': access_token}), 200
 
 # LOGOUT USER
@@ -264,7 +486,7 @@ def login():
             'name': 'Authorization',
             'type': 'string',
             'required': True,
-            'description': 'JWT token. Format: Bearer <access_token>'
+            'description': 'Access or refresh token to revoke. An access token also revokes the refresh token issued with it. Format: Bearer <token>'
         }
     ],
     'responses': {
@@ -287,14 +509,13 @@ def login():
     }
 })
 
-@jwt_required()
+@jwt_required(verify_type=False)
 def logout():
     """
-    Log out the current user.
+    Log out the current user by revoking the presented token, and the
+    refresh token of the same login when an access token is presented.
     """
-
-    jwt = get_jwt()
-    jwt['exp'] = 0
+    token_blocklist.revoke_session(get_jwt())
 
     return jsonify({'message': 'Successfully logged out'}), 200
 
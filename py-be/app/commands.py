@@ -0,0 +1,229 @@
+#Import Library
+import os
+import time
+import click
+from flask import current_app, g
+from flask.cli import AppGroup, ScriptInfo, with_appcontext
+from sqlalchemy import bindparam, select, update
+
+#Import Dependencies
+from app import db
+
+
+class LazyMigrateGroup(click.Group):
+    """
+    Looks up `flask db` subcommands in Flask-Migrate, which (with Alembic)
+    is only imported and set up once a db command runs rather than on
+    every app start.
+    """
+
+    def _group(self, ctx):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as db_group
+
+        app = current_app._get_current_object() if current_app else ctx.ensure_object(ScriptInfo).load_app()
+        if 'migrate' not in app.extensions:
+            Migrate(app, db)
+        return db_group
+
+    def list_commands(self, ctx):
+        return self._group(ctx).list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._group(ctx).get_command(ctx, name)
+
+
+# Same options as flask_migrate.cli.db, whose subcommands read them from g
+@click.group('db', cls=LazyMigrateGroup)
+@click.option('-d', '--directory', default=None, help='Migration script directory (default is "migrations")')
+@click.option('-x', '--x-arg', multiple=True, help='Additional arguments consumed by custom env.py scripts')
+@with_appcontext
+def migrate_cli(directory, x_arg):
+    """Perform database migrations."""
+    g.directory = directory
+    g.x_arg = x_arg
+
+
+recommendations_cli = AppGroup('recommendations', help='Batch jobs for the recommendation table.')
+steam_cli = AppGroup('steam', help='Import Steam library exports.')
+recap_cli = AppGroup('recap', help='Maintain the recap_summary table.')
+apidocs_cli = AppGroup('apidocs', help='Build the OpenAPI spec.')
+
+
+@recommendations_cli.command('rebuild')
+@click.option('--workers', type=int, default=None, help='Worker processes (default: one per CPU).')
+@click.option('--shard-size', type=int, default=20000, show_default=True, help='Users per worker task.')
+@click.option('--top-k', type=int, default=10, show_default=True, help='Titles to recommend per user.')
+@click.option('--checkpoint', default=None,
+              help='Progress file used to resume an interrupted run (default: instance/recommendations_rebuild.json).')
+@click.option('--restart', is_flag=True, help='Ignore any existing checkpoint and start over.')
+def rebuild_recommendations(workers, shard_size, top_k, checkpoint, restart):
+    """
+    Recompute Recommendation rows for every user.
+    """
+    from recom_system import Checkpoint, Recommender, matrix_fingerprint, recommend_parallel
+    from recom_system.store import load_genre_matrix, write_recommendations
+
+    started = time.perf_counter()
+    metric = current_app.config['RECOMMENDER_METRIC']
+    with db.engine.connect() as conn:
+        genre_matrix = load_genre_matrix(conn)
+    n_users, n_titles = genre_matrix.shape
+    click.echo('Loaded %d users x %d titles in %.1fs' % (n_users, n_titles, time.perf_counter() - started))
+    if not n_users:
+        return
+
+    checkpoint = checkpoint or os.path.join(current_app.instance_path, 'recommendations_rebuild.json')
+    if restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    progress = Checkpoint(checkpoint, matrix_fingerprint(genre_matrix, metric, top_k, shard_size))
+    if progress.done:
+        click.echo('Resuming: %d shards already written' % len(progress.done))
+
+    sim = Recommender(genre_matrix, metric).sim
+    n_shards = -(-n_users // shard_size)
+    done_users = sum(min(shard_size, n_users - s * shard_size) for s in progress.done)
+
+    with db.engine.connect() as conn:
+        for shard_id, items in recommend_parallel(genre_matrix, sim, top_k, workers, shard_size, progress.done):
+            done_users += write_recommendations(conn, items)
+            progress.mark(shard_id)
+            elapsed = time.perf_counter() - started
+            click.echo('[%d/%d shards] %d/%d users, %.0f users/s' % (
+                len(progress.done), n_shards, done_users, n_users, done_users / elapsed))
+
+    progress.finish()
+    click.echo('Done in %.1fs' % (time.perf_counter() - started))
+
+
+@recommendations_cli.command('build-lsh')
+@click.option('--bands', type=int, default=32, show_default=True, help='LSH bands.')
+@click.option('--rows', type=int, default=2, show_default=True, help='MinHash values per band.')
+def build_lsh(bands, rows):
+    """
+    Build the MinHash LSH index used for similar-user lookups.
+    """
+    from recom_system import MinHashLSH
+    from recom_system.store import load_genre_matrix
+    from app.services.recommender import recommendation_service
+
+    started = time.perf_counter()
+    with db.engine.connect() as conn:
+        genre_matrix = load_genre_matrix(conn)
+    path = current_app.config['RECOMMENDATION_LSH_PATH']
+    MinHashLSH(bands, rows).fit(genre_matrix).save(path)
+    recommendation_service.load_lsh(path)
+    click.echo('Indexed %d users into %s in %.1fs' % (genre_matrix.shape[0], path, time.perf_counter() - started))
+
+
+@steam_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['auto', 'json', 'ndjson']), default='auto', show_default=True,
+              help='auto picks ndjson for .ndjson/.jsonl files.')
+@click.option('--app-genres', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='JSON appid -> genres map for games exported without genres.')
+@click.option('--user-id', default=None, help='User for records without a user_id, e.g. a GetOwnedGames export.')
+@click.option('--top', type=int, default=10, show_default=True, help='Genres kept per user, by playtime.')
+@click.option('--chunk-size', type=int, default=None, help='Users per transaction (default: BULK_CHUNK_SIZE).')
+def import_library(path, fmt, app_genres, user_id, top, chunk_size):
+    """
+    Derive each user's genre profile from a Steam library/playtime export.
+
+    The file is parsed incrementally and playtime is summed per genre; each
+    user's genres, heaviest first and with their playtime minutes, then
+    replace their current Genre row (user.genre_id), or create and link
+    one, in chunked bulk transactions.
+    """
+    from app.models.genre import Genre, GenreTitle
+    from app.models.user import User
+    from app.services.recap import recap_service
+    from app.services.response_cache import response_cache
+    from app.services.vocabulary import genre_vocabulary
+    from app.utils.bulk import TitleListUpsert, chunked
+    from app.utils.steam_library import PlaytimeAggregator, detect_format, iter_records, load_app_genres
+
+    started = time.perf_counter()
+    genres_by_app = None
+    if app_genres:
+        with open(app_genres, encoding='utf-8') as f:
+            genres_by_app = load_app_genres(f)
+
+    aggregator = PlaytimeAggregator(genres_by_app, user_id)
+    with open(path, encoding='utf-8') as f:
+        for record in iter_records(f, detect_format(path) if fmt == 'auto' else fmt):
+            aggregator.add(record)
+            if aggregator.games and aggregator.games % 1000000 == 0:
+                click.echo('  %d games read, %.0f games/s' % (
+                    aggregator.games, aggregator.games / (time.perf_counter() - started)))
+    parsed = time.perf_counter() - started
+    click.echo('Read %d games for %d users in %.1fs (%.0f games/s), %d records or games skipped' % (
+        aggregator.games, len(aggregator.weights), parsed, aggregator.games / max(parsed, 1e-9), aggregator.skipped))
+
+    users = User.__table__.c
+
+    def link_new_genres(changes):
+        created = [{'b_user_id': uid, 'b_genre_id': gid} for gid, old_uid, uid, _ in changes if old_uid is None]
+        if created:
+            db.session.execute(
+                update(User.__table__).where(users.user_id == bindparam('b_user_id'))
+                .values(genre_id=bindparam('b_genre_id')),
+                created
+            )
+
+    upsert = TitleListUpsert(Genre, GenreTitle, 'genre_id', 'genre_date_added', 'genre_titles', genre_vocabulary,
+                             weights_field='playtime_minutes')
+    totals = {'created': 0, 'updated': 0, 'errors': 0, 'unknown_users': 0}
+    for chunk in chunked(aggregator.profiles(top), chunk_size or current_app.config['BULK_CHUNK_SIZE']):
+        current = dict(db.session.execute(
+            select(users.user_id, users.genre_id).where(users.user_id.in_([uid for uid, _ in chunk]))
+        ).all())
+        items = [{'genre_id': current[uid], 'user_id': uid, 'genre_titles': [genre for genre, _ in profile],
+                  'playtime_minutes': [int(minutes) for _, minutes in profile]}
+                 for uid, profile in chunk if uid in current]
+        totals['unknown_users'] += len(chunk) - len(items)
+        summary, written = upsert.run(items, len(items) or 1, before_commit=link_new_genres)
+        recap_service.refresh({uid for _, _, uid, _ in written})
+        totals['created'] += summary['created']
+        totals['updated'] += summary['updated']
+        totals['errors'] += len(summary['errors'])
+        for error in summary['errors'][:3]:
+            click.echo('  error: %s' % error['error'], err=True)
+
+    response_cache.invalidate('genre', 'user')
+    click.echo('Genres created: %(created)d, updated: %(updated)d, errors: %(errors)d, '
+               'unknown users: %(unknown_users)d' % totals)
+    click.echo('Done in %.1fs; run "flask recommendations rebuild" to refresh recommendations'
+               % (time.perf_counter() - started))
+
+
+@recap_cli.command('rebuild')
+def rebuild_recaps():
+    """
+    Recompute every user's recap summary, e.g. to backfill after a migration.
+    """
+    from app.services.recap import recap_service
+
+    started = time.perf_counter()
+
+    def progress(done, total):
+        click.echo('%d/%d users, %.0f users/s' % (done, total, done / (time.perf_counter() - started)))
+
+    refreshed = recap_service.rebuild(progress)
+    click.echo('Rebuilt %d recaps in %.1fs' % (refreshed, time.perf_counter() - started))
+
+
+@apidocs_cli.command('build')
+@click.option('--output', default=None, help='Spec file to write (default: API_SPEC_PATH or instance/apispec.json).')
+def build_apidocs(output):
+    """
+    Write the OpenAPI spec to a file, for API_DOCS = 'static'.
+    """
+    from app.services.apidocs import api_docs
+    from app.utils.apispec import build_spec
+
+    path = output or api_docs.path
+    spec = build_spec(current_app._get_current_object())
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(spec)
+    click.echo('Wrote %s (%d bytes)' % (path, len(spec)))
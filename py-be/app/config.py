@@ -0,0 +1,131 @@
+#Import Library
+import os
+from datetime import timedelta
+
+
+class Config:
+    """
+    Defaults shared by every profile. Any key can be overridden from the
+    environment with a STEAM_RECAP_ prefix, e.g. STEAM_RECAP_BULK_CHUNK_SIZE=5000
+    or STEAM_RECAP_SQLITE_PRAGMAS__mmap_size=0 for nested keys.
+    """
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'secret')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///steam_recap.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool settings for server databases (ignored for SQLite)
+    DATABASE_POOL_SIZE = 5
+    DATABASE_MAX_OVERFLOW = 10
+    DATABASE_POOL_TIMEOUT = 30
+    DATABASE_POOL_RECYCLE = 1800
+    DATABASE_POOL_PRE_PING = True
+
+    # Applied to every new SQLite connection. WAL lets readers run alongside
+    # the single writer, and busy_timeout makes writers wait instead of
+    # failing with "database is locked". SQLite only enforces foreign keys
+    # (and their ON DELETE actions) when asked to, per connection.
+    SQLITE_PRAGMAS = {
+        'foreign_keys': 'ON',
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 268435456,
+        'cache_size': -16000,
+        'temp_store': 'MEMORY',
+    }
+
+    # Create missing tables at startup. Production leaves the schema to
+    # Alembic (`flask db upgrade`) so that booting a worker never runs DDL.
+    # The migrations start from an existing schema, so a new database is
+    # created once with STEAM_RECAP_CREATE_ALL=true and `flask db stamp head`
+    CREATE_ALL = True
+    # /apidocs/: 'lazy' builds the spec on first request, 'static' serves
+    # API_SPEC_PATH (default <instance>/apispec.json) written by
+    # `flask apidocs build`, 'off' disables it
+    API_DOCS = 'lazy'
+    API_SPEC_PATH = None
+
+    # asgi.py: async engine URL (derived from SQLALCHEMY_DATABASE_URI when
+    # unset, e.g. sqlite -> sqlite+aiosqlite), threads for the Flask views
+    # without an async version and other blocking calls, and workers for
+    # CPU-bound work such as similarity scoring
+    ASYNC_DATABASE_URI = None
+    ASGI_SYNC_THREADS = 16
+    ASGI_CPU_WORKERS = 4
+
+    BULK_CHUNK_SIZE = 1000
+    BCRYPT_LOG_ROUNDS = 12
+    PASSWORD_POOL_WORKERS = 4
+    PASSWORD_POOL_MAX_PENDING = 64
+    PASSWORD_POOL_TIMEOUT = 10.0
+    RECOMMENDATION_CACHE_SIZE = 10000
+    RECOMMENDATION_CACHE_TTL = 300
+    RECOMMENDER_MAX_AGE = 3600
+    RECOMMENDER_METRIC = 'cosine'
+    RECOMMENDATION_REFRESH_ENABLED = True
+    RECOMMENDATION_REFRESH_DELAY = 1.0
+    RECOMMENDATION_REFRESH_NEIGHBOURS = 0
+    # Passes a user stays queued for while refreshing keeps failing
+    RECOMMENDATION_REFRESH_MAX_ATTEMPTS = 5
+    # Defaults to <instance>/lsh_index
+    RECOMMENDATION_LSH_PATH = None
+    # 'local', 'shared' (Redis at RESPONSE_CACHE_URL, in-process stand-in if unset) or 'none'
+    RESPONSE_CACHE_BACKEND = 'local'
+    RESPONSE_CACHE_URL = None
+    RESPONSE_CACHE_SIZE = 1024
+    RESPONSE_CACHE_TTL = 60
+    # orjson-backed jsonify(); datetimes are ISO 8601 and keys are not sorted
+    FAST_JSON = True
+    # Recap summaries: genres listed per user and the period changes are measured over
+    RECAP_TOP_N = 10
+    RECAP_PERIOD_DAYS = 30
+
+    # Per-request timings, SQL counts and response sizes, exported at /metrics
+    INSTRUMENTATION_ENABLED = False
+    # Profile PROFILE_SAMPLE_RATE of requests, keeping the slowest N percent
+    PROFILE_SLOWEST_PERCENT = 0
+    PROFILE_SAMPLE_RATE = 0.1
+    PROFILE_MODE = 'stack'
+    PROFILE_INTERVAL = 0.005
+    PROFILE_DIR = None
+
+    # Short-lived access tokens, renewed with a refresh token at /api/user/refresh
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Per-process cache of the user behind a token (flask_jwt_extended current_user)
+    IDENTITY_CACHE_SIZE = 10000
+    IDENTITY_CACHE_TTL = 60
+
+    # Revoked JWTs: 'local' per process, or 'shared' through Redis at TOKEN_BLOCKLIST_URL
+    TOKEN_BLOCKLIST_BACKEND = 'local'
+    TOKEN_BLOCKLIST_URL = None
+    TOKEN_BLOCKLIST_BLOOM = False
+    TOKEN_BLOCKLIST_CAPACITY = 100000
+    TOKEN_BLOCKLIST_ERROR_RATE = 0.001
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = 1.0
+
+
+class DevelopmentConfig(Config):
+    pass
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SECRET_KEY = 'testing-secret-key-long-enough-for-hs256'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite://')
+    BCRYPT_LOG_ROUNDS = 4
+    RECOMMENDATION_REFRESH_ENABLED = False
+
+
+class ProductionConfig(Config):
+    DATABASE_POOL_SIZE = 20
+    DATABASE_MAX_OVERFLOW = 20
+    CREATE_ALL = False
+    API_DOCS = 'static'
+
+
+config_by_name = {
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
+}
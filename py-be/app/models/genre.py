@@ -1,8 +1,7 @@
 # Import Lib
-import json
-import ast
 from datetime import datetime, timezone
 import uuid
+from sqlalchemy.orm import validates
 
 #Import dependencies
 from app import db
@@ -10,21 +9,87 @@ from app import db
 # ALWAYS RECHECK IF THE DATASTRUCTURE IS RIGHT
 class Genre(db.Model) :
     genre_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False)
-    genre_titles = db.Column(db.Text, nullable=True)
-    user_id = db.Column(db.String(36), nullable=True)
-    genre_date_added = db.Column(db.DateTime, default=datetime.now(timezone.utc), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('user.user_id', name='fk_genre_user_id_user', ondelete='CASCADE'),
+                        nullable=True)
+    genre_date_added = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
-    def to_dict(self) :
-        try:
-            genre_titles = json.loads(self.genre_titles)
-        except (ValueError, SyntaxError, json.JSONDecodeError):
-            genre_titles = []
+    user = db.relationship('User', back_populates='genres', foreign_keys=[user_id])
+    titles = db.relationship('GenreTitle', order_by='GenreTitle.position', lazy='selectin',
+                             cascade='all, delete-orphan', passive_updates=False)
+
+    __table_args__ = (
+        # Backs the keyset pagination in GET /genre/get
+        db.Index('ix_genre_date_added_genre_id', 'genre_date_added', 'genre_id'),
+        # Per-user lookups, optionally in date order
+        db.Index('ix_genre_user_id_date_added', 'user_id', 'genre_date_added'),
+    )
+
+    @property
+    def genre_titles(self):
+        from app.services.vocabulary import genre_vocabulary
+        return genre_vocabulary.titles([t.title_id for t in self.titles])
+
+    @genre_titles.setter
+    def genre_titles(self, titles):
+        self.assign_titles(titles)
 
+    def assign_titles(self, titles, session=None):
+        """
+        Replace the titles, interning new ones through `session` (default
+        db.session).
+        """
+        from app.services.vocabulary import genre_vocabulary
+        ids = genre_vocabulary.intern(titles, session)
+        self.titles = [GenreTitle(position=i, title_id=ids[title], user_id=self.user_id)
+                       for i, title in enumerate(titles)]
+
+    @validates('user_id')
+    def _sync_title_user_id(self, key, user_id):
+        for t in self.titles:
+            t.user_id = user_id
+        return user_id
+
+    def to_dict(self) :
         return {
             'genre_id': self.genre_id,
-            'genre_titles': genre_titles,
+            'genre_titles': self.genre_titles,
             'user_id': self.user_id,
             'genre_date_added' : self.genre_date_added.isoformat()
         }
-    
-    
\ No newline at end of file
+
+
+class GenreVocabulary(db.Model) :
+    """
+    Every distinct genre title, interned to a small integer id. Rows are
+    only ever added, so an id keeps meaning the same title for good.
+    """
+    __tablename__ = 'genre_vocabulary'
+
+    title_id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(255), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('title', name='uq_genre_vocabulary_title'),
+    )
+
+
+class GenreTitle(db.Model) :
+    """
+    One title of a Genre row, by genre_vocabulary id. user_id is copied
+    from the parent so that "which users like title X" is a seek on
+    (title_id, user_id). playtime_minutes is the weight behind the title's
+    position for genres derived from a Steam import, and NULL otherwise.
+    """
+    __tablename__ = 'genre_title'
+
+    genre_id = db.Column(db.String(36), db.ForeignKey('genre.genre_id', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title_id = db.Column(db.Integer, db.ForeignKey('genre_vocabulary.title_id',
+                                                   name='fk_genre_title_title_id_genre_vocabulary'), nullable=False)
+    user_id = db.Column(db.String(36), nullable=True)
+    playtime_minutes = db.Column(db.Integer, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_genre_title_title_id_user_id', 'title_id', 'user_id'),
+        db.Index('ix_genre_title_user_id', 'user_id'),
+    )
@@ -0,0 +1,25 @@
+# Import Lib
+from datetime import datetime, timezone
+
+#Import dependencies
+from app import db
+
+
+class RecapSummary(db.Model):
+    """
+    Materialized per-user recap, maintained by services.recap. `payload` is
+    the ready-to-send JSON body of GET /recap/<user_id>; the count columns
+    keep what the next refresh needs to report changes between periods.
+    """
+    __tablename__ = 'recap_summary'
+
+    user_id = db.Column(db.String(36), db.ForeignKey('user.user_id', name='fk_recap_summary_user_id_user',
+                                                     ondelete='CASCADE'),
+                        primary_key=True)
+    # JSON {title: number of the user's genres listing it}
+    title_counts = db.Column(db.Text, nullable=False)
+    # title_counts as of period_start, or NULL before the first full period
+    previous_title_counts = db.Column(db.Text, nullable=True)
+    period_start = db.Column(db.DateTime, nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
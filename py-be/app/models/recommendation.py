@@ -1,9 +1,7 @@
 #Import Libraries
-import json
-import ast
-import bcrypt
 from datetime import datetime, timezone
 import uuid
+from sqlalchemy.orm import validates
 
 #import dependencies
 from app import db
@@ -11,19 +9,60 @@ from app import db
 # ALWAYS RECHECK IF THE DATASTRUCTURE IS RIGHT
 class Recommendation(db.Model):
     recommendation_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False)
-    recommendation_titles = db.Column(db.Text, nullable=True)
-    user_id = db.Column(db.String(36), nullable=True)
-    recommendation_date_added = db.Column(db.DateTime, default=datetime.now(timezone.utc), nullable=False)
+    user_id = db.Column(db.String(36),
+                        db.ForeignKey('user.user_id', name='fk_recommendation_user_id_user', ondelete='CASCADE'),
+                        nullable=True)
+    recommendation_date_added = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    # 'api' for rows written through the API, 'recommender' for rows the
+    # batch job and background refresh own and replace
+    recommendation_source = db.Column(db.String(16), default='api', server_default='api', nullable=False)
 
-    def to_dict(self):
-        try:
-            recommendation_titles = json.loads(self.recommendation_titles)
-        except (ValueError, SyntaxError, json.JSONDecodeError):
-            recommendation_titles = []
+    user = db.relationship('User', back_populates='recommendations')
+    titles = db.relationship('RecommendationTitle', order_by='RecommendationTitle.position', lazy='selectin',
+                             cascade='all, delete-orphan', passive_updates=False)
+
+    # Per-user lookups, latest first
+    __table_args__ = (
+        db.Index('ix_recommendation_user_id_date_added', 'user_id', 'recommendation_date_added'),
+    )
+
+    @property
+    def recommendation_titles(self):
+        return [t.title for t in self.titles]
+
+    @recommendation_titles.setter
+    def recommendation_titles(self, titles):
+        self.titles = [RecommendationTitle(position=i, title=title, user_id=self.user_id)
+                       for i, title in enumerate(titles)]
+
+    @validates('user_id')
+    def _sync_title_user_id(self, key, user_id):
+        for t in self.titles:
+            t.user_id = user_id
+        return user_id
 
+    def to_dict(self):
         return {
             'recommendation_id' : self.recommendation_id,
-            'recommendation_titles' : recommendation_titles,
+            'recommendation_titles' : self.recommendation_titles,
             'user_id' : self.user_id,
-            'recommendation_date_added' : self.recommendation_date_added
-        }
\ No newline at end of file
+            'recommendation_date_added' : self.recommendation_date_added.isoformat()
+        }
+
+
+class RecommendationTitle(db.Model):
+    """
+    One recommended title. user_id is copied from the parent so per-title
+    lookups are a seek on (title, user_id).
+    """
+    __tablename__ = 'recommendation_title'
+
+    recommendation_id = db.Column(db.String(36), db.ForeignKey('recommendation.recommendation_id', ondelete='CASCADE'),
+                                  primary_key=True)
+    position = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(255), nullable=False)
+    user_id = db.Column(db.String(36), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_recommendation_title_title_user_id', 'title', 'user_id'),
+    )
@@ -1,24 +1,46 @@
 #Import Libraries
-import bcrypt
 from datetime import datetime, timezone
 import uuid
 
 #import dependencies
 from app import db
+from app.services.passwords import password_hasher
 
 class User(db.Model) :
     user_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False)
     user_name = db.Column(db.String(80), nullable=False)
     user_email = db.Column(db.String(120), unique=True, nullable=False)
     user_password_hash = db.Column(db.String(128), nullable=False)
-    genre_id = db.Column(db.String(36), nullable=True)
-    user_date_added = db.Column(db.DateTime, default=datetime.now(timezone.utc), nullable=False)
+    # use_alter breaks the user <-> genre foreign key cycle at create time
+    genre_id = db.Column(db.String(36),
+                         db.ForeignKey('genre.genre_id', name='fk_user_genre_id_genre', ondelete='SET NULL',
+                                       use_alter=True),
+                         nullable=True)
+    user_date_added = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    # Children are left alone on delete; the foreign keys cascade in the database
+    genres = db.relationship('Genre', back_populates='user', foreign_keys='Genre.user_id', passive_deletes='all')
+    recommendations = db.relationship('Recommendation', back_populates='user',
+                                      order_by='Recommendation.recommendation_date_added.desc()',
+                                      passive_deletes='all')
+
+    # Columns that may be exposed through the API; the password hash never is
+    PUBLIC_FIELDS = ('user_id', 'user_name', 'user_email', 'user_date_added')
+
+    __table_args__ = (
+        # Backs the keyset pagination in GET /user/get
+        db.Index('ix_user_date_added_user_id', 'user_date_added', 'user_id'),
+        db.Index('ix_user_genre_id', 'genre_id'),
+    )
 
     def set_password(self, password_input) :
-        self.user_password_hash = bcrypt.hashpw(password_input.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.user_password_hash = password_hasher.hash(password_input)
 
     def check_password(self, password_input) :
-        return bcrypt.checkpw(password_input.encode('utf-8'), self.user_password_hash.encode('utf-8'))
+        return password_hasher.verify(password_input, self.user_password_hash)
+
+    def password_needs_rehash(self) :
+        return password_hasher.needs_rehash(self.user_password_hash)
 
     def to_dict(self) :
         return {
@@ -0,0 +1,111 @@
+#Import Library
+import os
+import threading
+from importlib.util import find_spec
+from flask import Blueprint, abort, current_app, request, send_from_directory, url_for
+
+#Import Dependencies
+from app.utils.apispec import build_spec
+
+apidocs_bp = Blueprint('apidocs', __name__)
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8">
+    <title>steam_recap API</title>
+    <link rel="stylesheet" href="%(static)s/swagger-ui.css">
+  </head>
+  <body>
+    <div id="swagger-ui"></div>
+    <script src="%(static)s/swagger-ui-bundle.js"></script>
+    <script src="%(static)s/swagger-ui-standalone-preset.js"></script>
+    <script>
+      window.onload = function () {
+        window.ui = SwaggerUIBundle({
+          url: '%(spec)s',
+          dom_id: '#swagger-ui',
+          deepLinking: true,
+          presets: [SwaggerUIBundle.presets.apis, SwaggerUIStandalonePreset],
+          layout: 'StandaloneLayout'
+        });
+      };
+    </script>
+  </body>
+</html>
+"""
+
+
+class ApiDocs:
+    """
+    Serves the OpenAPI spec at /apispec_1.json and Swagger UI at /apidocs/
+    without importing flasgger or walking the @swag_from dicts at startup.
+
+    API_DOCS selects:
+
+    - 'lazy' (default): flasgger generates the spec on the first request
+      for it, and the JSON is cached for the life of the process.
+    - 'static': the spec is read from API_SPEC_PATH, written at build time
+      by `flask apidocs build`. If the file is missing this falls back to
+      'lazy' with a warning.
+    - 'off': no docs routes.
+
+    The UI page uses the Swagger UI assets bundled with flasgger.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spec = None
+        self.path = None
+
+    def init_app(self, app):
+        mode = app.config['API_DOCS']
+        if mode not in ('lazy', 'static', 'off'):
+            raise ValueError('API_DOCS must be lazy, static or off')
+        self._spec = None
+        self.path = app.config['API_SPEC_PATH'] or os.path.join(app.instance_path, 'apispec.json')
+        if mode == 'off':
+            return
+        if mode == 'static':
+            if os.path.exists(self.path):
+                with open(self.path, 'rb') as f:
+                    self._spec = f.read()
+            else:
+                app.logger.warning('API_DOCS is static but %s does not exist; run "flask apidocs build". '
+                                   'Generating the spec on first request instead.', self.path)
+        app.register_blueprint(apidocs_bp)
+
+    def spec(self):
+        if self._spec is None:
+            with self._lock:
+                if self._spec is None:
+                    self._spec = build_spec(current_app._get_current_object())
+        return self._spec
+
+
+def _static_folder():
+    spec = find_spec('flasgger')
+    if spec is None:
+        return None
+    return os.path.join(spec.submodule_search_locations[0], 'ui3', 'static')
+
+
+@apidocs_bp.route('/apispec_1.json')
+def apispec():
+    return current_app.response_class(api_docs.spec(), mimetype='application/json')
+
+
+@apidocs_bp.route('/apidocs/')
+def apidocs():
+    return PAGE % {'static': request.script_root + '/flasgger_static', 'spec': url_for('apidocs.apispec')}
+
+
+@apidocs_bp.route('/flasgger_static/<path:filename>')
+def static_file(filename):
+    folder = _static_folder()
+    if folder is None:
+        abort(404)
+    return send_from_directory(folder, filename)
+
+
+api_docs = ApiDocs()
@@ -0,0 +1,108 @@
+#Import Library
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire `ttl` seconds after
+    being stored. Evicts the least recently used entry beyond `maxsize`.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires, value = entry
+            if expires <= self._clock():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LocalClient:
+    """
+    In-process stand-in for the Redis client used by the shared response
+    cache and token blocklist, for development and tests without a Redis
+    server. Implements only the commands those use.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def get(self, key):
+        with self._lock:
+            value, expires = self._data.get(key, (None, None))
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._data.get(key, (0, None))[0]) + 1
+            self._data[key] = (str(value).encode('ascii'), None)
+            return value
+
+    def zadd(self, key, mapping):
+        with self._lock:
+            scores = self._data.setdefault(key, ({}, None))[0]
+            scores.update(mapping)
+            return len(mapping)
+
+    def zrangebyscore(self, key, min, max, withscores=False):
+        low = float('-inf') if min == '-inf' else float(min)
+        high = float('inf') if max == '+inf' else float(max)
+        with self._lock:
+            scores = self._data.get(key, ({}, None))[0]
+            found = sorted((score, member) for member, score in scores.items() if low <= score <= high)
+        members = [member.encode('utf-8') if isinstance(member, str) else member for _, member in found]
+        if withscores:
+            return [(member, score) for member, (score, _) in zip(members, found)]
+        return members
+
+    def zremrangebyscore(self, key, min, max):
+        low = float('-inf') if min == '-inf' else float(min)
+        high = float('inf') if max == '+inf' else float(max)
+        with self._lock:
+            scores = self._data.get(key, ({}, None))[0]
+            doomed = [member for member, score in scores.items() if low <= score <= high]
+            for member in doomed:
+                del scores[member]
+            return len(doomed)
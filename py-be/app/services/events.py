@@ -0,0 +1,12 @@
+#Import Library
+from collections import namedtuple
+from blinker import Namespace
+
+_signals = Namespace()
+
+# One entry per Genre row touched by a write. titles is None when the row
+# was deleted; old_user_id is None when the row was created.
+GenreChange = namedtuple('GenreChange', ['genre_id', 'old_user_id', 'user_id', 'titles'])
+
+# Sent after a genre write has been committed, with changes=[GenreChange, ...]
+genres_changed = _signals.signal('genres-changed')
@@ -0,0 +1,245 @@
+#Import Library
+import hashlib
+import threading
+from array import array
+from bisect import bisect_left, insort
+from sqlalchemy import select
+
+#Import Dependencies
+from app import db
+from app.services.vocabulary import genre_vocabulary
+
+# A Genre row in a user's record: 4 words of genre_id hash, the title
+# count, then the title ids
+_HEADER = 5
+
+
+class GenreIndex:
+    """
+    In-memory inverted index of genre title -> users, built from the
+    genre_title table at startup and kept current from genres_changed.
+
+    Everything is stored as packed integers: titles by genre_vocabulary id
+    and users by a dense ordinal. A title's posting list is a sorted
+    array('I') of user ordinals, and all of a user's Genre rows live in a
+    single array('H') (array('I') once title ids outgrow 16 bits) of
+    [genre_id hash, title count, title ids...] records, so a user costs one
+    small array plus a few bytes per title rather than a Counter and sets
+    of strings.
+
+    A user can own several Genre rows; a title only leaves their posting
+    list when none of their rows lists it any more.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {}
+        self._ordinals = {}
+        self._user_ids = []
+        self._records = []
+        self._free = []
+
+    def build(self, rows):
+        """
+        Replace the index contents with `rows` of (genre_id, user_id, title_ids).
+        """
+        with self._lock:
+            self._reset()
+            for genre_id, user_id, title_ids in rows:
+                if user_id is not None:
+                    ordinal = self._ordinal(user_id)
+                    self._records[ordinal] = _append(self._records[ordinal], _genre_key(genre_id), title_ids)
+            # Walking users in ordinal order leaves every posting list sorted
+            postings = {}
+            for ordinal, record in enumerate(self._records):
+                for title_id in _owned(record):
+                    postings.setdefault(title_id, array('I')).append(ordinal)
+            self._postings = postings
+
+    def build_from_db(self, batch_size=10000):
+        from app.models.genre import GenreTitle
+
+        query = select(GenreTitle.genre_id, GenreTitle.user_id, GenreTitle.title_id) \
+            .where(GenreTitle.user_id.is_not(None)) \
+            .order_by(GenreTitle.genre_id, GenreTitle.position) \
+            .execution_options(yield_per=batch_size)
+        self.build(_group_titles(db.session.execute(query)))
+
+    def apply(self, genre_id, user_id, titles, old_user_id=None):
+        """
+        Record the current state of one Genre row, previously owned by
+        `old_user_id`; titles=None removes it.
+        """
+        ids = genre_vocabulary.ids(titles) if titles is not None else {}
+        key = _genre_key(genre_id)
+        with self._lock:
+            for owner in {old_user_id, user_id} - {None}:
+                self._drop(owner, key)
+            if titles is not None and user_id is not None:
+                self._put(user_id, key, [ids[title] for title in titles if title in ids])
+
+    def on_genres_changed(self, sender, changes, **kwargs):
+        for change in changes:
+            self.apply(change.genre_id, change.user_id, change.titles, change.old_user_id)
+
+    def users_for(self, titles, match_all=True):
+        """
+        Return the sorted user_ids whose genres contain all (or any) of `titles`.
+        """
+        titles = set(titles)
+        ids = genre_vocabulary.ids(titles)
+        if not ids or (match_all and len(ids) < len(titles)):
+            return []
+        # Imported here so that an app that never queries the index
+        # does not pay for numpy at startup
+        import numpy as np
+
+        with self._lock:
+            postings = [self._postings.get(title_id) for title_id in ids.values()]
+            if match_all:
+                if any(posting is None for posting in postings):
+                    return []
+                # Probe from the smallest posting list so the cost is bounded
+                # by the rarest title, not by the most popular one
+                postings.sort(key=len)
+                ordinals = np.array(postings[0], dtype=np.uint32)
+                for posting in postings[1:]:
+                    ordinals = _intersect(ordinals, np.frombuffer(posting, dtype=np.uint32))
+                    if not len(ordinals):
+                        return []
+            else:
+                postings = [posting for posting in postings if posting]
+                if not postings:
+                    return []
+                # Buffer views pin their array's size, so none may outlive the lock
+                ordinals = np.unique(np.concatenate([np.frombuffer(p, dtype=np.uint32) for p in postings]))
+            user_ids = self._user_ids
+            users = [user_ids[ordinal] for ordinal in ordinals.tolist()]
+        return sorted(users)
+
+    def titles_for(self, user_id):
+        return set(genre_vocabulary.titles(self.title_ids_for(user_id)))
+
+    def title_ids_for(self, user_id):
+        """
+        Sorted distinct title ids across the user's genres.
+        """
+        with self._lock:
+            ordinal = self._ordinals.get(user_id)
+            return sorted(_owned(self._records[ordinal])) if ordinal is not None else []
+
+    def user_title_ids(self):
+        """
+        Snapshot of ([user_id], [sorted title ids]) for every indexed user.
+        """
+        with self._lock:
+            user_ids, title_ids = [], []
+            for user_id, record in zip(self._user_ids, self._records):
+                if user_id is not None:
+                    user_ids.append(user_id)
+                    title_ids.append(sorted(_owned(record)))
+        return user_ids, title_ids
+
+    def _ordinal(self, user_id):
+        ordinal = self._ordinals.get(user_id)
+        if ordinal is None:
+            if self._free:
+                ordinal = self._free.pop()
+                self._user_ids[ordinal] = user_id
+                self._records[ordinal] = array('H')
+            else:
+                ordinal = len(self._user_ids)
+                self._user_ids.append(user_id)
+                self._records.append(array('H'))
+            self._ordinals[user_id] = ordinal
+        return ordinal
+
+    def _put(self, user_id, key, title_ids):
+        ordinal = self._ordinal(user_id)
+        record = self._records[ordinal]
+        owned = _owned(record)
+        self._records[ordinal] = _append(record, key, title_ids)
+        for title_id in set(title_ids) - owned:
+            insort(self._postings.setdefault(title_id, array('I')), ordinal)
+
+    def _drop(self, user_id, key):
+        ordinal = self._ordinals.get(user_id)
+        if ordinal is None:
+            return
+        record = self._records[ordinal]
+        start = _find(record, key)
+        if start is None:
+            return
+        end = start + _HEADER + record[start + 4]
+        removed = set(record[start + _HEADER:end])
+        del record[start:end]
+        for title_id in removed - _owned(record):
+            posting = self._postings[title_id]
+            del posting[bisect_left(posting, ordinal)]
+            if not posting:
+                del self._postings[title_id]
+        if not record:
+            del self._ordinals[user_id]
+            self._user_ids[ordinal] = None
+            self._records[ordinal] = None
+            self._free.append(ordinal)
+
+
+def _genre_key(genre_id):
+    digest = hashlib.blake2b(str(genre_id).encode('utf-8'), digest_size=8).digest()
+    return tuple(int.from_bytes(digest[i:i + 2], 'little') for i in range(0, 8, 2))
+
+
+def _append(record, key, title_ids):
+    if record.typecode == 'H' and max(title_ids, default=0) > 0xFFFF:
+        record = array('I', record)
+    record.extend(key)
+    record.append(len(title_ids))
+    record.extend(title_ids)
+    return record
+
+
+def _find(record, key):
+    i = 0
+    while i < len(record):
+        if tuple(record[i:i + 4]) == key:
+            return i
+        i += _HEADER + record[i + 4]
+    return None
+
+
+def _owned(record):
+    owned, i = set(), 0
+    while i < len(record):
+        end = i + _HEADER + record[i + 4]
+        owned.update(record[i + _HEADER:end])
+        i = end
+    return owned
+
+
+def _intersect(small, large):
+    """
+    Sorted ordinals of `small` that also appear in sorted `large`, by binary
+    search, i.e. O(len(small) * log(len(large))).
+    """
+    found = large.searchsorted(small)
+    found[found == len(large)] = 0
+    return small[large[found] == small] if len(large) else small[:0]
+
+
+def _group_titles(rows):
+    current, user_id, titles = None, None, []
+    for genre_id, row_user_id, title in rows:
+        if genre_id != current:
+            if current is not None:
+                yield current, user_id, titles
+            current, user_id, titles = genre_id, row_user_id, []
+        titles.append(title)
+    if current is not None:
+        yield current, user_id, titles
+
+
+genre_index = GenreIndex()
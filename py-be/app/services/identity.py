@@ -0,0 +1,50 @@
+#Import Library
+from collections import namedtuple
+from flask import current_app
+from sqlalchemy import select
+
+#Import Dependencies
+from app import db
+from app.services.cache import TTLCache
+
+# What handlers get as flask_jwt_extended.current_user; never the password hash
+CurrentUser = namedtuple('CurrentUser', ['user_id', 'user_name', 'user_email', 'genre_id'])
+
+
+class IdentityCache:
+    """
+    Resolves a token's identity to a CurrentUser for every @jwt_required
+    request, through flask_jwt_extended's user_lookup_loader, without a
+    query per request: records are kept per process for IDENTITY_CACHE_TTL
+    seconds. edit_user and delete_user invalidate their entry; other
+    workers catch up within the TTL. A token whose user no longer exists
+    is rejected with 401.
+    """
+
+    def __init__(self):
+        self._cache = TTLCache(10000, 60)
+
+    def init_app(self, app):
+        self._cache = TTLCache(app.config['IDENTITY_CACHE_SIZE'], app.config['IDENTITY_CACHE_TTL'])
+
+    def get(self, user_id):
+        user = self._cache.get(user_id)
+        if user is None:
+            from app.models.user import User
+            row = db.session.execute(
+                select(User.user_id, User.user_name, User.user_email, User.genre_id).where(User.user_id == user_id)
+            ).first()
+            if row is None:
+                return None
+            user = CurrentUser(*row)
+            self._cache.set(user_id, user)
+        return user
+
+    def invalidate(self, user_id):
+        self._cache.pop(user_id)
+
+    def user_lookup(self, jwt_header, jwt_payload):
+        return self.get(jwt_payload[current_app.config['JWT_IDENTITY_CLAIM']])
+
+
+identity_cache = IdentityCache()
@@ -0,0 +1,135 @@
+#Import Library
+import contextvars
+import os
+import time
+from flask import Response, request
+from sqlalchemy import event
+
+#Import Dependencies
+from app.services.metrics import (
+    render_text, request_password_seconds, request_seconds, request_serialization_seconds,
+    request_sql_queries, request_sql_seconds, response_size_bytes
+)
+from app.services.profiling import SlowRequestProfiler
+
+_current = contextvars.ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('started', 'sql_queries', 'sql_seconds', 'password_seconds',
+                 'serialization_seconds', 'size', 'profile')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_queries = 0
+        self.sql_seconds = 0.0
+        self.password_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.size = 0
+        self.profile = None
+
+
+def current_stats():
+    """
+    Stats of the request being served on this thread, or None when
+    instrumentation is off or outside a request.
+    """
+    return _current.get()
+
+
+class Instrumentation:
+    """
+    Opt-in (INSTRUMENTATION_ENABLED) per-request metrics: wall time, SQL
+    statement count and time (engine events), time waiting on bcrypt, time
+    encoding JSON and response size, exported per endpoint at /metrics.
+
+    Timings are recorded when the response is closed, so streamed bodies
+    are included. With PROFILE_SLOWEST_PERCENT > 0, sampled requests are
+    also profiled (see SlowRequestProfiler).
+    """
+
+    def __init__(self):
+        self.profiler = None
+
+    def init_app(self, app, engine):
+        if not app.config['INSTRUMENTATION_ENABLED']:
+            return
+        if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+        if app.config['PROFILE_SLOWEST_PERCENT'] > 0:
+            self.profiler = SlowRequestProfiler(
+                app.config['PROFILE_SLOWEST_PERCENT'],
+                app.config['PROFILE_SAMPLE_RATE'],
+                app.config['PROFILE_MODE'],
+                app.config['PROFILE_INTERVAL'],
+                app.config['PROFILE_DIR'] or os.path.join(app.instance_path, 'profiles'),
+            )
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics)
+
+    def metrics(self):
+        return Response(render_text(), mimetype='text/plain; version=0.0.4')
+
+    def _before_request(self):
+        stats = RequestStats()
+        if self.profiler is not None:
+            stats.profile = self.profiler.begin()
+        _current.set(stats)
+
+    def _after_request(self, response):
+        stats = _current.get()
+        if stats is None:
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        method = request.method
+
+        if response.is_streamed:
+            response.response = _counted(response.response, stats)
+        else:
+            stats.size = response.content_length or 0
+
+        def finish():
+            _current.set(None)
+            duration = time.perf_counter() - stats.started
+            request_seconds.observe(duration, endpoint=endpoint, method=method, status=str(response.status_code))
+            request_sql_queries.observe(stats.sql_queries, endpoint=endpoint)
+            request_sql_seconds.observe(stats.sql_seconds, endpoint=endpoint)
+            request_password_seconds.observe(stats.password_seconds, endpoint=endpoint)
+            request_serialization_seconds.observe(stats.serialization_seconds, endpoint=endpoint)
+            response_size_bytes.observe(stats.size, endpoint=endpoint)
+            if self.profiler is not None:
+                self.profiler.end(stats.profile, duration, endpoint)
+
+        response.call_on_close(finish)
+        return response
+
+
+def _counted(iterable, stats):
+    try:
+        for chunk in iterable:
+            stats.size += len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            yield chunk
+    finally:
+        close = getattr(iterable, 'close', None)
+        if close is not None:
+            close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get('query_started')
+    if stats is not None and started:
+        stats.sql_queries += 1
+        stats.sql_seconds += time.perf_counter() - started.pop()
+
+
+instrumentation = Instrumentation()
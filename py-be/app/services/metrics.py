@@ -0,0 +1,98 @@
+#Import Library
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus style, keyed by label
+    values. Cheap enough to observe on every request.
+    """
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}
+        registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def snapshot(self):
+        """
+        Return {label values: (per-bucket counts incl. +Inf, count, sum)}.
+        """
+        with self._lock:
+            return {key: (list(counts), sum(counts), total) for key, (counts, total) in self._series.items()}
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{%s}' % ','.join('%s="%s"' % (name, value) for (name, _), value in zip(pairs, escaped))
+
+
+def render_text(histograms=None):
+    """
+    Render histograms in the Prometheus text exposition format.
+    """
+    lines = []
+    for histogram in registry if histograms is None else histograms:
+        lines.append('# HELP %s %s' % (histogram.name, histogram.documentation))
+        lines.append('# TYPE %s histogram' % histogram.name)
+        for key, (counts, count, total) in sorted(histogram.snapshot().items()):
+            cumulative = 0
+            for bound, bucket in zip(histogram.buckets + ('+Inf',), counts):
+                cumulative += bucket
+                le = bound if isinstance(bound, str) else repr(float(bound))
+                lines.append('%s_bucket%s %d' % (
+                    histogram.name, _labels(histogram.labelnames, key, [('le', le)]), cumulative))
+            lines.append('%s_sum%s %r' % (histogram.name, _labels(histogram.labelnames, key), total))
+            lines.append('%s_count%s %d' % (histogram.name, _labels(histogram.labelnames, key), count))
+    return '\n'.join(lines) + '\n'
+
+
+registry = []
+
+password_hash_seconds = Histogram(
+    'password_hash_seconds', 'Time spent in bcrypt per operation.', ['operation']
+)
+password_queue_wait_seconds = Histogram(
+    'password_queue_wait_seconds', 'Time a password operation waited for a hashing worker.', ['operation']
+)
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+
+request_seconds = Histogram(
+    'http_request_duration_seconds', 'Wall time per request, until the body was fully sent.',
+    ['endpoint', 'method', 'status']
+)
+request_sql_queries = Histogram(
+    'http_request_sql_queries', 'SQL statements executed per request.', ['endpoint'], COUNT_BUCKETS
+)
+request_sql_seconds = Histogram(
+    'http_request_sql_seconds', 'Time spent executing SQL per request.', ['endpoint']
+)
+request_password_seconds = Histogram(
+    'http_request_password_seconds', 'Time a request spent waiting on bcrypt.', ['endpoint']
+)
+request_serialization_seconds = Histogram(
+    'http_request_serialization_seconds', 'Time spent encoding JSON per request.', ['endpoint']
+)
+response_size_bytes = Histogram(
+    'http_response_size_bytes', 'Response body size.', ['endpoint'], SIZE_BUCKETS
+)
@@ -0,0 +1,110 @@
+#Import Library
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+import bcrypt
+
+#Import Dependencies
+from app.services.instrumentation import current_stats
+from app.services.metrics import password_hash_seconds, password_queue_wait_seconds
+
+
+class PasswordPoolBusy(Exception):
+    """
+    Raised when the hashing queue is full; mapped to 503 by the blueprints.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool instead of the request
+    thread. bcrypt releases the GIL, so PASSWORD_POOL_WORKERS hashes run in
+    parallel while other requests keep being served.
+
+    At most PASSWORD_POOL_MAX_PENDING operations may be queued or running;
+    beyond that callers fail fast with PasswordPoolBusy rather than piling
+    up behind a login storm. BCRYPT_LOG_ROUNDS sets the cost of new hashes.
+
+    hash_async() / verify_async() share the same pool and limits and await
+    the result, so an event loop keeps running while bcrypt does.
+    """
+
+    def __init__(self):
+        self.rounds = 12
+        self.timeout = 10.0
+        self._pool = None
+        self._slots = None
+
+    def init_app(self, app):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        self.rounds = app.config['BCRYPT_LOG_ROUNDS']
+        self.timeout = app.config['PASSWORD_POOL_TIMEOUT']
+        self._pool = ThreadPoolExecutor(max_workers=app.config['PASSWORD_POOL_WORKERS'],
+                                        thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(app.config['PASSWORD_POOL_MAX_PENDING'])
+
+    def hash(self, password):
+        salt = bcrypt.gensalt(self.rounds)
+        return self._run('hash', lambda: bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8'))
+
+    def verify(self, password, password_hash):
+        return self._run('verify', lambda: bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')))
+
+    async def hash_async(self, password):
+        salt = bcrypt.gensalt(self.rounds)
+        return await self._run_async('hash', lambda: bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8'))
+
+    async def verify_async(self, password, password_hash):
+        return await self._run_async(
+            'verify', lambda: bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')))
+
+    def needs_rehash(self, password_hash):
+        """
+        True when `password_hash` was made with a different cost than the
+        configured one, e.g. after BCRYPT_LOG_ROUNDS was changed.
+        """
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _submit(self, operation, func):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            password_queue_wait_seconds.observe(started - submitted, operation=operation)
+            try:
+                return func()
+            finally:
+                password_hash_seconds.observe(time.perf_counter() - started, operation=operation)
+                self._slots.release()
+
+        return self._pool.submit(task)
+
+    def _run(self, operation, func):
+        submitted = time.perf_counter()
+        future = self._submit(operation, func)
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeout:
+            raise PasswordPoolBusy()
+        finally:
+            stats = current_stats()
+            if stats is not None:
+                stats.password_seconds += time.perf_counter() - submitted
+
+    async def _run_async(self, operation, func):
+        future = self._submit(operation, func)
+        try:
+            # shield: a timed-out task must still run, or its slot is never released
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+        except asyncio.TimeoutError:
+            raise PasswordPoolBusy()
+
+
+password_hasher = PasswordHasher()
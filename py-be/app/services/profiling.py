@@ -0,0 +1,136 @@
+#Import Library
+import collections
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+# Durations needed before the slowest-percentile threshold means anything
+MIN_SAMPLES = 20
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of registered threads every `interval`
+    seconds from one background thread, counting collapsed stacks
+    ("outer;inner;leaf"). Cheap enough to leave on for a fraction of live
+    traffic, unlike a deterministic profiler.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def start(self, thread_id):
+        with self._lock:
+            self._threads[thread_id] = collections.Counter()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._worker.start()
+
+    def stop(self, thread_id):
+        with self._lock:
+            return self._threads.pop(thread_id, collections.Counter())
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._threads:
+                    self._worker = None
+                    return
+                frames = sys._current_frames()
+                for thread_id, counter in self._threads.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        counter[collapse(frame)] += 1
+            time.sleep(self.interval)
+
+
+def collapse(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        # co_qualname is Python 3.11+
+        name = getattr(code, 'co_qualname', code.co_name)
+        stack.append('%s (%s:%d)' % (name, os.path.basename(code.co_filename), code.co_firstlineno))
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+class SlowRequestProfiler:
+    """
+    Profiles a random PROFILE_SAMPLE_RATE of requests and keeps only those
+    whose wall time lands in the slowest PROFILE_SLOWEST_PERCENT of recent
+    requests, written to PROFILE_DIR:
+
+    - PROFILE_MODE 'stack': <ts>-<endpoint>-<ms>.folded collapsed stacks,
+      ready for flamegraph.pl or speedscope.
+    - PROFILE_MODE 'cprofile': <ts>-<endpoint>-<ms>.prof pstats dumps, for
+      snakeviz or flameprof.
+    """
+
+    def __init__(self, percent, sample_rate, mode, interval, directory, window=1000):
+        if mode not in ('stack', 'cprofile'):
+            raise ValueError('PROFILE_MODE must be stack or cprofile')
+        self.percent = percent
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.directory = directory
+        self._sampler = StackSampler(interval) if mode == 'stack' else None
+        self._durations = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def begin(self):
+        """
+        Start profiling the current request if it is sampled; returns a
+        handle for end(), or None.
+        """
+        if random.random() >= self.sample_rate:
+            return None
+        if self._sampler is not None:
+            thread_id = threading.get_ident()
+            self._sampler.start(thread_id)
+            return thread_id
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is already active on this thread
+            return None
+        return profile
+
+    def end(self, handle, duration, endpoint):
+        """
+        Record `duration` and, for a sampled request in the slowest
+        percentile, write its profile. Returns the written path or None.
+        """
+        with self._lock:
+            self._durations.append(duration)
+            if handle is None:
+                return None
+            ranked = sorted(self._durations)
+        threshold = ranked[min(len(ranked) - 1, int(len(ranked) * (1 - self.percent / 100.0)))]
+
+        if self._sampler is not None:
+            stacks = self._sampler.stop(handle)
+        else:
+            handle.disable()
+        if len(ranked) < MIN_SAMPLES or duration < threshold:
+            return None
+
+        name = '%d-%s-%dms' % (time.time() * 1000, re.sub(r'[^A-Za-z0-9_.-]', '_', endpoint), duration * 1000)
+        if self._sampler is not None:
+            path = os.path.join(self.directory, name + '.folded')
+            with open(path, 'w') as f:
+                for stack, count in stacks.most_common():
+                    f.write('%s %d\n' % (stack, count))
+        else:
+            path = os.path.join(self.directory, name + '.prof')
+            handle.dump_stats(path)
+        return path
@@ -0,0 +1,157 @@
+#Import Library
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, func, insert, select
+
+#Import Dependencies
+from app import db
+from app.services.vocabulary import genre_vocabulary
+from app.utils.bulk import chunked
+
+
+class RecapService:
+    """
+    Keeps the recap_summary table current. Every genre write sends
+    genres_changed; the owners of the touched genres (old and new user_id)
+    are recomputed from genre_title with one grouped query per chunk of
+    users, counting by title id and naming titles from the in-process
+    vocabulary, so a recap read is a single primary-key lookup.
+
+    A recap reports the user's top RECAP_TOP_N genre titles with their
+    share of all title mentions, and the change against the distribution
+    at the start of the current RECAP_PERIOD_DAYS period. The period rolls
+    over on the first refresh after it ends.
+    """
+
+    def __init__(self):
+        self.top_n = 10
+        self.period = timedelta(days=30)
+        self.chunk_size = 1000
+
+    def init_app(self, app):
+        self.top_n = app.config['RECAP_TOP_N']
+        self.period = timedelta(days=app.config['RECAP_PERIOD_DAYS'])
+        self.chunk_size = app.config['BULK_CHUNK_SIZE']
+
+    def on_genres_changed(self, sender, changes, **kwargs):
+        user_ids = {change.user_id for change in changes} | {change.old_user_id for change in changes}
+        user_ids.discard(None)
+        self.refresh(user_ids)
+
+    def refresh(self, user_ids):
+        """
+        Recompute the summaries of `user_ids`, one transaction per chunk.
+        Returns the number of users refreshed.
+        """
+        refreshed = 0
+        for chunk in chunked(sorted(user_ids), self.chunk_size):
+            with db.engine.begin() as conn:
+                refreshed += self._refresh_chunk(conn, chunk)
+        return refreshed
+
+    def rebuild(self, progress=None):
+        """
+        Recompute every user's summary, e.g. to backfill the table.
+        """
+        from app.models.user import User
+
+        refreshed = 0
+        with db.engine.connect() as conn:
+            user_ids = conn.execute(select(User.user_id).order_by(User.user_id)).scalars().all()
+        for chunk in chunked(user_ids, self.chunk_size):
+            with db.engine.begin() as conn:
+                refreshed += self._refresh_chunk(conn, chunk)
+            if progress is not None:
+                progress(refreshed, len(user_ids))
+        return refreshed
+
+    def _refresh_chunk(self, conn, user_ids):
+        from app.models.genre import Genre, GenreTitle
+        from app.models.recap import RecapSummary
+        from app.models.user import User
+
+        grouped = conn.execute(
+            select(GenreTitle.user_id, GenreTitle.title_id, func.count())
+            .where(GenreTitle.user_id.in_(user_ids))
+            .group_by(GenreTitle.user_id, GenreTitle.title_id)
+        ).all()
+        title_ids = sorted({title_id for _, title_id, _ in grouped})
+        titles = dict(zip(title_ids, genre_vocabulary.titles(title_ids)))
+        counts = defaultdict(dict)
+        for user_id, title_id, count in grouped:
+            counts[user_id][titles[title_id]] = count
+        genre_counts = dict(conn.execute(
+            select(Genre.user_id, func.count()).where(Genre.user_id.in_(user_ids)).group_by(Genre.user_id)
+        ).all())
+        existing = {row.user_id: row for row in conn.execute(
+            select(RecapSummary.user_id, RecapSummary.title_counts, RecapSummary.previous_title_counts,
+                   RecapSummary.period_start).where(RecapSummary.user_id.in_(user_ids))
+        )}
+
+        # Deleted users are only cleared out: their rows would break the foreign key
+        live = set(conn.execute(select(User.user_id).where(User.user_id.in_(user_ids))).scalars())
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = []
+        for user_id in user_ids:
+            if user_id not in live:
+                continue
+            current = counts.get(user_id, {})
+            old = existing.get(user_id)
+            if old is None:
+                previous, period_start = None, now
+            elif now - old.period_start >= self.period:
+                previous, period_start = json.loads(old.title_counts), now
+            else:
+                previous = json.loads(old.previous_title_counts) if old.previous_title_counts else None
+                period_start = old.period_start
+            payload = self.summarize(user_id, genre_counts.get(user_id, 0), current, previous, period_start, now)
+            rows.append({
+                'user_id': user_id,
+                'title_counts': json.dumps(current),
+                'previous_title_counts': json.dumps(previous) if previous is not None else None,
+                'period_start': period_start,
+                'payload': json.dumps(payload),
+                'updated_at': now,
+            })
+
+        conn.execute(delete(RecapSummary).where(RecapSummary.user_id.in_(user_ids)))
+        if rows:
+            conn.execute(insert(RecapSummary), rows)
+        return len(rows)
+
+    def summarize(self, user_id, genre_count, current, previous, period_start, now):
+        total = sum(current.values())
+        top = sorted(current.items(), key=lambda item: (-item[1], item[0]))[:self.top_n]
+        summary = {
+            'user_id': user_id,
+            'genre_count': genre_count,
+            'title_count': total,
+            'top_genres': [
+                {'title': title, 'count': count, 'share': round(count / total, 4)} for title, count in top
+            ],
+            'changes': None,
+            'period_start': period_start.isoformat(),
+            'updated_at': now.isoformat(),
+        }
+        if previous is not None:
+            previous_total = sum(previous.values())
+            previous_top = sorted(previous.items(), key=lambda item: (-item[1], item[0]))[:self.top_n]
+            compared = [title for title, _ in top] + [t for t, _ in previous_top if t not in current]
+            summary['changes'] = {
+                'new': [title for title, _ in top if title not in previous],
+                'dropped': [title for title, _ in previous_top if title not in current],
+                'share_delta': {
+                    title: round(_share(current, total, title) - _share(previous, previous_total, title), 4)
+                    for title in compared
+                },
+            }
+        return summary
+
+
+def _share(counts, total, title):
+    return counts.get(title, 0) / total if total else 0.0
+
+
+recap_service = RecapService()
@@ -0,0 +1,140 @@
+#Import Library
+import os
+import threading
+import time
+from flask import current_app
+from sqlalchemy import select
+
+#Import Dependencies
+from app import db
+from app.services.cache import TTLCache
+from app.services.genre_index import genre_index
+from app.services.vocabulary import genre_vocabulary
+
+# Results are cached at this length and sliced per request, so one cache
+# entry per user serves every limit and can be invalidated by user_id alone
+MAX_RECOMMENDATIONS = 50
+
+
+def parse_limit(value, default=10):
+    """
+    Read a `limit` query argument, capped at MAX_RECOMMENDATIONS. Raises
+    ValueError unless it is a positive integer.
+    """
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return min(limit, MAX_RECOMMENDATIONS)
+
+
+class RecommendationService:
+    """
+    On-demand recommendations for a single user.
+
+    The title x title similarity model comes from recom_system and is built
+    from the in-memory genre index, then rebuilt once it is older than
+    RECOMMENDER_MAX_AGE seconds. Per-user results are kept in a TTL LRU
+    that is invalidated whenever that user's genres change.
+
+    Similar-user lookups use the MinHash LSH index at
+    RECOMMENDATION_LSH_PATH when one has been built (memory-mapped here),
+    and fall back to exact similarity otherwise. The index (and with it
+    numpy) is opened on the first similar-user lookup, not at startup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recommender = None
+        self._built_at = 0.0
+        self.cache = TTLCache()
+        self.lsh = None
+        self._lsh_path = None
+        self._lsh_loaded = False
+
+    def init_app(self, app):
+        self.cache = TTLCache(app.config['RECOMMENDATION_CACHE_SIZE'], app.config['RECOMMENDATION_CACHE_TTL'])
+        self._recommender = None
+        self.lsh = None
+        self._lsh_path = app.config['RECOMMENDATION_LSH_PATH']
+        self._lsh_loaded = False
+
+    def load_lsh(self, path):
+        self._lsh_path = path
+        self._lsh_loaded = True
+        if path and os.path.exists(os.path.join(path, 'meta.json')):
+            from recom_system import MinHashLSH
+            self.lsh = MinHashLSH.load(path)
+        else:
+            self.lsh = None
+
+    def lsh_index(self):
+        if not self._lsh_loaded:
+            with self._lock:
+                if not self._lsh_loaded:
+                    self.load_lsh(self._lsh_path)
+        return self.lsh
+
+    def recommender(self):
+        max_age = current_app.config['RECOMMENDER_MAX_AGE']
+        with self._lock:
+            if self._recommender is None or time.monotonic() - self._built_at > max_age:
+                # recom_system pulls in numpy and scipy, so it is only
+                # imported once recommendations are first asked for
+                from recom_system import GenreMatrix, Recommender
+
+                user_ids, title_ids = genre_index.user_title_ids()
+                genre_matrix = GenreMatrix.from_title_ids(user_ids, title_ids, genre_vocabulary.table())
+                self._recommender = Recommender(genre_matrix, current_app.config['RECOMMENDER_METRIC'])
+                self._built_at = time.monotonic()
+            return self._recommender
+
+    def recommend_for_user(self, user_id, limit=10):
+        """
+        Return the user's recommended titles, or None if they have no genres.
+        """
+        titles = self.cache.get(user_id)
+        if titles is None:
+            from app.models.genre import GenreTitle
+
+            owned = db.session.execute(
+                select(GenreTitle.title_id).where(GenreTitle.user_id == user_id).distinct()
+            ).scalars().all()
+            if not owned:
+                return None
+            titles = self.recommend_for_title_ids(user_id, owned)
+        return titles[:limit]
+
+    def recommend_for_title_ids(self, user_id, title_ids):
+        """
+        Score recommendations for a user owning `title_ids` and cache them.
+        This is the CPU-bound half of recommend_for_user, for callers that
+        read the user's titles themselves.
+        """
+        titles = self.recommender().recommend_for(genre_vocabulary.titles(title_ids), MAX_RECOMMENDATIONS)
+        self.cache.set(user_id, titles)
+        return titles
+
+    def similar_users(self, user_id, limit=10):
+        """
+        Return [(user_id, score)] for the users most similar to `user_id`.
+        """
+        titles = genre_index.titles_for(user_id)
+        if not titles:
+            return []
+        lsh = self.lsh_index()
+        if lsh is not None:
+            return lsh.query(titles, limit, exclude=user_id)
+        return self.recommender().similar_to(titles, limit, exclude=user_id)
+
+    def on_genres_changed(self, sender, changes, **kwargs):
+        for change in changes:
+            self.cache.pop(change.old_user_id)
+            self.cache.pop(change.user_id)
+
+
+recommendation_service = RecommendationService()
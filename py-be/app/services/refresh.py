@@ -0,0 +1,149 @@
+#Import Library
+import threading
+import time
+
+#Import Dependencies
+from app import db
+from app.services.genre_index import genre_index
+from app.services.recommender import MAX_RECOMMENDATIONS, recommendation_service
+from app.services.response_cache import response_cache
+
+# Longest wait between passes while refreshing keeps failing
+MAX_BACKOFF = 300.0
+
+
+class RecommendationRefresher:
+    """
+    Keeps the Recommendation table fresh between batch rebuilds.
+
+    genres_changed feeds the user_ids whose genres were written into a dirty
+    set. A background thread, started on the first change, waits
+    RECOMMENDATION_REFRESH_DELAY seconds so bursts of writes coalesce, then
+    drains the set and rewrites only those users' rows.
+
+    Recommendations are scored item-to-item, so a user's result depends on
+    their own titles and the shared similarity model only. Neighbours are
+    therefore refreshed only when RECOMMENDATION_REFRESH_NEIGHBOURS > 0.
+
+    A failed pass puts its users back, each at most
+    RECOMMENDATION_REFRESH_MAX_ATTEMPTS times, and the thread backs off
+    exponentially until a pass succeeds again.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._dirty = set()
+        self._attempts = {}
+        self._thread = None
+        self.app = None
+        self.refreshed = 0
+        self.last_refresh_at = None
+
+    def init_app(self, app):
+        self.app = app
+        with self._cond:
+            self._dirty = set()
+            self._attempts = {}
+
+    @property
+    def pending(self):
+        with self._cond:
+            return len(self._dirty)
+
+    def mark(self, user_ids):
+        user_ids = {u for u in user_ids if u is not None}
+        if not user_ids:
+            return
+        with self._cond:
+            self._dirty |= user_ids
+            self._cond.notify()
+            if self._thread is None and self.app.config['RECOMMENDATION_REFRESH_ENABLED']:
+                self._thread = threading.Thread(target=self._run, name='recommendation-refresh', daemon=True)
+                self._thread.start()
+
+    def on_genres_changed(self, sender, changes, **kwargs):
+        self.mark(u for change in changes for u in (change.old_user_id, change.user_id))
+
+    def drain(self):
+        """
+        Refresh every dirty user now, on the calling thread. Must be called
+        inside an app context. Returns the number of users refreshed.
+        """
+        from recom_system.store import delete_recommendations, write_recommendations
+
+        with self._cond:
+            user_ids, self._dirty = self._dirty, set()
+        if not user_ids:
+            return 0
+
+        try:
+            neighbours = self.app.config['RECOMMENDATION_REFRESH_NEIGHBOURS']
+            owned = {u: genre_index.titles_for(u) for u in user_ids}
+            if neighbours:
+                for user_id in list(owned):
+                    for neighbour, _ in recommendation_service.similar_users(user_id, neighbours):
+                        owned.setdefault(neighbour, genre_index.titles_for(neighbour))
+
+            recommender = recommendation_service.recommender()
+            items = [(u, recommender.recommend_for(titles, MAX_RECOMMENDATIONS))
+                     for u, titles in owned.items() if titles]
+            with db.engine.connect() as conn:
+                write_recommendations(conn, items)
+                delete_recommendations(conn, [u for u, titles in owned.items() if not titles])
+        except BaseException:
+            # Put them back for the next pass rather than leave their rows
+            # stale, unless they already failed too often
+            dropped = self._retry_later(user_ids)
+            if dropped:
+                self.app.logger.warning('Giving up refreshing recommendations for %d users after %d attempts',
+                                        dropped, self.app.config['RECOMMENDATION_REFRESH_MAX_ATTEMPTS'])
+            raise
+        with self._cond:
+            for user_id in user_ids:
+                self._attempts.pop(user_id, None)
+        response_cache.invalidate('recommendation')
+
+        self.refreshed += len(owned)
+        self.last_refresh_at = time.time()
+        return len(owned)
+
+    def _retry_later(self, user_ids):
+        max_attempts = self.app.config['RECOMMENDATION_REFRESH_MAX_ATTEMPTS']
+        dropped = 0
+        with self._cond:
+            for user_id in user_ids:
+                attempts = self._attempts.get(user_id, 0) + 1
+                if attempts < max_attempts:
+                    self._attempts[user_id] = attempts
+                    self._dirty.add(user_id)
+                else:
+                    self._attempts.pop(user_id, None)
+                    dropped += 1
+        return dropped
+
+    def _run(self):
+        delay = self.app.config['RECOMMENDATION_REFRESH_DELAY']
+        failures = 0
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+            if failures:
+                time.sleep(min(max(delay, 1.0) * 2 ** min(failures, 16), MAX_BACKOFF))
+            else:
+                time.sleep(delay)
+            with self.app.app_context():
+                try:
+                    self.drain()
+                except Exception:
+                    # Logged once per run of failures, not on every retry
+                    if not failures:
+                        self.app.logger.exception('Incremental recommendation refresh failed')
+                    failures += 1
+                    continue
+            if failures:
+                self.app.logger.info('Incremental recommendation refresh recovered after %d failed passes', failures)
+                failures = 0
+
+
+recommendation_refresher = RecommendationRefresher()
@@ -0,0 +1,135 @@
+#Import Library
+import functools
+import hashlib
+import pickle
+import threading
+from flask import current_app, request
+
+#Import Dependencies
+from app.services.cache import LocalClient, TTLCache
+from app.utils.pagination import wants_stream
+
+
+class LocalBackend:
+    """
+    Per-process LRU with TTL. Invalidation only reaches this process.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._entries = TTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self._generations = {}
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value):
+        self._entries.set(key, value)
+
+    def generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class SharedBackend:
+    """
+    Cache shared by every worker through a Redis-compatible client (get,
+    set with ex=, incr). Entries are pickled; invalidating a namespace
+    increments a shared generation counter that is part of every key.
+    """
+
+    def __init__(self, client, ttl, prefix='steam_recap:response:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=self.ttl)
+
+    def generation(self, namespace):
+        return int(self.client.get(self.prefix + 'gen:' + namespace) or 0)
+
+    def bump(self, namespace):
+        self.client.incr(self.prefix + 'gen:' + namespace)
+
+
+class ResponseCache:
+    """
+    Caches whole GET responses keyed by path and query string, per
+    namespace ('genre', 'user', 'recommendation'). Writes call
+    invalidate(namespace), which bumps the namespace generation so every
+    older entry becomes unreachable at once.
+
+    Responses carry a strong ETag (hash of the body) and are made
+    conditional, so a matching If-None-Match gets an empty 304.
+
+    RESPONSE_CACHE_BACKEND selects 'local' (default), 'shared' (Redis at
+    RESPONSE_CACHE_URL, or the LocalClient stand-in when unset) or 'none'.
+    """
+
+    def __init__(self):
+        self.backend = None
+
+    def init_app(self, app):
+        kind = app.config['RESPONSE_CACHE_BACKEND']
+        ttl = app.config['RESPONSE_CACHE_TTL']
+        if kind == 'local':
+            self.backend = LocalBackend(app.config['RESPONSE_CACHE_SIZE'], ttl)
+        elif kind == 'shared':
+            url = app.config['RESPONSE_CACHE_URL']
+            if url:
+                import redis
+                client = redis.Redis.from_url(url)
+            else:
+                client = LocalClient()
+            self.backend = SharedBackend(client, ttl)
+        else:
+            self.backend = None
+
+    def invalidate(self, *namespaces):
+        if self.backend is not None:
+            for namespace in namespaces:
+                self.backend.bump(namespace)
+
+    def on_genres_changed(self, sender, changes, **kwargs):
+        self.invalidate('genre')
+
+    def cached(self, namespace):
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                # NDJSON is negotiated through Accept, which the key leaves
+                # out, and streamed bodies are never stored anyway
+                if backend is None or request.method != 'GET' or wants_stream():
+                    return view(*args, **kwargs)
+
+                key = '%s:%d:%s?%s' % (namespace, backend.generation(namespace), request.path,
+                                       '&'.join(sorted('%s=%s' % kv for kv in request.args.items(multi=True))))
+                entry = backend.get(key)
+                if entry is None:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    body = response.get_data()
+                    entry = (body, response.mimetype, hashlib.sha256(body).hexdigest()[:32])
+                    backend.set(key, entry)
+                else:
+                    body, mimetype, _ = entry
+                    response = current_app.response_class(body, mimetype=mimetype)
+
+                response.set_etag(entry[2])
+                response.vary.add('Accept')
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
+
+
+response_cache = ResponseCache()
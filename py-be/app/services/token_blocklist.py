@@ -0,0 +1,270 @@
+#Import Library
+import hashlib
+import heapq
+import math
+import threading
+import time
+from datetime import timedelta
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
+
+#Import Dependencies
+from app.services.cache import LocalClient
+
+# TTL for tokens that carry no exp claim (JWT_*_TOKEN_EXPIRES = False)
+NO_EXPIRY_TTL = 30 * 24 * 3600
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. might_contain() never returns a
+    false negative; false positives happen at about `error_rate` once
+    `capacity` items were added. Items cannot be removed, so callers
+    rebuild it when it fills up with expired entries.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def might_contain(self, item):
+        array = self._array
+        return all(array[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class LocalStore:
+    """
+    Revoked jti -> expiry for this process. Entries are dropped once the
+    token would have expired anyway; a heap keeps purging amortized O(log n).
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._expires = {}
+        self._heap = []
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._expires[jti] = expires_at
+            heapq.heappush(self._heap, (expires_at, jti))
+            self._purge()
+
+    def contains(self, jti):
+        expires_at = self._expires.get(jti)
+        return expires_at is not None and expires_at > self._clock()
+
+    def live(self):
+        now = self._clock()
+        return [jti for jti, expires_at in list(self._expires.items()) if expires_at > now]
+
+    def _purge(self):
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._heap)
+            if self._expires.get(jti) == expires_at:
+                del self._expires[jti]
+
+    def __len__(self):
+        return len(self._expires)
+
+
+class SharedStore:
+    """
+    Blocklist shared by every worker through a Redis-compatible client.
+    Each revoked jti is a key expiring with its token (the exact check),
+    and is also logged in a sorted set scored by revocation time, which
+    workers read incrementally to keep their local Bloom filter current.
+    """
+
+    def __init__(self, client, prefix='steam_recap:blocklist:'):
+        self.client = client
+        self.prefix = prefix
+        self.log_key = prefix + 'log'
+
+    def add(self, jti, expires_at, now, retention):
+        ttl = max(1, int(math.ceil(expires_at - now)))
+        self.client.set(self.prefix + jti, b'1', ex=ttl)
+        self.client.zadd(self.log_key, {'%s %r' % (jti, expires_at): now})
+        self.client.zremrangebyscore(self.log_key, '-inf', now - retention)
+
+    def contains(self, jti):
+        return self.client.get(self.prefix + jti) is not None
+
+    def revoked_since(self, since, now):
+        """
+        Yield jtis revoked at or after `since` whose tokens are still live.
+        """
+        for member in self.client.zrangebyscore(self.log_key, since, '+inf'):
+            jti, expires_at = member.decode('utf-8').rsplit(' ', 1)
+            if float(expires_at) > now:
+                yield jti
+
+
+class TokenBlocklist:
+    """
+    Revoked JWTs keyed by jti, checked on every @jwt_required request via
+    token_in_blocklist_loader. Entries live only until the token's own exp.
+
+    TOKEN_BLOCKLIST_BACKEND selects:
+
+    - 'local' (default): an in-process dict, already an O(1) check. Set
+      TOKEN_BLOCKLIST_BLOOM to put a Bloom filter in front, which only
+      pays off when the blocklist is very large.
+    - 'shared': Redis at TOKEN_BLOCKLIST_URL (or the LocalClient stand-in).
+      Each worker keeps a Bloom filter of revoked jtis, refreshed from the
+      shared log every TOKEN_BLOCKLIST_SYNC_INTERVAL seconds, so the common
+      "not revoked" answer never leaves the process; only Bloom hits are
+      confirmed against Redis. A token revoked on another worker is
+      honoured here within one sync interval.
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self.store = LocalStore(clock)
+        self.shared = None
+        self.bloom = None
+        self.capacity = 100000
+        self.error_rate = 0.001
+        self.sync_interval = 1.0
+        self.retention = NO_EXPIRY_TTL
+        self._synced_at = None
+        self._sync_lock = threading.Lock()
+        self._bloom_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.capacity = app.config['TOKEN_BLOCKLIST_CAPACITY']
+        self.error_rate = app.config['TOKEN_BLOCKLIST_ERROR_RATE']
+        self.sync_interval = app.config['TOKEN_BLOCKLIST_SYNC_INTERVAL']
+        self.retention = max(_lifetime(app.config.get('JWT_ACCESS_TOKEN_EXPIRES', timedelta(minutes=15))),
+                             _lifetime(app.config.get('JWT_REFRESH_TOKEN_EXPIRES', timedelta(days=30))))
+        self.store = LocalStore(self._clock)
+        self.shared = None
+        self.bloom = None
+        self._synced_at = None
+
+        kind = app.config['TOKEN_BLOCKLIST_BACKEND']
+        if kind == 'shared':
+            url = app.config['TOKEN_BLOCKLIST_URL']
+            if url:
+                import redis
+                client = redis.Redis.from_url(url)
+            else:
+                client = LocalClient()
+            self.shared = SharedStore(client)
+            self.bloom = BloomFilter(self.capacity, self.error_rate)
+        elif kind == 'local':
+            if app.config['TOKEN_BLOCKLIST_BLOOM']:
+                self.bloom = BloomFilter(self.capacity, self.error_rate)
+        else:
+            raise ValueError('TOKEN_BLOCKLIST_BACKEND must be local or shared')
+
+    def revoke(self, payload):
+        """
+        Block the token with this decoded payload until it expires.
+        """
+        now = self._clock()
+        expires_at = payload.get('exp') or now + NO_EXPIRY_TTL
+        jti = payload['jti']
+        if self.shared is not None:
+            self.shared.add(jti, expires_at, now, self.retention)
+        else:
+            self.store.add(jti, expires_at)
+        if self.bloom is not None:
+            self._bloom_add([jti])
+
+    def revoke_session(self, payload):
+        """
+        Revoke the presented token and, for an access token, the refresh
+        token it was issued with, so logging out ends the whole login.
+        """
+        self.revoke(payload)
+        if 'refresh_jti' in payload:
+            self.revoke({'jti': payload['refresh_jti'], 'exp': payload.get('refresh_exp')})
+
+    def is_revoked(self, jti):
+        if self.shared is not None:
+            self._maybe_sync()
+            return self.bloom.might_contain(jti) and self.shared.contains(jti)
+        if self.bloom is not None and not self.bloom.might_contain(jti):
+            return False
+        return self.store.contains(jti)
+
+    def token_in_blocklist(self, jwt_header, jwt_payload):
+        return self.is_revoked(jwt_payload['jti'])
+
+    def _bloom_add(self, jtis):
+        with self._bloom_lock:
+            if self.bloom.count + len(jtis) > self.capacity:
+                # Full of (mostly expired) entries: start over from the live set
+                self.bloom = self._rebuilt_bloom()
+            for jti in jtis:
+                self.bloom.add(jti)
+
+    def _rebuilt_bloom(self):
+        if self.shared is not None:
+            live = list(self.shared.revoked_since(self._clock() - self.retention, self._clock()))
+        else:
+            live = self.store.live()
+        bloom = BloomFilter(max(self.capacity, 2 * len(live)), self.error_rate)
+        for jti in live:
+            bloom.add(jti)
+        return bloom
+
+    def _maybe_sync(self):
+        now = self._clock()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        # One thread syncs; the others keep answering from the current filter
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            since = self._synced_at - self.sync_interval if self._synced_at is not None else now - self.retention
+            self._synced_at = now
+            self._bloom_add(list(self.shared.revoked_since(since, now)))
+        finally:
+            self._sync_lock.release()
+
+
+def session_claims(refresh_payload):
+    """
+    Claims linking an access token to the refresh token it belongs to.
+    """
+    claims = {'refresh_jti': refresh_payload['jti']}
+    if refresh_payload.get('exp') is not None:
+        claims['refresh_exp'] = refresh_payload['exp']
+    return claims
+
+
+def issue_tokens(identity):
+    """
+    Access and refresh token for a new login, linked by session_claims().
+    """
+    refresh_token = create_refresh_token(identity=identity)
+    access_token = create_access_token(identity=identity,
+                                       additional_claims=session_claims(decode_token(refresh_token)))
+    return access_token, refresh_token
+
+
+def _lifetime(value):
+    if value is False or value is None:
+        return NO_EXPIRY_TTL
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return float(value)
+
+
+token_blocklist = TokenBlocklist()
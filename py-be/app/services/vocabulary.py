@@ -0,0 +1,180 @@
+#Import Library
+import threading
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import Session
+
+#Import Dependencies
+from app import db
+from app.utils.bulk import chunked
+
+# session.info key for ids interned by a transaction that has not committed
+_PENDING = 'genre_vocabulary'
+LOOKUP_CHUNK_SIZE = 500
+
+
+class Vocabulary:
+    """
+    Process-wide copy of the genre_vocabulary table (title <-> small integer
+    id), so title ids can be resolved without a query on the hot paths.
+
+    intern() adds missing titles inside the caller's db.session transaction
+    with INSERT ... ON CONFLICT DO NOTHING followed by a re-select, so
+    concurrent writers of the same title agree on one id. Ids created by a
+    transaction are held in its session until it commits and only then
+    cached here; a rolled-back id can be reused by the database and must
+    never be remembered. Titles interned by other workers are fetched the
+    first time they are seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._titles = {}
+
+    def init_app(self, app):
+        if not event.contains(Session, 'after_commit', self._after_commit):
+            event.listen(Session, 'after_commit', self._after_commit)
+            event.listen(Session, 'after_transaction_end', self._after_transaction_end)
+
+    def load(self):
+        from app.models.genre import GenreVocabulary
+
+        rows = db.session.execute(select(GenreVocabulary.title, GenreVocabulary.title_id)).all()
+        with self._lock:
+            self._ids = dict(rows)
+            self._titles = {title_id: title for title, title_id in rows}
+
+    def intern(self, titles, session=None):
+        """
+        Return {title: id} for `titles`, adding the unknown ones to
+        genre_vocabulary in the current transaction of `session` (default
+        db.session).
+        """
+        found, missing = self._known(titles)
+        if not missing:
+            return found
+        session = session or db.session
+        pending = session.info.setdefault(_PENDING, {})
+        for title in list(missing):
+            if title in pending:
+                found[title] = pending[title]
+                missing.discard(title)
+        if not missing:
+            return found
+
+        # Committed by another worker since we loaded
+        existing = self._select(missing, session)
+        self._remember(existing)
+        found.update(existing)
+        new = missing - existing.keys()
+        if new:
+            from app.models.genre import GenreVocabulary
+
+            session.execute(_insert_ignore(GenreVocabulary.__table__, session.get_bind().dialect.name),
+                            [{'title': title} for title in sorted(new)])
+            inserted = self._select(new, session)
+            pending.update(inserted)
+            found.update(inserted)
+        return found
+
+    def ids(self, titles):
+        """
+        Return {title: id} for the titles of `titles` that are in the
+        vocabulary; unknown titles are left out rather than added.
+        """
+        found, missing = self._known(titles)
+        if missing:
+            pending = db.session.info.get(_PENDING, {})
+            found.update((title, pending[title]) for title in missing if title in pending)
+            missing -= found.keys()
+        if missing:
+            existing = self._select(missing)
+            self._remember(existing)
+            found.update(existing)
+        return found
+
+    def titles(self, title_ids):
+        """
+        Return the titles of `title_ids`, in order.
+        """
+        titles = self._titles
+        missing = {title_id for title_id in title_ids if title_id not in titles}
+        if not missing:
+            return [titles[title_id] for title_id in title_ids]
+
+        from app.models.genre import GenreVocabulary
+
+        resolved = {title_id: title for title, title_id in db.session.info.get(_PENDING, {}).items()
+                    if title_id in missing}
+        committed = {}
+        for chunk in chunked(sorted(missing - resolved.keys()), LOOKUP_CHUNK_SIZE):
+            committed.update(db.session.execute(
+                select(GenreVocabulary.title, GenreVocabulary.title_id).where(GenreVocabulary.title_id.in_(chunk))
+            ).all())
+        self._remember(committed)
+        resolved.update((title_id, title) for title, title_id in committed.items())
+        return [titles.get(title_id) or resolved[title_id] for title_id in title_ids]
+
+    def table(self):
+        """
+        List indexed by title id (None for unused ids), e.g. to label the
+        columns of a matrix built directly from title ids.
+        """
+        titles = self._titles
+        table = [None] * (max(titles, default=0) + 1)
+        for title_id, title in list(titles.items()):
+            table[title_id] = title
+        return table
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _known(self, titles):
+        ids = self._ids
+        found, missing = {}, set()
+        for title in titles:
+            title_id = ids.get(title)
+            if title_id is None:
+                missing.add(title)
+            else:
+                found[title] = title_id
+        return found, missing
+
+    def _select(self, titles, session=None):
+        from app.models.genre import GenreVocabulary
+
+        session = session or db.session
+        found = {}
+        for chunk in chunked(sorted(titles), LOOKUP_CHUNK_SIZE):
+            found.update(session.execute(
+                select(GenreVocabulary.title, GenreVocabulary.title_id).where(GenreVocabulary.title.in_(chunk))
+            ).all())
+        return found
+
+    def _remember(self, ids):
+        if not ids:
+            return
+        with self._lock:
+            self._ids.update(ids)
+            self._titles.update((title_id, title) for title, title_id in ids.items())
+
+    def _after_commit(self, session):
+        self._remember(session.info.pop(_PENDING, None))
+
+    def _after_transaction_end(self, session, transaction):
+        # Rolled back or closed without committing: forget its new ids
+        if transaction.parent is None:
+            session.info.pop(_PENDING, None)
+
+
+def _insert_ignore(table, dialect_name):
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing()
+
+
+genre_vocabulary = Vocabulary()
@@ -0,0 +1,94 @@
+#Import Library
+import json
+from urllib.parse import parse_qs
+
+
+class Request:
+    """
+    The parts of an ASGI HTTP request that the async views read, with the
+    body already received.
+    """
+
+    def __init__(self, scope, body):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.body = body
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        self.args = parse_qs(scope['query_string'].decode('utf-8', 'replace'), keep_blank_values=True)
+
+    def arg(self, name, default=None):
+        values = self.args.get(name)
+        return values[0] if values else default
+
+    def json(self):
+        """
+        The body as a JSON object, or None when it is not one. Callers then
+        leave the request to the Flask view, which rejects it the usual way.
+        """
+        mimetype = self.headers.get('content-type', '').split(';')[0].strip().lower()
+        if mimetype != 'application/json' and not (mimetype.startswith('application/') and mimetype.endswith('+json')):
+            return None
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+
+async def read_body(receive):
+    """
+    Receive the whole request body. Only for the async views, whose bodies
+    are small JSON objects; everything else is streamed to Flask.
+    """
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body', False):
+            break
+    return b''.join(chunks)
+
+
+def replay(body, receive):
+    """
+    A receive callable that hands back an already-read `body` as one
+    message, then defers to `receive` (e.g. for http.disconnect).
+    """
+    pending = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive_again():
+        if pending:
+            return pending.pop()
+        return await receive()
+
+    return receive_again
+
+
+def input_terminated(app):
+    """
+    Mark wsgi.input as ending with the request body. a2wsgi's input returns
+    b'' once the ASGI body is exhausted, so werkzeug may read bodies sent
+    without a Content-Length (chunked NDJSON uploads) to the end instead of
+    treating them as empty.
+    """
+    def wsgi_app(environ, start_response):
+        environ['wsgi.input_terminated'] = True
+        return app(environ, start_response)
+
+    return wsgi_app
+
+
+async def send_response(send, response):
+    """
+    Send a buffered werkzeug Response.
+    """
+    body = response.get_data()
+    await send({'type': 'http.response.start', 'status': response.status_code,
+                'headers': _headers(response.headers.items())})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _headers(items):
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in items]
@@ -0,0 +1,180 @@
+#Import Library
+import json
+import uuid
+from datetime import datetime, timezone
+from flask import request
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+#Import Dependencies
+from app import db
+from app.utils.titles import parse_titles
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class BulkError(ValueError):
+    pass
+
+
+def read_bulk_items():
+    """
+    Yield the items of a bulk request body, either a JSON array or, with
+    Content-Type application/x-ndjson, one JSON object per line read
+    incrementally from the request stream.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        for line in request.stream:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield BulkError('Invalid JSON line')
+        return
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        raise BulkError('Body must be a JSON array or NDJSON')
+    yield from data
+
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class TitleListUpsert:
+    """
+    Bulk insert-or-replace for a parent table whose title list lives in a
+    child (parent key, position, title, user_id) table, i.e. Genre/GenreTitle
+    and Recommendation/RecommendationTitle. With a `vocabulary`, the child
+    stores title_id instead and each chunk's titles are interned first.
+    With a `weights_field`, items may carry a list of integers parallel to
+    their titles, stored in the child column of that name.
+
+    Each chunk is one transaction of executemany statements: existing
+    parents are updated and their titles replaced, new parents inserted.
+    Items that fail validation are reported and skipped; if the database
+    rejects a chunk, every item in it is reported and the chunk rolled back.
+    """
+
+    def __init__(self, parent, child, key, date_column, titles_field, vocabulary=None, weights_field=None):
+        self.parent = parent.__table__
+        self.child = child.__table__
+        self.key = key
+        self.date_column = date_column
+        self.titles_field = titles_field
+        self.vocabulary = vocabulary
+        self.weights_field = weights_field
+
+    def run(self, items, chunk_size=DEFAULT_CHUNK_SIZE, before_commit=None):
+        """
+        Returns (summary dict, [(key, old_user_id, user_id, titles)] written).
+        `before_commit(changes)`, if given, runs inside each chunk's
+        transaction with that chunk's written tuples.
+        """
+        summary = {'created': 0, 'updated': 0, 'errors': []}
+        written = []
+        for chunk in chunked(enumerate(items), chunk_size):
+            rows = []
+            seen = set()
+            for index, item in chunk:
+                try:
+                    row = self._validate(item)
+                except BulkError as e:
+                    summary['errors'].append({'index': index, 'error': str(e)})
+                    continue
+                if row[self.key] in seen:
+                    summary['errors'].append({'index': index, 'error': 'Duplicate %s in request' % self.key})
+                    continue
+                seen.add(row[self.key])
+                rows.append((index, row))
+
+            if not rows:
+                continue
+            try:
+                created, updated, changes = self._write([row for _, row in rows])
+                if before_commit is not None:
+                    before_commit(changes)
+                db.session.commit()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                message = str(e.orig) if getattr(e, 'orig', None) is not None else str(e)
+                summary['errors'].extend({'index': index, 'error': message} for index, _ in rows)
+                continue
+            summary['created'] += created
+            summary['updated'] += updated
+            written.extend(changes)
+        return summary, written
+
+    def _validate(self, item):
+        if isinstance(item, BulkError):
+            raise item
+        if not isinstance(item, dict):
+            raise BulkError('Item must be an object')
+        if not item.get('user_id'):
+            raise BulkError('user_id is required')
+        if self.titles_field not in item:
+            raise BulkError('%s is required' % self.titles_field)
+        try:
+            titles = parse_titles(item[self.titles_field])
+        except (ValueError, SyntaxError):
+            raise BulkError('%s must be a list' % self.titles_field)
+        row = {self.key: item.get(self.key) or str(uuid.uuid4()), 'user_id': str(item['user_id']), 'titles': titles}
+        if self.weights_field is not None:
+            weights = item.get(self.weights_field)
+            if weights is not None and (not isinstance(weights, list) or len(weights) != len(titles)
+                                        or not all(isinstance(w, int) for w in weights)):
+                raise BulkError('%s must be a list of integers, one per title' % self.weights_field)
+            row['weights'] = weights
+        return row
+
+    def _write(self, rows):
+        key_column = self.parent.c[self.key]
+        existing = dict(db.session.execute(
+            select(key_column, self.parent.c.user_id).where(key_column.in_([r[self.key] for r in rows]))
+        ).all())
+        new_rows = [r for r in rows if r[self.key] not in existing]
+        old_rows = [r for r in rows if r[self.key] in existing]
+
+        now = datetime.now(timezone.utc)
+        if new_rows:
+            db.session.execute(insert(self.parent), [
+                {self.key: r[self.key], 'user_id': r['user_id'], self.date_column: now} for r in new_rows
+            ])
+        if old_rows:
+            db.session.execute(
+                delete(self.child).where(self.child.c[self.key].in_([r[self.key] for r in old_rows]))
+            )
+            db.session.execute(
+                update(self.parent).where(key_column == bindparam('b_key')).values(user_id=bindparam('b_user_id')),
+                [{'b_key': r[self.key], 'b_user_id': r['user_id']} for r in old_rows]
+            )
+
+        if self.vocabulary is not None:
+            ids = self.vocabulary.intern({title for r in rows for title in r['titles']})
+            titles = [
+                {self.key: r[self.key], 'position': i, 'title_id': ids[title], 'user_id': r['user_id']}
+                for r in rows for i, title in enumerate(r['titles'])
+            ]
+        else:
+            titles = [
+                {self.key: r[self.key], 'position': i, 'title': title, 'user_id': r['user_id']}
+                for r in rows for i, title in enumerate(r['titles'])
+            ]
+        if self.weights_field is not None:
+            weights = [w for r in rows for w in (r['weights'] or [None] * len(r['titles']))]
+            for title, weight in zip(titles, weights):
+                title[self.weights_field] = weight
+        if titles:
+            db.session.execute(insert(self.child), titles)
+
+        changes = [(r[self.key], existing.get(r[self.key]), r['user_id'], r['titles']) for r in rows]
+        return len(new_rows), len(old_rows), changes
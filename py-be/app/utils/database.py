@@ -0,0 +1,61 @@
+#Import Library
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def engine_options(config):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS from the DATABASE_* settings unless the
+    profile set them explicitly. SQLite gets no pool sizing since it runs
+    in-process; server databases get a bounded, pre-pinged, recycled pool.
+    """
+    if config.get('SQLALCHEMY_ENGINE_OPTIONS'):
+        return config['SQLALCHEMY_ENGINE_OPTIONS']
+    if is_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        return {}
+    return {
+        'pool_size': config['DATABASE_POOL_SIZE'],
+        'max_overflow': config['DATABASE_MAX_OVERFLOW'],
+        'pool_timeout': config['DATABASE_POOL_TIMEOUT'],
+        'pool_recycle': config['DATABASE_POOL_RECYCLE'],
+        'pool_pre_ping': config['DATABASE_POOL_PRE_PING'],
+    }
+
+
+# Async DBAPI drivers used by the ASGI entry point, per backend
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+    'mysql': 'aiomysql',
+}
+
+
+def async_database_uri(uri):
+    """
+    Swap the driver of a SQLAlchemy URL for its asyncio counterpart, e.g.
+    sqlite:///app.db -> sqlite+aiosqlite:///app.db.
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError('No async driver known for %s, set ASYNC_DATABASE_URI' % backend)
+    return url.set(drivername='%s+%s' % (backend, ASYNC_DRIVERS[backend]))
+
+
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """
+    Run PRAGMA statements on every new connection of a SQLite engine.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute('PRAGMA %s=%s' % (name, value))
+        cursor.close()
@@ -0,0 +1,83 @@
+#Import Library
+import base64
+import json
+from datetime import datetime
+from flask import Response, request, stream_with_context
+from sqlalchemy import and_, or_
+
+#Import Dependencies
+from app.utils.json_provider import dumps_bytes
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+STREAM_BATCH_SIZE = 500
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def encode_cursor(date_added, row_id):
+    raw = json.dumps([date_added.isoformat(), row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_added, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(date_added), row_id
+    except (ValueError, TypeError):
+        raise PaginationError('Invalid cursor')
+
+
+def parse_page_args():
+    """
+    Read `limit` and `cursor` from the query string.
+    """
+    try:
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise PaginationError('limit must be an integer')
+    if limit < 1:
+        raise PaginationError('limit must be positive')
+
+    cursor = request.args.get('cursor')
+    return min(limit, MAX_LIMIT), decode_cursor(cursor) if cursor else None
+
+
+def wants_stream():
+    return request.args.get('format') == 'ndjson' or \
+        request.accept_mimetypes.best == 'application/x-ndjson'
+
+
+def keyset_filter(query, date_column, id_column, after):
+    """
+    Order `query` by (date_column, id_column) and skip everything up to and
+    including the `after` key. Uses an OR of comparisons instead of a row
+    value so the same statement works on SQLite and server databases.
+    """
+    if after is not None:
+        date_added, row_id = after
+        query = query.where(or_(
+            date_column > date_added,
+            and_(date_column == date_added, id_column > row_id),
+        ))
+    return query.order_by(date_column, id_column)
+
+
+def ndjson_response(fetch_rows, serialize):
+    """
+    Stream the rows returned by `fetch_rows()` (a yield_per query) as one JSON
+    document per line so memory stays flat regardless of table size. The query
+    is only run once streaming starts, inside the streamed request context.
+    `serialize` may return a dict or ready-made JSON bytes.
+    """
+    def generate():
+        for row in fetch_rows():
+            document = serialize(row)
+            if not isinstance(document, bytes):
+                document = dumps_bytes(document)
+            yield document + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -0,0 +1,50 @@
+#Import Library
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+#Import Dependencies
+from app.utils.json_provider import splice
+
+
+def titles_json(child, parent_key_column, dialect_name, vocabulary=None):
+    """
+    Correlated scalar subquery returning a parent's ordered titles as a JSON
+    array string built by the database, so list endpoints can splice it into
+    the response without loading, decoding or re-encoding the titles.
+    With `vocabulary`, the child stores title ids resolved through it.
+
+    SQLite (< 3.44) has no ORDER BY inside aggregates, so it aggregates over
+    an ordered derived table; PostgreSQL uses json_agg(... ORDER BY ...).
+    """
+    parent_key = child.__table__.c[parent_key_column.key]
+    if vocabulary is None:
+        title, source = child.title, child.__table__
+    else:
+        title = vocabulary.title
+        source = child.__table__.join(vocabulary.__table__, child.title_id == vocabulary.title_id)
+    if dialect_name == 'postgresql':
+        aggregated = func.coalesce(
+            cast(func.json_agg(aggregate_order_by(title, child.position)), Text), '[]'
+        )
+        return select(aggregated).select_from(source).where(parent_key == parent_key_column).scalar_subquery()
+
+    ordered = select(title.label('title')) \
+        .select_from(source) \
+        .where(parent_key == parent_key_column) \
+        .order_by(child.position) \
+        .correlate(parent_key_column.table) \
+        .subquery()
+    return select(func.json_group_array(ordered.c.title)).scalar_subquery()
+
+
+def titled_row_serializer(titles_field):
+    """
+    Return a function turning a Core row whose last column is the
+    titles_json() text into JSON bytes.
+    """
+    def serialize(row):
+        fields = row._asdict()
+        raw = fields.pop(titles_field)
+        return splice(fields, {titles_field: raw.encode('utf-8') if raw else None})
+
+    return serialize
@@ -0,0 +1,249 @@
+#Import Library
+import json
+from collections import Counter, defaultdict
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is optional
+    ijson = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    _loads = json.loads
+
+READ_SIZE = 1 << 20
+_WHITESPACE = ' \t\r\n'
+
+
+class LibraryFormatError(ValueError):
+    pass
+
+
+def detect_format(path):
+    """
+    'ndjson' for .ndjson/.jsonl files, otherwise 'json'.
+    """
+    return 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'json'
+
+
+def iter_records(f, fmt):
+    """
+    Yield the records of a Steam library export opened in text mode, without
+    loading the whole file:
+
+    - ndjson: one record per line.
+    - json: a top-level array of records, or a GetOwnedGames response
+      ({"response": {"games": [...]}}), parsed with ijson when it is
+      installed and with an incremental raw_decode reader otherwise.
+    """
+    if fmt == 'ndjson':
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield _loads(line)
+                except ValueError:
+                    raise LibraryFormatError('Invalid JSON on line %d' % number)
+    elif fmt == 'json':
+        yield from (_iter_ijson(f) if ijson is not None else iter_json_array(f))
+    else:
+        raise LibraryFormatError('Unknown format %r' % fmt)
+
+
+def _iter_ijson(f):
+    head = f.read(1)
+    while head and head in _WHITESPACE:
+        head = f.read(1)
+    f.seek(0)
+    prefix = 'item' if head == '[' else 'response.games.item'
+    # use_float keeps numbers as int/float instead of Decimal
+    yield from ijson.items(f, prefix, use_float=True)
+
+
+def iter_json_array(f, read_size=READ_SIZE):
+    """
+    Yield the elements of the first JSON array in `f` (the top-level one,
+    or e.g. response.games), decoding one element at a time with
+    json.JSONDecoder.raw_decode over a sliding buffer.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = _seek_array(f, read_size)
+    expect_value = True
+    while True:
+        # Skip whitespace and separators, refilling as needed
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                break
+            more = f.read(read_size)
+            if not more:
+                raise LibraryFormatError('Unexpected end of file inside the array')
+            buffer, position = more, 0
+
+        char = buffer[position]
+        if char == ']':
+            return
+        if not expect_value:
+            if char != ',':
+                raise LibraryFormatError('Expected , or ] between array elements')
+            position += 1
+            expect_value = True
+            continue
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # A number at the very end of the buffer may continue in the next read
+                if end < len(buffer):
+                    break
+            except ValueError:
+                pass
+            more = f.read(read_size)
+            if not more:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                    break
+                except ValueError:
+                    raise LibraryFormatError('Invalid JSON array element')
+            buffer, position = buffer[position:] + more, 0
+        yield value
+        position = end
+        expect_value = False
+        if position > read_size:
+            buffer, position = buffer[position:], 0
+
+
+def _seek_array(f, read_size):
+    """
+    Return (buffer, position just past the first '[' outside a string).
+    """
+    in_string = escaped = False
+    while True:
+        buffer = f.read(read_size)
+        if not buffer:
+            raise LibraryFormatError('No JSON array found')
+        for position, char in enumerate(buffer):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '[':
+                return buffer, position + 1
+
+
+def genre_names(value):
+    """
+    Normalize a genre list given as names or as Steam store appdetails
+    entries ({"id": "1", "description": "Action"}).
+    """
+    names = []
+    for genre in value or ():
+        if isinstance(genre, dict):
+            genre = genre.get('description')
+        if genre:
+            names.append(str(genre))
+    return names
+
+
+def load_app_genres(f):
+    """
+    Read an appid -> genres mapping, either {"570": ["Action", ...]} or the
+    store appdetails shape {"570": {"data": {"genres": [...]}}}.
+    """
+    raw = json.load(f)
+    if not isinstance(raw, dict):
+        raise LibraryFormatError('App genres file must be a JSON object keyed by appid')
+    app_genres = {}
+    for appid, value in raw.items():
+        if isinstance(value, dict):
+            value = (value.get('data') or value).get('genres')
+        app_genres[str(appid)] = tuple(genre_names(value))
+    return app_genres
+
+
+class PlaytimeAggregator:
+    """
+    Accumulates playtime minutes per (user, genre) from owned-game records.
+    A record is either one owned game
+        {"user_id": ..., "appid": 570, "playtime_forever": 1234, "genres": [...]}
+    or one user's library
+        {"user_id": ..., "games": [{"appid": 570, "playtime_forever": 1234}, ...]}.
+    Games without inline genres are looked up in `app_genres`; records
+    without a user_id are attributed to `default_user_id`. A game's
+    playtime counts fully towards each of its genres. Malformed records and
+    games are counted in `skipped` instead of aborting the import.
+
+    Memory grows with users x genres, not with the size of the input.
+    """
+
+    def __init__(self, app_genres=None, default_user_id=None):
+        self.app_genres = app_genres or {}
+        self.default_user_id = default_user_id
+        self.weights = defaultdict(Counter)
+        self.games = 0
+        self.skipped = 0
+
+    def add(self, record):
+        if not isinstance(record, dict):
+            self.skipped += 1
+            return
+        user_id = record.get('user_id') or self.default_user_id
+        if not user_id:
+            self.skipped += 1
+            return
+        games = record.get('games')
+        if games is None:
+            self._add_game(str(user_id), record)
+        elif isinstance(games, list):
+            for game in games:
+                self._add_game(str(user_id), game)
+        else:
+            self.skipped += 1
+
+    def _add_game(self, user_id, game):
+        if not isinstance(game, dict):
+            self.skipped += 1
+            return
+        playtime = _minutes(game.get('playtime_forever'))
+        genres = game.get('genres')
+        if playtime is None or not (genres is None or isinstance(genres, list)):
+            self.skipped += 1
+            return
+        self.games += 1
+        if playtime <= 0:
+            return
+        genres = genre_names(genres) if genres is not None else self.app_genres.get(str(game.get('appid')), ())
+        if not genres:
+            return
+        weights = self.weights[user_id]
+        for genre in genres:
+            weights[genre] += playtime
+
+    def profiles(self, top=None):
+        """
+        Yield (user_id, [(genre, playtime minutes)]), heaviest first.
+        """
+        for user_id, weights in self.weights.items():
+            yield user_id, weights.most_common(top)
+
+
+def _minutes(value):
+    """
+    Playtime as whole minutes: missing counts as 0, numbers and numeric
+    strings are truncated, anything else is None.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
@@ -0,0 +1,14 @@
+#Import Library
+import ast
+
+
+def parse_titles(value):
+    """
+    Accept a title list either as a JSON array or as its string form
+    (e.g. "['Action', 'RPG']") and return a list of strings.
+    """
+    if isinstance(value, str):
+        value = ast.literal_eval(value)
+    if not isinstance(value, (list, tuple)):
+        raise ValueError('titles must be a list')
+    return [str(title) for title in value]
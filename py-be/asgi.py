@@ -0,0 +1,9 @@
+from app.asgi import create_asgi_app
+
+# pip install -r requirements-asgi.txt, then serve with any ASGI server,
+# e.g. uvicorn asgi:app --port 5000
+app = create_asgi_app()
+
+if __name__ == '__main__' :
+    import uvicorn
+    uvicorn.run(app, port=5000)
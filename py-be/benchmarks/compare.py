@@ -0,0 +1,65 @@
+"""
+Compare two benchmarks/loadtest.py result files.
+
+Matches results by (rows, transport, endpoint) and prints throughput and
+latency for both runs with the relative change; changes beyond
+--threshold percent are flagged. Exits with status 1 if any latency
+percentile regressed past the threshold, so it can gate CI.
+
+    python benchmarks/compare.py benchmarks/results/abc123-10000.json benchmarks/results/def456-10000.json
+"""
+#Import Library
+import argparse
+import json
+import sys
+
+METRICS = ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms')
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report['meta'], {(r['rows'], r['transport'], r['endpoint']): r for r in report['results']}
+
+
+def change(before, after):
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='percent change worth flagging')
+    args = parser.parse_args()
+
+    base_meta, baseline = load(args.baseline)
+    cand_meta, candidate = load(args.candidate)
+    print('baseline %s (%s) vs candidate %s (%s)' % (
+        base_meta['commit'], base_meta['timestamp'], cand_meta['commit'], cand_meta['timestamp']))
+    print('%-8s %-12s %-24s' % ('rows', 'transport', 'endpoint') +
+          ''.join('%28s' % metric for metric in METRICS))
+
+    regressed = False
+    for key in sorted(set(baseline) & set(candidate)):
+        before, after = baseline[key], candidate[key]
+        cells = []
+        for metric in METRICS:
+            delta = change(before[metric], after[metric])
+            # Higher is better for throughput, lower for latency
+            worse = delta is not None and (delta < -args.threshold if metric == 'throughput_rps'
+                                           else delta > args.threshold)
+            regressed = regressed or (worse and metric != 'throughput_rps')
+            cells.append(' %27s' % ('%s -> %s %s%s' % (
+                before[metric], after[metric], '' if delta is None else '(%+.0f%%)' % delta, ' !' if worse else '')))
+        print('%-8s %-12s %-24s' % key + ''.join(cells))
+
+    for key in sorted(set(baseline) ^ set(candidate)):
+        print('%-8s %-12s %-24s only in %s' % (key + ('baseline' if key in baseline else 'candidate',)))
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
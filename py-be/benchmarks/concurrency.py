@@ -0,0 +1,191 @@
+"""
+Concurrency benchmark: thread-per-request WSGI against the ASGI entry point.
+
+Seeds (or reuses) the benchmarks/loadtest.py database and drives the
+endpoints that have async versions at each --concurrency level. On the
+WSGI side every request occupies one of --threads worker threads, as in a
+threaded WSGI server; on the ASGI side all in-flight requests share one
+event loop and only CPU-bound work takes a pool thread. --db-latency-ms
+sleeps in every SQL statement on both engines to stand in for a database
+across the network, which is where a thread blocked on I/O costs most.
+Only SQLite databases are supported.
+
+    python benchmarks/concurrency.py --rows 10000 --concurrency 8 64 256 --db-latency-ms 5
+"""
+#Import Library
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from sqlalchemy.util import await_only
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+#Import Dependencies
+from app import db
+from app.asgi import AsyncApi
+from app.services.recommender import recommendation_service
+from loadtest import FlaskClientTransport, make_app, percentile, prepare_database, scenarios
+
+ENDPOINTS = ('genre.users', 'genre.create', 'recommendation.user', 'recommendation.similar', 'user.login')
+
+
+async def drive(send, make_request, n_requests, concurrency, seed):
+    """
+    Send n_requests from `concurrency` coroutines, each waiting for its
+    response before sending the next request.
+    """
+    latencies, errors = [], [0]
+    remaining = [n_requests]
+
+    async def client(index):
+        rng = random.Random(seed * 1000 + index)
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            started = time.perf_counter()
+            try:
+                status = await send(*make_request(rng))
+            except Exception:
+                status = 599
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors[0] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors[0],
+        'throughput_rps': round(len(ordered) / wall, 2),
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+    }
+
+
+def wsgi_sender(app, threads):
+    transport = FlaskClientTransport(app)
+    pool = ThreadPoolExecutor(threads, thread_name_prefix='wsgi-worker')
+
+    async def send(method, path, body, headers):
+        status, _ = await asyncio.get_running_loop().run_in_executor(
+            pool, transport.send, method, path, body, headers)
+        return status
+
+    return send, pool
+
+
+def asgi_sender(api):
+    async def send(method, path, body, headers):
+        path, _, query = path.partition('?')
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        raw_headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()]
+        if body is not None:
+            raw_headers.append((b'content-type', b'application/json'))
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query.encode('latin-1'),
+                 'root_path': '', 'headers': raw_headers, 'http_version': '1.1', 'scheme': 'http',
+                 'server': ('127.0.0.1', 80), 'client': ('127.0.0.1', 0)}
+        received = [False]
+        status = [None]
+
+        async def receive():
+            if received[0]:
+                return {'type': 'http.disconnect'}
+            received[0] = True
+            return {'type': 'http.request', 'body': payload}
+
+        async def respond(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+
+        await api(scope, receive, respond)
+        return status[0]
+
+    return send
+
+
+def add_latency(engine, seconds):
+    """
+    Sleep for `seconds` in every statement SQLite runs (including BEGIN and
+    COMMIT), on the thread that runs it: the request thread for the sync
+    engine, aiosqlite's connection thread for the async one.
+    """
+    def trace(statement):
+        time.sleep(seconds)
+
+    @event.listens_for(engine, 'connect')
+    def install(dbapi_connection, connection_record):
+        driver = getattr(dbapi_connection, 'driver_connection', dbapi_connection)
+        if isinstance(driver, sqlite3.Connection):
+            driver.set_trace_callback(trace)
+        else:
+            await_only(driver.set_trace_callback(trace))
+
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='users to seed')
+    parser.add_argument('--requests', type=int, default=400, help='requests per endpoint and level')
+    parser.add_argument('--login-requests', type=int, default=40, help='requests for user.login (bcrypt bound)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 64, 256])
+    parser.add_argument('--threads', type=int, default=16, help='WSGI worker threads')
+    parser.add_argument('--db-latency-ms', type=float, default=0.0, help='added to every SQL statement')
+    parser.add_argument('--scenario', action='append', choices=ENDPOINTS, help='only run these (repeatable)')
+    parser.add_argument('--vocabulary', type=int, default=2000, help='distinct genre titles')
+    parser.add_argument('--titles-per-row', type=int, default=12)
+    parser.add_argument('--data-dir', help='where seed databases are kept (default instance/benchmarks)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    args.response_cache = 'none'
+
+    database = prepare_database(args.rows, args)
+    app = make_app(database, args)
+    api = AsyncApi(app)
+    if args.db_latency_ms:
+        with app.app_context():
+            add_latency(db.engine, args.db_latency_ms / 1000.0)
+        add_latency(api.engine.sync_engine, args.db_latency_ms / 1000.0)
+
+    available = scenarios(args.rows, args.vocabulary, '')
+    wsgi_send, wsgi_pool = wsgi_sender(app, args.threads)
+    senders = (('wsgi', wsgi_send), ('asgi', asgi_sender(api)))
+
+    async def run(send, make_request, n_requests, concurrency):
+        recommendation_service.cache.clear()
+        try:
+            await drive(send, make_request, min(20, n_requests), min(concurrency, 8), args.seed + 1)
+            return await drive(send, make_request, n_requests, concurrency, args.seed)
+        finally:
+            # aiosqlite connections belong to the loop that opened them
+            await api.engine.dispose()
+
+    print('%d rows, %d WSGI threads, %.1f ms added per statement' % (args.rows, args.threads, args.db_latency_ms))
+    print('%-24s %6s %12s %10s %12s %10s %8s' % (
+        'endpoint', 'conc', 'wsgi req/s', 'p99 ms', 'asgi req/s', 'p99 ms', 'speedup'))
+    for name in args.scenario or ENDPOINTS:
+        n_requests = args.login_requests if name == 'user.login' else args.requests
+        for concurrency in args.concurrency:
+            results = {label: asyncio.run(run(send, available[name], n_requests, concurrency))
+                       for label, send in senders}
+            wsgi, asgi = results['wsgi'], results['asgi']
+            print('%-24s %6d %12.1f %10.2f %12.1f %10.2f %7.2fx%s' % (
+                name, concurrency, wsgi['throughput_rps'], wsgi['p99_ms'], asgi['throughput_rps'], asgi['p99_ms'],
+                asgi['throughput_rps'] / wsgi['throughput_rps'],
+                '' if not (wsgi['errors'] or asgi['errors']) else
+                '  (errors wsgi %d asgi %d)' % (wsgi['errors'], asgi['errors'])), flush=True)
+
+    wsgi_pool.shutdown()
+    asyncio.run(api.close())
+
+
+if __name__ == '__main__':
+    main()
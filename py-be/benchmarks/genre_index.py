@@ -0,0 +1,85 @@
+"""
+Memory and query benchmark for the in-memory genre index.
+
+Builds the index for --users users with one Genre row of --titles titles
+each (drawn from a --vocabulary of interned titles), with fresh id strings
+per row as they come out of the database, and reports the bytes held per
+user (tracemalloc) and the latency of AND / OR title lookups.
+
+    python benchmarks/genre_index.py --users 100000 --titles 12
+"""
+#Import Library
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from sqlalchemy import insert
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+#Import Dependencies
+from app import create_app, db
+from app.models.genre import GenreVocabulary
+from app.services.genre_index import GenreIndex
+from app.services.vocabulary import genre_vocabulary
+
+
+def rows(n_users, n_titles, vocabulary, seed):
+    rng = random.Random(seed)
+    for i in range(n_users):
+        yield (str(uuid.UUID(int=rng.getrandbits(128))), str(uuid.UUID(int=i + 1)),
+               [title_id + 1 for title_id in rng.sample(range(vocabulary), n_titles)])
+
+
+def best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--titles', type=int, default=12, help='titles per user')
+    parser.add_argument('--vocabulary', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    with app.app_context():
+        db.session.execute(insert(GenreVocabulary), [
+            {'title_id': i + 1, 'title': 'Title %d' % i} for i in range(args.vocabulary)
+        ])
+        db.session.commit()
+        genre_vocabulary.load()
+
+        index = GenreIndex()
+        build = best_of(1, lambda: index.build(rows(args.users, args.titles, args.vocabulary, args.seed)))
+        index = None
+        gc.collect()
+
+        tracemalloc.start()
+        index = GenreIndex()
+        index.build(rows(args.users, args.titles, args.vocabulary, args.seed))
+        gc.collect()
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print('%d users x %d titles: build %.1fs, %.0f bytes/user' % (
+            args.users, args.titles, build, held / args.users))
+        for mode, match_all in (('and', True), ('or', False)):
+            elapsed = best_of(args.repeat, lambda: index.users_for(['Title 1', 'Title 2'], match_all))
+            print('users_for %-3s %.3f ms (%d users)' % (
+                mode, elapsed * 1000, len(index.users_for(['Title 1', 'Title 2'], match_all))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,418 @@
+"""
+Load test for the py-be API against a seeded SQLite database.
+
+Seeds (or reuses) a database with --rows users, one genre, one
+recommendation and one recap summary per user, then drives every read endpoint plus login and
+genre creation with --concurrency threads, first through the Flask test
+client and then through a threaded wsgiref server over real sockets.
+Reports throughput and p50/p95/p99 latency and writes everything as JSON
+(benchmarks/results/<commit>-<rows>.json by default) so runs on different
+commits can be diffed with benchmarks/compare.py.
+
+    python benchmarks/loadtest.py --rows 10000 --rows 100000
+    python benchmarks/loadtest.py --rows 1000000 --transport server --requests 200
+
+Seed databases are kept in instance/benchmarks and copied before each run,
+so writes made by a run never leak into the next one.
+"""
+#Import Library
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+from sqlalchemy import insert
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+#Import Dependencies
+from app import create_app, db
+from app.models.genre import Genre, GenreTitle, GenreVocabulary
+from app.models.recommendation import Recommendation, RecommendationTitle
+from app.models.user import User
+from app.utils.pagination import encode_cursor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SEED_START = datetime(2024, 1, 1)
+PASSWORD = 'benchmark-password'
+INSERT_CHUNK = 50000
+# Bump when seed() changes so cached seed databases are rebuilt
+SEED_VERSION = 3
+# Endpoints returning every row are skipped above this many rows
+UNBOUNDED_MAX_ROWS = 100000
+
+
+def user_id(i):
+    return str(uuid.UUID(int=i + 1))
+
+
+def genre_id(i):
+    return str(uuid.UUID(int=(1 << 64) + i))
+
+
+def recommendation_id(i):
+    return str(uuid.UUID(int=(2 << 64) + i))
+
+
+def added(i):
+    return SEED_START + timedelta(seconds=i)
+
+
+def title(j):
+    return 'Title %d' % j
+
+
+def seed(n_rows, vocabulary, titles_per_row, password_hash, rng):
+    """
+    Insert n_rows users, genres and recommendations with Core executemany.
+    Ids and dates are derived from the row number so scenarios can build
+    valid ids and cursors without reading the database.
+    """
+    def batches(make_rows):
+        batch = []
+        for i in range(n_rows):
+            batch.extend(make_rows(i))
+            if len(batch) >= INSERT_CHUNK:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def titled(make_id, parent_key, by_id=False):
+        def rows(i):
+            picked = rng.sample(range(vocabulary), titles_per_row)
+            return [{parent_key: make_id(i), 'position': p, 'user_id': user_id(i),
+                     **({'title_id': j + 1} if by_id else {'title': title(j)})}
+                    for p, j in enumerate(picked)]
+        return rows
+
+    db.session.execute(insert(GenreVocabulary), [{'title_id': j + 1, 'title': title(j)} for j in range(vocabulary)])
+    db.session.commit()
+
+    tables = [
+        (User, lambda i: [{'user_id': user_id(i), 'user_name': 'user%d' % i, 'user_email': 'user%d@example.com' % i,
+                           'user_password_hash': password_hash, 'user_date_added': added(i)}]),
+        (Genre, lambda i: [{'genre_id': genre_id(i), 'user_id': user_id(i), 'genre_date_added': added(i)}]),
+        (GenreTitle, titled(genre_id, 'genre_id', by_id=True)),
+        (Recommendation, lambda i: [{'recommendation_id': recommendation_id(i), 'user_id': user_id(i),
+                                     'recommendation_date_added': added(i)}]),
+        (RecommendationTitle, titled(recommendation_id, 'recommendation_id')),
+    ]
+    for model, make_rows in tables:
+        started = time.perf_counter()
+        for batch in batches(make_rows):
+            db.session.execute(insert(model), batch)
+            db.session.commit()
+        print('  seeded %-20s %.1fs' % (model.__tablename__, time.perf_counter() - started), flush=True)
+
+    from app.services.recap import recap_service
+    started = time.perf_counter()
+    recap_service.rebuild()
+    print('  seeded %-20s %.1fs' % ('recap_summary', time.perf_counter() - started), flush=True)
+
+
+def make_app(database, args):
+    os.environ.update({
+        'STEAM_RECAP_SQLALCHEMY_DATABASE_URI': 'sqlite:///' + database,
+        'STEAM_RECAP_SECRET_KEY': 'benchmark-secret-key-long-enough-for-hs256',
+        'STEAM_RECAP_RECOMMENDATION_REFRESH_ENABLED': 'false',
+        'STEAM_RECAP_RESPONSE_CACHE_BACKEND': args.response_cache,
+        # The seed database is built from the models rather than migrated
+        'STEAM_RECAP_CREATE_ALL': 'true',
+    })
+    return create_app('production')
+
+
+def prepare_database(n_rows, args):
+    """
+    Return the path of a fresh copy of the seed database for n_rows,
+    seeding it first if it does not exist yet.
+    """
+    directory = args.data_dir or os.path.join(ROOT, 'instance', 'benchmarks')
+    os.makedirs(directory, exist_ok=True)
+    seeded = os.path.join(directory, 'seed-v%d-%d-%d-%d.db' % (
+        SEED_VERSION, n_rows, args.vocabulary, args.titles_per_row))
+    if not os.path.exists(seeded):
+        print('seeding %d rows into %s' % (n_rows, seeded), flush=True)
+        partial = seeded + '.partial'
+        if os.path.exists(partial):
+            os.remove(partial)
+        app = make_app(partial, args)
+        with app.app_context():
+            from app.services.passwords import password_hasher
+            seed(n_rows, args.vocabulary, args.titles_per_row, password_hasher.hash(PASSWORD),
+                 random.Random(args.seed))
+            db.session.remove()
+            db.engine.dispose()
+        os.replace(partial, seeded)
+
+    working = os.path.join(directory, 'run.db')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(working + suffix):
+            os.remove(working + suffix)
+    shutil.copyfile(seeded, working)
+    return working
+
+
+def scenarios(n_rows, vocabulary, token):
+    """
+    Name -> function(rng) returning (method, path, json body, headers).
+    Ids, titles and cursors are picked at random so the response cache, if
+    enabled, sees realistic key spread.
+    """
+    auth = {'Authorization': 'Bearer ' + token}
+
+    def cursor(rng):
+        i = rng.randrange(n_rows)
+        return encode_cursor(added(i), genre_id(i))
+
+    def user_cursor(rng):
+        i = rng.randrange(n_rows)
+        return encode_cursor(added(i), user_id(i))
+
+    found = {
+        'user.get': lambda rng: ('GET', '/api/user/get?limit=100&cursor=' + user_cursor(rng), None, auth),
+        'user.profile': lambda rng: ('GET', '/api/user/%s/profile' % user_id(rng.randrange(n_rows)), None, auth),
+        'user.login': lambda rng: ('POST', '/api/user/login',
+                                   {'user_email': 'user%d@example.com' % rng.randrange(n_rows),
+                                    'user_password': PASSWORD}, {}),
+        'genre.get': lambda rng: ('GET', '/api/genre/get?limit=100&cursor=' + cursor(rng), None, {}),
+        'genre.users': lambda rng: ('GET', '/api/genre/users?title=%s' % title(rng.randrange(vocabulary)).replace(' ', '+'),
+                                    None, {}),
+        'genre.create': lambda rng: ('POST', '/api/genre/create',
+                                     {'genre_titles': [title(rng.randrange(vocabulary)) for _ in range(5)],
+                                      'user_id': user_id(rng.randrange(n_rows))}, {}),
+        'recap.get': lambda rng: ('GET', '/api/recap/%s' % user_id(rng.randrange(n_rows)), None, auth),
+        'recommendation.get': lambda rng: ('GET', '/api/recommendation/get', None, {}),
+        'recommendation.user': lambda rng: ('GET', '/api/recommendation/user/%s' % user_id(rng.randrange(n_rows)),
+                                            None, {}),
+        'recommendation.similar': lambda rng: ('GET', '/api/recommendation/user/%s/similar'
+                                               % user_id(rng.randrange(n_rows)), None, {}),
+    }
+    if n_rows > UNBOUNDED_MAX_ROWS:
+        del found['recommendation.get']
+    return found
+
+
+class FlaskClientTransport:
+    """
+    In-process requests through the Flask test client; measures the app
+    without any HTTP parsing or socket overhead.
+    """
+    name = 'test_client'
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, method, path, body, headers):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, headers=headers)
+        size = len(response.get_data())
+        response.close()
+        return response.status_code, size
+
+    def close(self):
+        pass
+
+
+class _ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class ServerTransport:
+    """
+    Real HTTP over loopback against a threaded wsgiref server, one thread
+    per connection.
+    """
+    name = 'wsgi_server'
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, server_class=_ThreadingWSGIServer,
+                                  handler_class=_QuietHandler)
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def send(self, method, path, body, headers):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=120)
+        try:
+            headers = dict(headers)
+            payload = None
+            if body is not None:
+                payload = json.dumps(body).encode('utf-8')
+                headers['Content-Type'] = 'application/json'
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            return response.status, len(response.read())
+        finally:
+            connection.close()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def percentile(ordered, q):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+
+def run_scenario(transport, make_request, n_requests, concurrency, seed):
+    """
+    Send n_requests from `concurrency` threads as fast as they complete.
+    """
+    latencies, errors, sizes = [], [0], [0]
+    lock = threading.Lock()
+    remaining = [n_requests]
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        while True:
+            with lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            method, path, body, headers = make_request(rng)
+            started = time.perf_counter()
+            try:
+                status, size = transport.send(method, path, body, headers)
+            except Exception:
+                status, size = 599, 0
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                sizes[0] += size
+                if status >= 400:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors[0],
+        'concurrency': concurrency,
+        'seconds': round(wall, 4),
+        'throughput_rps': round(len(ordered) / wall, 2) if wall else None,
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3) if ordered else None,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3) if ordered else None,
+        'p95_ms': round(percentile(ordered, 95) * 1000, 3) if ordered else None,
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3) if ordered else None,
+        'bytes': sizes[0],
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, action='append', help='users to seed (repeatable, default 10000)')
+    parser.add_argument('--requests', type=int, default=500, help='requests per endpoint')
+    parser.add_argument('--login-requests', type=int, default=50, help='requests for user.login (bcrypt bound)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--transport', choices=['test_client', 'server', 'both'], default='both')
+    parser.add_argument('--scenario', action='append', help='only run these endpoints, e.g. genre.get (repeatable)')
+    parser.add_argument('--vocabulary', type=int, default=2000, help='distinct genre titles')
+    parser.add_argument('--titles-per-row', type=int, default=12)
+    parser.add_argument('--response-cache', choices=['none', 'local'], default='none')
+    parser.add_argument('--warmup', type=int, default=20, help='unrecorded requests per endpoint')
+    parser.add_argument('--data-dir', help='where seed databases are kept (default instance/benchmarks)')
+    parser.add_argument('--output', help='result file (default benchmarks/results/<commit>-<rows>.json)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': [],
+    }
+
+    for n_rows in args.rows or [10000]:
+        database = prepare_database(n_rows, args)
+        started = time.perf_counter()
+        app = make_app(database, args)
+        print('%d rows: app started in %.2fs' % (n_rows, time.perf_counter() - started), flush=True)
+
+        with app.app_context():
+            from flask_jwt_extended import create_access_token
+            token = create_access_token(identity=user_id(0))
+        available = scenarios(n_rows, args.vocabulary, token)
+        selected = args.scenario or list(available)
+
+        transports = []
+        if args.transport in ('test_client', 'both'):
+            transports.append(FlaskClientTransport(app))
+        if args.transport in ('server', 'both'):
+            transports.append(ServerTransport(app))
+
+        print('%-12s %-24s %8s %7s %10s %10s %10s %10s' % (
+            'transport', 'endpoint', 'requests', 'errors', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms'))
+        for transport in transports:
+            for name in selected:
+                if name not in available:
+                    print('%-12s %-24s skipped' % (transport.name, name))
+                    continue
+                n_requests = args.login_requests if name == 'user.login' else args.requests
+                if args.warmup:
+                    run_scenario(transport, available[name], min(args.warmup, n_requests), args.concurrency,
+                                 args.seed + 1)
+                result = run_scenario(transport, available[name], n_requests, args.concurrency, args.seed)
+                result.update({'rows': n_rows, 'transport': transport.name, 'endpoint': name})
+                report['results'].append(result)
+                print('%-12s %-24s %8d %7d %10.1f %10.2f %10.2f %10.2f' % (
+                    transport.name, name, result['requests'], result['errors'], result['throughput_rps'],
+                    result['p50_ms'], result['p95_ms'], result['p99_ms']), flush=True)
+            transport.close()
+
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+    output = args.output or os.path.join(
+        ROOT, 'benchmarks', 'results', '%s-%s.json' % (commit, '-'.join(str(r) for r in args.rows or [10000])))
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print('results written to %s' % output)
+
+
+if __name__ == '__main__':
+    main()
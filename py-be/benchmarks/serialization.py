@@ -0,0 +1,111 @@
+"""
+Serialization microbenchmark for the genre listing.
+
+Seeds a temporary SQLite database with --rows genres and times two ways of
+turning a page of them into a JSON response body:
+
+  orm     select(Genre) -> to_dict() -> stdlib json.dumps (the old path)
+  splice  Core row with titles aggregated to JSON by SQLite -> orjson splice
+
+Reports the best of --repeat runs, scaled to milliseconds per 10k rows.
+
+    python benchmarks/serialization.py --rows 50000 --titles-per-genre 12
+"""
+#Import Library
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+#Import Dependencies
+from app import create_app, db
+from app.models.genre import Genre, GenreTitle, GenreVocabulary
+from app.services.vocabulary import genre_vocabulary
+from app.utils.json_provider import json_list, orjson
+from app.utils.serialization import titled_row_serializer, titles_json
+
+
+def seed(n_rows, titles_per_genre, vocabulary, seed):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    genres, genre_titles = [], []
+    for i in range(n_rows):
+        genre_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        genres.append({'genre_id': genre_id, 'user_id': None, 'genre_date_added': start + timedelta(seconds=i)})
+        for position, title_id in enumerate(rng.sample(range(1, vocabulary + 1), titles_per_genre)):
+            genre_titles.append({'genre_id': genre_id, 'position': position, 'title_id': title_id, 'user_id': None})
+    db.session.execute(insert(GenreVocabulary), [
+        {'title_id': i, 'title': 'Title %d' % i} for i in range(1, vocabulary + 1)
+    ])
+    db.session.execute(insert(Genre), genres)
+    db.session.execute(insert(GenreTitle), genre_titles)
+    db.session.commit()
+    genre_vocabulary.load()
+
+
+def orm_body(query):
+    genres = db.session.execute(query).scalars().all()
+    return json.dumps({'items': [g.to_dict() for g in genres], 'next_cursor': None}).encode('utf-8')
+
+
+def splice_body(query, serialize):
+    rows = db.session.execute(query).all()
+    return json_list([serialize(row) for row in rows], next_cursor=None)
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--titles-per-genre', type=int, default=12)
+    parser.add_argument('--vocabulary', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        os.environ['STEAM_RECAP_SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(path, 'bench.db')
+        app = create_app('testing')
+        with app.app_context():
+            seed(args.rows, args.titles_per_genre, args.vocabulary, args.seed)
+
+            orm_query = select(Genre).order_by(Genre.genre_date_added, Genre.genre_id)
+            titles = titles_json(GenreTitle, Genre.genre_id, db.engine.dialect.name, GenreVocabulary).label('genre_titles')
+            splice_query = select(Genre.genre_id, Genre.user_id, Genre.genre_date_added, titles) \
+                .order_by(Genre.genre_date_added, Genre.genre_id)
+            serialize = titled_row_serializer('genre_titles')
+
+            results = [
+                ('orm', best_of(args.repeat, lambda: orm_body(orm_query))),
+                ('splice', best_of(args.repeat, lambda: splice_body(splice_query, serialize))),
+            ]
+            db.session.remove()
+
+    print('%d genres x %d titles, orjson %s' % (
+        args.rows, args.titles_per_genre, 'installed' if orjson is not None else 'missing (stdlib fallback)'))
+    print('%-8s %12s %14s %10s' % ('path', 'total ms', 'ms/10k rows', 'MB'))
+    baseline = results[0][1][0]
+    for name, (seconds, size) in results:
+        print('%-8s %12.1f %14.1f %10.2f  (%.1fx)' % (
+            name, seconds * 1000, seconds * 1000 * 10000 / args.rows, size / 1e6, baseline / seconds))
+
+
+if __name__ == '__main__':
+    main()
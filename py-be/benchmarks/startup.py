@@ -0,0 +1,84 @@
+"""
+Cold start benchmark for the app.
+
+Runs each startup mode --repeat times in a fresh interpreter against a
+temporary SQLite database and reports the best `import app` and
+`create_app()` milliseconds, plus the first /apispec_1.json request (where
+a lazy spec is built) and whether flasgger was imported during startup.
+
+    python benchmarks/startup.py --repeat 5
+"""
+#Import Library
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+eager = 'flasgger' in sys.modules
+client = application.test_client()
+requested = time.perf_counter()
+status = client.get('/apispec_1.json').status_code
+finished = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'create_app_ms': (created - imported) * 1000,
+                  'apispec_ms': (finished - requested) * 1000, 'apispec_status': status,
+                  'flasgger_at_startup': eager}))
+"""
+
+MODES = {
+    'create_all+lazy': {'CREATE_ALL': 'true', 'API_DOCS': '"lazy"'},
+    'lazy': {'CREATE_ALL': 'false', 'API_DOCS': '"lazy"'},
+    'static': {'CREATE_ALL': 'false', 'API_DOCS': '"static"'},
+    'off': {'CREATE_ALL': 'false', 'API_DOCS': '"off"'},
+}
+
+
+def run(env, code=CHILD):
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        base = dict(os.environ, PYTHONPATH=ROOT, STEAM_RECAP_CONFIG='development', **{
+            'STEAM_RECAP_SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, 'startup.db'),
+            'STEAM_RECAP_API_SPEC_PATH': os.path.join(directory, 'apispec.json'),
+            'STEAM_RECAP_RECOMMENDATION_REFRESH_ENABLED': 'false',
+        })
+        # Schema and static spec, as a deploy would have them before the
+        # workers start
+        subprocess.run([sys.executable, '-c', 'import app; app.create_app()'], cwd=ROOT,
+                       env=dict(base, STEAM_RECAP_CREATE_ALL='true'), check=True, capture_output=True)
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'run.py', 'apidocs', 'build'], cwd=ROOT,
+                       env=base, check=True, capture_output=True)
+
+        print('%-16s %10s %14s %12s %9s' % ('mode', 'import ms', 'create_app ms', 'apispec ms', 'flasgger'))
+        for mode in args.modes:
+            env = dict(base, **{'STEAM_RECAP_' + key: value for key, value in MODES[mode].items()})
+            results = [run(env) for _ in range(args.repeat)]
+            print('%-16s %10.1f %14.1f %12s %9s' % (
+                mode,
+                min(r['import_ms'] for r in results),
+                min(r['create_app_ms'] for r in results),
+                '%.1f' % min(r['apispec_ms'] for r in results) if results[0]['apispec_status'] == 200 else '-',
+                'startup' if results[0]['flasgger_at_startup'] else 'deferred'))
+
+
+if __name__ == '__main__':
+    main()
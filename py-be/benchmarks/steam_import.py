@@ -0,0 +1,87 @@
+"""
+Throughput benchmark for `flask steam import`.
+
+Writes a synthetic Steam library export (--games owned-game records spread
+over --users users, NDJSON or a JSON array) to a temporary directory, seeds
+the users into a temporary SQLite database and runs the import command,
+reporting owned-game records per minute.
+
+    python benchmarks/steam_import.py --games 2000000 --users 50000 --format json
+"""
+#Import Library
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from sqlalchemy import insert
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+#Import Dependencies
+from app import create_app, db
+from app.models.user import User
+
+GENRES = ['Action', 'Adventure', 'RPG', 'Strategy', 'Simulation', 'Indie', 'Casual', 'Racing', 'Sports',
+          'Puzzle', 'Shooter', 'Platformer', 'Survival', 'Horror', 'MMO', 'Fighting']
+
+
+def write_export(path, fmt, n_games, n_users, n_apps, rng):
+    app_genres = [rng.sample(GENRES, rng.randint(1, 3)) for _ in range(n_apps)]
+    with open(path, 'w') as f:
+        if fmt == 'json':
+            f.write('[')
+        for i in range(n_games):
+            appid = rng.randrange(n_apps)
+            record = {'user_id': 'user-%d' % rng.randrange(n_users), 'appid': appid,
+                      'playtime_forever': rng.randrange(0, 5000), 'genres': app_genres[appid]}
+            if fmt == 'json':
+                f.write((',\n' if i else '\n') + json.dumps(record))
+            else:
+                f.write(json.dumps(record) + '\n')
+        if fmt == 'json':
+            f.write('\n]\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--apps', type=int, default=5000)
+    parser.add_argument('--format', choices=['ndjson', 'json'], default='ndjson')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as path:
+        export = os.path.join(path, 'library.' + args.format)
+        started = time.perf_counter()
+        write_export(export, args.format, args.games, args.users, args.apps, rng)
+        print('wrote %d records (%.0f MB) in %.1fs' % (
+            args.games, os.path.getsize(export) / 1e6, time.perf_counter() - started))
+
+        os.environ['STEAM_RECAP_SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(path, 'bench.db')
+        os.environ['STEAM_RECAP_RECOMMENDATION_REFRESH_ENABLED'] = 'false'
+        app = create_app('testing')
+        with app.app_context():
+            db.session.execute(insert(User), [
+                {'user_id': 'user-%d' % i, 'user_name': 'user%d' % i, 'user_email': 'user%d@example.com' % i,
+                 'user_password_hash': 'x'} for i in range(args.users)
+            ])
+            db.session.commit()
+            db.session.remove()
+
+        started = time.perf_counter()
+        result = app.test_cli_runner().invoke(args=['steam', 'import', export])
+        elapsed = time.perf_counter() - started
+        print(result.output.rstrip())
+        if result.exception is not None:
+            raise result.exception
+        print('%s: %.0f records/s, %.1fM records/min end to end' % (
+            args.format, args.games / elapsed, args.games / elapsed * 60 / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""add recommendation.recommendation_source
+
+Revision ID: a3c9e5f7b2d4
+Revises: f1b7d3e9a5c2
+Create Date: 2026-10-18 16:02:47.915304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9e5f7b2d4'
+down_revision = 'f1b7d3e9a5c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated and API rows were not told apart before, so existing rows
+    # are kept as 'api' and never replaced by the recommender
+    with op.batch_alter_table('recommendation', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recommendation_source', sa.String(length=16), server_default='api',
+                                      nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('recommendation', schema=None) as batch_op:
+        batch_op.drop_column('recommendation_source')
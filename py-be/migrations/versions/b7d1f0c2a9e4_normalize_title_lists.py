@@ -0,0 +1,114 @@
+"""normalize genre and recommendation title lists
+
+Revision ID: b7d1f0c2a9e4
+Revises: 3e92a62b9b7f
+Create Date: 2026-10-18 09:02:11.418202
+
+"""
+import ast
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d1f0c2a9e4'
+down_revision = '3e92a62b9b7f'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# (parent table, parent key, blob column, child table)
+TITLE_TABLES = [
+    ('genre', 'genre_id', 'genre_titles', 'genre_title'),
+    ('recommendation', 'recommendation_id', 'recommendation_titles', 'recommendation_title'),
+]
+
+
+def _load_titles(blob):
+    if not blob:
+        return []
+    try:
+        titles = json.loads(blob)
+    except ValueError:
+        try:
+            titles = ast.literal_eval(blob)
+        except (ValueError, SyntaxError):
+            return []
+    return [str(t) for t in titles] if isinstance(titles, (list, tuple)) else []
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # The app that predates migrations never imported Recommendation before
+    # create_all, so its databases may have no table to normalize
+    if not sa.inspect(bind).has_table('recommendation'):
+        op.create_table(
+            'recommendation',
+            sa.Column('recommendation_id', sa.String(length=36), nullable=False),
+            sa.Column('recommendation_titles', sa.Text(), nullable=True),
+            sa.Column('user_id', sa.String(length=36), nullable=True),
+            sa.Column('recommendation_date_added', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('recommendation_id')
+        )
+
+    for parent, key, blob_column, child in TITLE_TABLES:
+        op.create_table(
+            child,
+            sa.Column(key, sa.String(length=36), nullable=False),
+            sa.Column('position', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('user_id', sa.String(length=36), nullable=True),
+            sa.ForeignKeyConstraint([key], ['%s.%s' % (parent, key)], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint(key, 'position')
+        )
+        with op.batch_alter_table(child, schema=None) as batch_op:
+            batch_op.create_index('ix_%s_title_user_id' % child, ['title', 'user_id'], unique=False)
+
+        # Backfill from the JSON blobs in batches so large tables don't need
+        # to fit in memory at once
+        child_table = sa.table(child, sa.column(key), sa.column('position'), sa.column('title'), sa.column('user_id'))
+        result = bind.execute(sa.text('SELECT %s, user_id, %s FROM %s' % (key, blob_column, parent)))
+        while True:
+            rows = result.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            mappings = [
+                {key: row_key, 'position': i, 'title': title, 'user_id': user_id}
+                for row_key, user_id, blob in rows
+                for i, title in enumerate(_load_titles(blob))
+            ]
+            if mappings:
+                op.bulk_insert(child_table, mappings)
+
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            batch_op.drop_column(blob_column)
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    for parent, key, blob_column, child in TITLE_TABLES:
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            batch_op.add_column(sa.Column(blob_column, sa.Text(), nullable=True))
+
+        parent_table = sa.table(parent, sa.column(key), sa.column(blob_column))
+        result = bind.execute(sa.text('SELECT %s, title FROM %s ORDER BY %s, position' % (key, child, key)))
+        current_key, titles = None, []
+        for row_key, title in result:
+            if row_key != current_key and current_key is not None:
+                bind.execute(parent_table.update().where(parent_table.c[key] == current_key)
+                             .values({blob_column: json.dumps(titles)}))
+                titles = []
+            current_key = row_key
+            titles.append(title)
+        if current_key is not None:
+            bind.execute(parent_table.update().where(parent_table.c[key] == current_key)
+                         .values({blob_column: json.dumps(titles)}))
+
+        with op.batch_alter_table(child, schema=None) as batch_op:
+            batch_op.drop_index('ix_%s_title_user_id' % child)
+        op.drop_table(child)
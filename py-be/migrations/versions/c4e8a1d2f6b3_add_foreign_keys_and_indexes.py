@@ -0,0 +1,108 @@
+"""add foreign keys and indexes on user_id / genre_id
+
+Revision ID: c4e8a1d2f6b3
+Revises: b7d1f0c2a9e4
+Create Date: 2026-10-18 09:41:52.730115
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1d2f6b3'
+down_revision = 'b7d1f0c2a9e4'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_user_date_added_user_id', 'user', ['user_date_added', 'user_id']),
+    ('ix_user_genre_id', 'user', ['genre_id']),
+    ('ix_genre_date_added_genre_id', 'genre', ['genre_date_added', 'genre_id']),
+    ('ix_genre_user_id_date_added', 'genre', ['user_id', 'genre_date_added']),
+    ('ix_genre_title_user_id', 'genre_title', ['user_id']),
+    ('ix_recommendation_user_id_date_added', 'recommendation', ['user_id', 'recommendation_date_added']),
+]
+
+# (name, table, column, referred table, referred column, ondelete)
+FOREIGN_KEYS = [
+    ('fk_genre_user_id_user', 'genre', 'user_id', 'user', 'user_id', 'CASCADE'),
+    ('fk_recommendation_user_id_user', 'recommendation', 'user_id', 'user', 'user_id', 'CASCADE'),
+    ('fk_user_genre_id_genre', 'user', 'genre_id', 'genre', 'genre_id', 'SET NULL'),
+]
+
+# (table, column) copies of a parent's user_id, kept in step with it
+USER_ID_COPIES = [
+    ('genre_title', 'user_id'),
+    ('recommendation_title', 'user_id'),
+]
+
+
+def upgrade():
+    _clear_orphans(op.get_bind())
+    if op.get_context().dialect.name == 'postgresql':
+        _upgrade_online()
+        return
+
+    # SQLite can only add a foreign key by rebuilding the table, so this
+    # path is a plain batch migration
+    for name, table, column, referred, referred_column, ondelete in FOREIGN_KEYS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_foreign_key(name, referred, [column], [referred_column], ondelete=ondelete)
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def _clear_orphans(bind):
+    """
+    Null references to rows that do not exist, which the schema allowed
+    until now, so every backend can add and validate the foreign keys.
+    Nulling keeps the rows; it is what ON DELETE SET NULL would have done.
+    """
+    references = [(table, column, referred, referred_column)
+                  for _, table, column, referred, referred_column, _ in FOREIGN_KEYS]
+    references += [(table, column, 'user', 'user_id') for table, column in USER_ID_COPIES]
+    for table, column, referred, referred_column in references:
+        cleared = bind.execute(sa.text(
+            'UPDATE "%s" SET %s = NULL WHERE %s IS NOT NULL AND NOT EXISTS '
+            '(SELECT 1 FROM "%s" r WHERE r.%s = "%s".%s)'
+            % (table, column, column, referred, referred_column, table, column)
+        )).rowcount
+        if cleared:
+            logger.warning('%s.%s: cleared %d references to missing %s rows', table, column, cleared, referred)
+
+
+def _upgrade_online():
+    """
+    Build indexes with CREATE INDEX CONCURRENTLY and add foreign keys as
+    NOT VALID followed by VALIDATE CONSTRAINT, so neither blocks writes
+    while it scans the table.
+    """
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+    for name, table, column, referred, referred_column, ondelete in FOREIGN_KEYS:
+        op.execute('ALTER TABLE "%s" ADD CONSTRAINT %s FOREIGN KEY (%s) REFERENCES "%s" (%s) ON DELETE %s NOT VALID'
+                   % (table, name, column, referred, referred_column, ondelete))
+        # Orphans were cleared first, so validating cannot fail
+        op.execute('ALTER TABLE "%s" VALIDATE CONSTRAINT %s' % (table, name))
+
+
+def downgrade():
+    postgresql = op.get_context().dialect.name == 'postgresql'
+    for name, table, columns in reversed(INDEXES):
+        if postgresql:
+            with op.get_context().autocommit_block():
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        else:
+            op.drop_index(name, table_name=table)
+
+    for name, table, column, referred, referred_column, ondelete in reversed(FOREIGN_KEYS):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
@@ -0,0 +1,35 @@
+"""add recap_summary table
+
+Revision ID: d9f3b6a1c7e2
+Revises: c4e8a1d2f6b3
+Create Date: 2026-10-18 11:02:14.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f3b6a1c7e2'
+down_revision = 'c4e8a1d2f6b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Starts empty; backfill with `flask recap rebuild`
+    op.create_table(
+        'recap_summary',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('title_counts', sa.Text(), nullable=False),
+        sa.Column('previous_title_counts', sa.Text(), nullable=True),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.user_id'], name='fk_recap_summary_user_id_user',
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+def downgrade():
+    op.drop_table('recap_summary')
@@ -0,0 +1,58 @@
+"""intern genre titles into genre_vocabulary
+
+Revision ID: e6a2c8d4f1b9
+Revises: d9f3b6a1c7e2
+Create Date: 2026-10-18 12:14:36.207511
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a2c8d4f1b9'
+down_revision = 'd9f3b6a1c7e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'genre_vocabulary',
+        sa.Column('title_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('title_id'),
+        sa.UniqueConstraint('title', name='uq_genre_vocabulary_title')
+    )
+    # Ids are handed out in title order, which keeps them stable between
+    # environments migrated from the same data
+    op.execute('INSERT INTO genre_vocabulary (title) SELECT DISTINCT title FROM genre_title ORDER BY title')
+
+    with op.batch_alter_table('genre_title', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('title_id', sa.Integer(), nullable=True))
+    op.execute('UPDATE genre_title SET title_id = '
+               '(SELECT v.title_id FROM genre_vocabulary v WHERE v.title = genre_title.title)')
+
+    with op.batch_alter_table('genre_title', schema=None) as batch_op:
+        batch_op.alter_column('title_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_genre_title_title_id_genre_vocabulary', 'genre_vocabulary',
+                                    ['title_id'], ['title_id'])
+        batch_op.drop_index('ix_genre_title_title_user_id')
+        batch_op.drop_column('title')
+        batch_op.create_index('ix_genre_title_title_id_user_id', ['title_id', 'user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('genre_title', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('title', sa.String(length=255), nullable=True))
+    op.execute('UPDATE genre_title SET title = '
+               '(SELECT v.title FROM genre_vocabulary v WHERE v.title_id = genre_title.title_id)')
+
+    with op.batch_alter_table('genre_title', schema=None) as batch_op:
+        batch_op.alter_column('title', existing_type=sa.String(length=255), nullable=False)
+        batch_op.drop_index('ix_genre_title_title_id_user_id')
+        batch_op.drop_constraint('fk_genre_title_title_id_genre_vocabulary', type_='foreignkey')
+        batch_op.drop_column('title_id')
+        batch_op.create_index('ix_genre_title_title_user_id', ['title', 'user_id'], unique=False)
+
+    op.drop_table('genre_vocabulary')
@@ -0,0 +1,27 @@
+"""add genre_title.playtime_minutes
+
+Revision ID: f1b7d3e9a5c2
+Revises: e6a2c8d4f1b9
+Create Date: 2026-10-18 14:41:09.382715
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b7d3e9a5c2'
+down_revision = 'e6a2c8d4f1b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NULL for existing rows; filled by the next `flask steam import`
+    with op.batch_alter_table('genre_title', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('playtime_minutes', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('genre_title', schema=None) as batch_op:
+        batch_op.drop_column('playtime_minutes')
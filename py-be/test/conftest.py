@@ -0,0 +1,46 @@
+import pytest
+
+from app import create_app, db
+
+
+@pytest.fixture(autouse=True)
+def no_lsh_index(tmp_path, monkeypatch):
+    # Never pick up an index built in the real instance folder
+    from app import config
+    monkeypatch.setattr(config.TestingConfig, 'RECOMMENDATION_LSH_PATH', str(tmp_path / 'lsh_index'))
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def add_users(app, *user_ids):
+    """
+    Insert bare User rows, for writes that reference a user_id.
+    """
+    from app.models.user import User
+
+    with app.app_context():
+        db.session.add_all(User(user_id=user_id, user_name=user_id, user_email='%s@example.com' % user_id,
+                                user_password_hash='x') for user_id in user_ids)
+        db.session.commit()
+
+
+@pytest.fixture
+def users(app):
+    """
+    Users u0 to u9.
+    """
+    user_ids = ['u%d' % i for i in range(10)]
+    add_users(app, *user_ids)
+    return user_ids
@@ -0,0 +1,70 @@
+import json
+import subprocess
+import sys
+import os
+
+from sqlalchemy import inspect
+
+from app import create_app, db
+from app.utils.apispec import build_spec
+
+
+def test_spec_is_built_on_first_request(client):
+    spec = client.get('/apispec_1.json').get_json()
+    assert spec['info']['title']
+    assert '/api/genre/create' in spec['paths']
+    assert 'post' in spec['paths']['/api/user/login']
+
+    page = client.get('/apidocs/')
+    assert page.status_code == 200
+    assert b'/apispec_1.json' in page.data
+    assert client.get('/flasgger_static/swagger-ui-bundle.js').status_code == 200
+
+
+def test_static_spec_is_served_from_file(app, tmp_path, monkeypatch):
+    path = tmp_path / 'apispec.json'
+    path.write_bytes(build_spec(app))
+    spec = json.loads(path.read_bytes())
+    spec['info']['title'] = 'prebuilt'
+    path.write_text(json.dumps(spec))
+
+    from app import config
+    monkeypatch.setattr(config.TestingConfig, 'API_DOCS', 'static')
+    monkeypatch.setattr(config.TestingConfig, 'API_SPEC_PATH', str(path))
+    static_app = create_app('testing')
+    assert static_app.test_client().get('/apispec_1.json').get_json()['info']['title'] == 'prebuilt'
+
+
+def test_docs_off(monkeypatch):
+    from app import config
+    monkeypatch.setattr(config.TestingConfig, 'API_DOCS', 'off')
+    app = create_app('testing')
+    assert app.test_client().get('/apispec_1.json').status_code == 404
+
+
+def test_schema_left_to_migrations(tmp_path, monkeypatch):
+    from app import config
+    monkeypatch.setattr(config.TestingConfig, 'SQLALCHEMY_DATABASE_URI', 'sqlite:///%s' % (tmp_path / 'test.db'))
+    monkeypatch.setattr(config.TestingConfig, 'CREATE_ALL', False)
+    app = create_app('testing')
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_migrate_commands_are_loaded_on_use(app):
+    result = app.test_cli_runner().invoke(args=['db', '--help'])
+    assert result.exit_code == 0
+    assert 'upgrade' in result.output
+    assert 'migrate' in app.extensions
+
+
+def test_startup_defers_heavy_imports():
+    code = ("import sys, app; app.create_app('testing'); "
+            "print(sorted(m for m in ('flasgger', 'flask_migrate', 'alembic', 'recom_system', 'numpy', 'scipy') "
+            "if m in sys.modules))")
+    root = os.path.join(os.path.dirname(__file__), '..')
+    output = subprocess.run([sys.executable, '-c', code], cwd=root, check=True, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=root)).stdout
+    assert output.strip().splitlines()[-1] == '[]'
@@ -0,0 +1,171 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('greenlet')
+pytest.importorskip('a2wsgi')
+
+from app import db
+from app.asgi import AsyncApi, create_asgi_app
+from app.services import passwords
+from app.services.genre_index import genre_index
+from conftest import add_users
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    from app import config
+    monkeypatch.setattr(config.TestingConfig, 'SQLALCHEMY_DATABASE_URI', 'sqlite:///%s' % (tmp_path / 'test.db'))
+    api = create_asgi_app('testing')
+    yield api
+    asyncio.run(api.close())
+    with api.flask_app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def call(api, method, path, body=None, query='', content_type='application/json'):
+    """
+    Send one request through the ASGI app; returns (status, headers, body).
+    """
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query.encode('utf-8'), 'root_path': '',
+        'headers': [(b'content-type', content_type.encode('latin-1'))] if body is not None else [],
+        'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80), 'client': ('127.0.0.1', 1234),
+    }
+    messages = [{'type': 'http.request', 'body': payload[:5], 'more_body': True},
+                {'type': 'http.request', 'body': payload[5:]}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(api(scope, receive, send))
+    assert sent[0]['type'] == 'http.response.start'
+    headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in sent[0]['headers']}
+    return sent[0]['status'], headers, b''.join(m.get('body', b'') for m in sent[1:])
+
+
+def test_login_matches_flask(api):
+    status, _, body = call(api, 'POST', '/api/user/create',
+                           {'user_name': 'john', 'user_email': 'john@example.com', 'user_password': 'pw'})
+    assert status == 201
+    assert json.loads(body)['user_email'] == 'john@example.com'
+
+    status, _, body = call(api, 'POST', '/api/user/login', {'user_email': 'john@example.com', 'user_password': 'pw'})
+    assert status == 200
+    tokens = json.loads(body)
+    with api.flask_app.app_context():
+        from flask_jwt_extended import decode_token
+        assert decode_token(tokens['refresh_token'])['type'] == 'refresh'
+
+    client = api.flask_app.test_client()
+    for payload in ({'user_email': 'john@example.com', 'user_password': 'wrong'}, {'user_email': 'john@example.com'}):
+        expected = client.post('/api/user/login', json=payload)
+        status, _, body = call(api, 'POST', '/api/user/login', payload)
+        assert (status, body) == (expected.status_code, expected.get_data())
+
+    # Authenticated views are served by Flask with the issued token
+    status, _, body = call(api, 'GET', '/api/user/get')
+    assert status == 401
+
+
+def test_rehashes_on_login(api):
+    passwords.password_hasher.rounds = 5
+    call(api, 'POST', '/api/user/create', {'user_name': 'john', 'user_email': 'john@example.com', 'user_password': 'pw'})
+    passwords.password_hasher.rounds = 4
+    assert call(api, 'POST', '/api/user/login', {'user_email': 'john@example.com', 'user_password': 'pw'})[0] == 200
+
+    from app.models.user import User
+    with api.flask_app.app_context():
+        user = User.query.filter_by(user_email='john@example.com').one()
+        assert not user.password_needs_rehash()
+
+
+def test_genre_write_updates_index_and_recommendations(api):
+    add_users(api.flask_app, 'u1', 'u2')
+    status, _, body = call(api, 'POST', '/api/genre/create', {'genre_titles': ['RPG', 'Action'], 'user_id': 'u1'})
+    assert status == 201
+    created = json.loads(body)
+    assert created['genre_titles'] == ['RPG', 'Action']
+    call(api, 'POST', '/api/genre/create', {'genre_titles': ['RPG', 'Indie'], 'user_id': 'u2'})
+
+    assert json.loads(call(api, 'GET', '/api/genre/users', query='title=RPG&title=Action')[2]) == \
+        {'user_ids': ['u1'], 'count': 1}
+    assert genre_index.titles_for('u2') == {'RPG', 'Indie'}
+
+    client = api.flask_app.test_client()
+    for path, query in (('/api/recommendation/user/u1', 'limit=5'), ('/api/recommendation/user/missing', ''),
+                        ('/api/recommendation/user/u1/similar', ''), ('/api/recommendation/user/u1', 'limit=x'),
+                        ('/api/recommendation/user/u1', 'limit=0'), ('/api/recommendation/user/u1/similar', 'limit=-1'),
+                        ('/api/genre/users', 'title=RPG&mode=xor'), ('/api/genre/get', '')):
+        expected = client.get(path + '?' + query)
+        status, _, body = call(api, 'GET', path, query=query)
+        assert (status, json.loads(body)) == (expected.status_code, expected.get_json())
+
+
+def test_rejected_bodies_fall_back_to_flask(api):
+    status, _, _ = call(api, 'POST', '/api/genre/create', {'genre_titles': ['RPG'], 'user_id': 'u1'},
+                        content_type='text/plain')
+    assert status == 415
+    status, _, body = call(api, 'POST', '/api/genre/create', {'genre_titles': 'RPG', 'user_id': 'u1'})
+    assert (status, json.loads(body)) == (400, {'error': 'genre_titles must be a list'})
+    assert call(api, 'GET', '/api/user/login')[0] == 405
+    assert call(api, 'GET', '/api/unknown')[0] == 404
+
+
+def test_password_pool_busy(api, monkeypatch):
+    async def busy(*args):
+        raise passwords.PasswordPoolBusy()
+
+    monkeypatch.setattr(passwords.password_hasher, 'hash_async', busy)
+    status, headers, body = call(api, 'POST', '/api/user/create',
+                                 {'user_name': 'john', 'user_email': 'john@example.com', 'user_password': 'pw'})
+    assert status == 503
+    assert headers['retry-after'] == '1'
+
+
+def test_in_memory_database_is_refused(app):
+    with pytest.raises(ValueError):
+        AsyncApi(app)
+
+
+def test_ndjson_bulk_is_streamed_to_flask(api):
+    add_users(api.flask_app, 'u1', 'u2', 'u3')
+    api.flask_app.config['BULK_CHUNK_SIZE'] = 1
+    lines = [json.dumps({'user_id': 'u%d' % i, 'genre_titles': ['RPG']}).encode('utf-8') + b'\n' for i in (1, 2, 3)]
+    # Chunked upload: no Content-Length, one line per message
+    scope = {
+        'type': 'http', 'method': 'POST', 'path': '/api/genre/bulk', 'query_string': b'', 'root_path': '',
+        'headers': [(b'content-type', b'application/x-ndjson'), (b'transfer-encoding', b'chunked')],
+        'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80), 'client': ('127.0.0.1', 1234),
+    }
+    messages = [{'type': 'http.request', 'body': line, 'more_body': True} for line in lines]
+    messages.append({'type': 'http.request', 'body': b''})
+    written_before_end = []
+    sent = []
+
+    def genres():
+        with api.flask_app.app_context():
+            return db.session.execute(db.text('SELECT count(*) FROM genre')).scalar()
+
+    async def receive():
+        if len(messages) == 1:
+            written_before_end.append(genres())
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(api(scope, receive, send))
+    assert sent[0]['status'] == 200
+    assert json.loads(b''.join(m.get('body', b'') for m in sent[1:])) == {'created': 3, 'updated': 0, 'errors': []}
+    # Earlier lines were committed while the rest of the body was in flight
+    assert written_before_end[0] >= 1
+    assert genres() == 3
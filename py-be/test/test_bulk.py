@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from app.models.genre import Genre
+from app.models.recommendation import Recommendation
+from app.services.genre_index import genre_index
+
+
+@pytest.fixture
+def small_chunks(app):
+    app.config['BULK_CHUNK_SIZE'] = 2
+    return app
+
+
+def _genre_titles(app):
+    with app.app_context():
+        return {genre.genre_id: (genre.user_id, genre.genre_titles) for genre in Genre.query.all()}
+
+
+def test_genre_bulk_reports_errors_by_index(app, client, users):
+    response = client.post('/api/genre/bulk', json=[
+        {'genre_id': 'g1', 'user_id': 'u1', 'genre_titles': ['RPG', 'Action']},
+        {'user_id': 'u2'},
+        'not an object',
+        {'genre_id': 'g2', 'genre_titles': ['RPG']},
+        {'genre_id': 'g3', 'user_id': 'u3', 'genre_titles': 'RPG'},
+        {'genre_id': 'g1', 'user_id': 'u4', 'genre_titles': ['Indie']},
+        {'user_id': 'u2', 'genre_titles': ['Indie']},
+    ])
+    assert response.status_code == 200
+    summary = response.get_json()
+    assert (summary['created'], summary['updated']) == (2, 0)
+    assert summary['errors'] == [
+        {'index': 1, 'error': 'genre_titles is required'},
+        {'index': 2, 'error': 'Item must be an object'},
+        {'index': 3, 'error': 'user_id is required'},
+        {'index': 4, 'error': 'genre_titles must be a list'},
+        {'index': 5, 'error': 'Duplicate genre_id in request'},
+    ]
+
+    genres = _genre_titles(app)
+    assert genres['g1'] == ('u1', ['RPG', 'Action'])
+    assert sorted(user_id for user_id, _ in genres.values()) == ['u1', 'u2']
+    assert genre_index.users_for(['Indie']) == ['u2']
+
+
+def test_genre_bulk_updates_existing_rows(app, client, users):
+    client.post('/api/genre/bulk', json=[{'genre_id': 'g1', 'user_id': 'u1', 'genre_titles': ['RPG']}])
+    summary = client.post('/api/genre/bulk', json=[
+        {'genre_id': 'g1', 'user_id': 'u2', 'genre_titles': ['Indie', 'Puzzle']},
+    ]).get_json()
+    assert summary == {'created': 0, 'updated': 1, 'errors': []}
+    assert _genre_titles(app) == {'g1': ('u2', ['Indie', 'Puzzle'])}
+    assert genre_index.users_for(['RPG']) == []
+    assert genre_index.users_for(['Puzzle']) == ['u2']
+
+
+def test_failed_chunk_is_rolled_back(app, client, users, small_chunks):
+    # The second chunk references a user that does not exist
+    summary = client.post('/api/genre/bulk', json=[
+        {'genre_id': 'g1', 'user_id': 'u1', 'genre_titles': ['RPG']},
+        {'genre_id': 'g2', 'user_id': 'u2', 'genre_titles': ['Action']},
+        {'genre_id': 'g3', 'user_id': 'u3', 'genre_titles': ['Indie']},
+        {'genre_id': 'g4', 'user_id': 'nobody', 'genre_titles': ['Strategy']},
+        {'genre_id': 'g5', 'user_id': 'u5', 'genre_titles': ['Puzzle']},
+    ]).get_json()
+    assert (summary['created'], summary['updated']) == (3, 0)
+    assert [e['index'] for e in summary['errors']] == [2, 3]
+    assert 'FOREIGN KEY' in summary['errors'][0]['error']
+
+    assert sorted(_genre_titles(app)) == ['g1', 'g2', 'g5']
+    assert client.get('/api/genre/users?title=Indie').get_json()['count'] == 0
+    assert client.get('/api/genre/users?title=Puzzle').get_json()['user_ids'] == ['u5']
+
+
+def test_genre_bulk_reads_ndjson(app, client, users, small_chunks):
+    lines = [json.dumps({'genre_id': 'g%d' % i, 'user_id': 'u%d' % i, 'genre_titles': ['RPG']}) for i in range(5)]
+    lines.insert(2, '{not json')
+    lines.insert(4, '')
+    response = client.post('/api/genre/bulk', data='\n'.join(lines) + '\n', content_type='application/x-ndjson')
+    summary = response.get_json()
+    assert (summary['created'], summary['updated']) == (5, 0)
+    assert summary['errors'] == [{'index': 2, 'error': 'Invalid JSON line'}]
+    assert genre_index.users_for(['RPG']) == ['u%d' % i for i in range(5)]
+
+
+def test_bulk_rejects_other_bodies(client):
+    for path in ('/api/genre/bulk', '/api/recommendation/bulk'):
+        response = client.post(path, json={'user_id': 'u1'})
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Body must be a JSON array or NDJSON'}
+        assert client.post(path, data='[1]', content_type='text/plain').status_code == 400
+
+
+def test_recommendation_bulk(app, client, users, small_chunks):
+    summary = client.post('/api/recommendation/bulk', json=[
+        {'recommendation_id': 'r1', 'user_id': 'u1', 'recommendation_titles': ['RPG', 'Indie']},
+        {'recommendation_id': 'r1', 'user_id': 'u2', 'recommendation_titles': ['Action']},
+        {'user_id': 'u3'},
+        {'recommendation_id': 'r2', 'user_id': 'nobody', 'recommendation_titles': ['Action']},
+    ]).get_json()
+    assert (summary['created'], summary['updated']) == (1, 0)
+    assert [e['index'] for e in summary['errors']] == [1, 2, 3]
+    assert summary['errors'][0]['error'] == 'Duplicate recommendation_id in request'
+    assert summary['errors'][1]['error'] == 'recommendation_titles is required'
+
+    lines = '\n'.join(json.dumps(item) for item in (
+        {'recommendation_id': 'r1', 'user_id': 'u1', 'recommendation_titles': ['Puzzle']},
+        {'recommendation_id': 'r3', 'user_id': 'u3', 'recommendation_titles': []},
+    ))
+    summary = client.post('/api/recommendation/bulk', data=lines, content_type='application/x-ndjson').get_json()
+    assert summary == {'created': 1, 'updated': 1, 'errors': []}
+    with app.app_context():
+        rows = {r.recommendation_id: (r.user_id, r.recommendation_titles) for r in Recommendation.query.all()}
+    assert rows == {'r1': ('u1', ['Puzzle']), 'r3': ('u3', [])}
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+
+
+@pytest.fixture
+def tokens(client):
+    user = client.post('/api/user/create', json={
+        'user_name': 'Ada', 'user_email': 'ada@example.com', 'user_password': 'pw'
+    }).get_json()
+    body = client.post('/api/user/login', json={
+        'user_email': 'ada@example.com', 'user_password': 'pw'
+    }).get_json()
+    return user['user_id'], body['access_token'], body['refresh_token']
+
+
+def _bearer(token):
+    return {'Authorization': 'Bearer ' + token}
+
+
+def test_refresh_issues_a_new_access_token(client, tokens):
+    _, access, refresh = tokens
+    assert client.post('/api/user/refresh', headers=_bearer(access)).status_code == 422
+
+    response = client.post('/api/user/refresh', headers=_bearer(refresh))
+    assert response.status_code == 200
+    assert client.get('/api/user/get', headers=_bearer(response.get_json()['access_token'])).status_code == 200
+
+
+def test_logout_can_revoke_the_refresh_token(client, tokens):
+    _, _, refresh = tokens
+    assert client.post('/api/user/logout', headers=_bearer(refresh)).status_code == 200
+    assert client.post('/api/user/refresh', headers=_bearer(refresh)).status_code == 401
+
+
+def test_logout_with_access_token_revokes_the_refresh_token(client, tokens):
+    _, access, refresh = tokens
+    assert client.post('/api/user/logout', headers=_bearer(access)).status_code == 200
+    assert client.post('/api/user/refresh', headers=_bearer(refresh)).status_code == 401
+
+
+def test_refreshed_access_token_logs_out_the_session(client, tokens):
+    _, _, refresh = tokens
+    access = client.post('/api/user/refresh', headers=_bearer(refresh)).get_json()['access_token']
+    assert client.post('/api/user/logout', headers=_bearer(access)).status_code == 200
+    assert client.post('/api/user/refresh', headers=_bearer(refresh)).status_code == 401
+
+
+def test_identity_is_cached_between_requests(app, client, tokens):
+    user_id, access, _ = tokens
+    client.get('/api/user/get?limit=1', headers=_bearer(access))
+
+    statements = []
+    with app.app_context():
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            client.get('/api/user/get?limit=2', headers=_bearer(access))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    assert not any('user.user_name' in s and 'WHERE user.user_id' in s for s in statements)
+
+
+def test_deleted_user_tokens_are_rejected(client, tokens):
+    user_id, access, _ = tokens
+    client.get('/api/user/get', headers=_bearer(access))
+    assert client.delete('/api/user/delete/' + user_id, headers=_bearer(access)).status_code == 204
+    assert client.get('/api/user/get', headers=_bearer(access)).status_code == 401
+
+
+def test_deleting_a_user_removes_their_genres(app, client, tokens, users):
+    user_id, access, _ = tokens
+    client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Action'], 'user_id': user_id})
+    client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Indie'], 'user_id': 'u1'})
+    assert user_id in client.get('/api/genre/users?title=RPG').get_json()['user_ids']
+    assert client.get('/api/recommendation/user/' + user_id).status_code == 200
+
+    assert client.delete('/api/user/delete/' + user_id, headers=_bearer(access)).status_code == 204
+
+    from app.models.genre import Genre, GenreTitle
+    from app.models.recap import RecapSummary
+    with app.app_context():
+        for model in (Genre, GenreTitle, RecapSummary):
+            assert db.session.query(model).filter_by(user_id=user_id).count() == 0
+        assert db.session.query(RecapSummary).filter_by(user_id='u1').count() == 1
+    assert client.get('/api/genre/users?title=RPG').get_json() == {'user_ids': ['u1'], 'count': 1}
+    assert client.get('/api/recommendation/user/' + user_id).status_code == 404
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import select, text
+
+from app import db
+from app.models.genre import Genre, GenreTitle, GenreVocabulary
+from app.models.recommendation import Recommendation
+from app.models.user import User
+
+
+def query_plan(statement):
+    compiled = statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(text('EXPLAIN QUERY PLAN %s' % compiled)).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize('statement, index', [
+    (lambda: select(Genre).filter_by(user_id='u1'), 'ix_genre_user_id_date_added'),
+    (lambda: select(Genre).where(Genre.user_id == 'u1').order_by(Genre.genre_date_added),
+     'ix_genre_user_id_date_added'),
+    (lambda: select(Recommendation).where(Recommendation.user_id == 'u1')
+     .order_by(Recommendation.recommendation_date_added.desc()), 'ix_recommendation_user_id_date_added'),
+    (lambda: select(User).filter_by(genre_id='g1'), 'ix_user_genre_id'),
+    (lambda: select(GenreTitle.title_id).where(GenreTitle.user_id == 'u1'), 'ix_genre_title_user_id'),
+    (lambda: select(GenreTitle.user_id).where(GenreTitle.title_id == 1), 'ix_genre_title_title_id_user_id'),
+    (lambda: select(GenreVocabulary.title_id).where(GenreVocabulary.title == 'Action'),
+     'sqlite_autoindex_genre_vocabulary'),
+    (lambda: select(Genre).order_by(Genre.genre_date_added, Genre.genre_id).limit(10),
+     'ix_genre_date_added_genre_id'),
+])
+def test_lookup_uses_index(app, statement, index):
+    with app.app_context():
+        plan = query_plan(statement())
+    assert index in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_foreign_keys_are_enforced(app, client):
+    with app.app_context():
+        assert db.session.execute(text('PRAGMA foreign_keys')).scalar() == 1
+
+    for path, body in (('/api/genre/create', {'genre_titles': ['Action'], 'user_id': 'nonexistent'}),
+                       ('/api/recommendation/create', {'recommendation_titles': ['RPG'], 'user_id': 'nonexistent'})):
+        response = client.post(path, json=body)
+        assert response.status_code == 409
+        assert response.get_json()['error'] == 'Write violates a database constraint'
+
+    with app.app_context():
+        assert db.session.scalar(select(db.func.count()).select_from(Genre)) == 0
+        assert db.session.scalar(select(db.func.count()).select_from(Recommendation)) == 0
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from app import create_app, db
+from app.services.metrics import request_sql_queries, response_size_bytes
+from conftest import add_users
+
+
+@pytest.fixture
+def instrumented(monkeypatch, tmp_path):
+    monkeypatch.setenv('STEAM_RECAP_INSTRUMENTATION_ENABLED', 'true')
+    monkeypatch.setenv('STEAM_RECAP_PROFILE_SLOWEST_PERCENT', '100')
+    monkeypatch.setenv('STEAM_RECAP_PROFILE_SAMPLE_RATE', '1.0')
+    monkeypatch.setenv('STEAM_RECAP_PROFILE_DIR', str(tmp_path))
+    app = create_app('testing')
+    add_users(app, 'u1')
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def _series(histogram, endpoint):
+    return histogram.snapshot()[(endpoint,)]
+
+
+def test_records_sql_and_size_per_endpoint(instrumented):
+    client = instrumented.test_client()
+    client.post('/api/genre/create', json={'genre_titles': ['Action'], 'user_id': 'u1'})
+    before = _series(request_sql_queries, 'genre_bp.get_genres')[1] \
+        if ('genre_bp.get_genres',) in request_sql_queries.snapshot() else 0
+
+    response = client.get('/api/genre/get')
+    response.close()
+
+    counts, count, sql_total = _series(request_sql_queries, 'genre_bp.get_genres')
+    assert count == before + 1
+    assert sql_total >= 1
+    assert _series(response_size_bytes, 'genre_bp.get_genres')[2] >= len(response.data)
+
+
+def test_streamed_size_is_counted(instrumented):
+    client = instrumented.test_client()
+    client.post('/api/genre/create', json={'genre_titles': ['Action'], 'user_id': 'u1'})
+    response = client.get('/api/genre/get?format=ndjson')
+    body = response.data
+    response.close()
+    assert body
+    assert _series(response_size_bytes, 'genre_bp.get_genres')[2] >= len(body)
+
+
+def test_metrics_endpoint_and_profiles(instrumented, tmp_path):
+    client = instrumented.test_client()
+    for _ in range(20):
+        client.get('/api/genre/get').close()
+
+    text = client.get('/metrics').get_data(as_text=True)
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'http_request_sql_queries_count{endpoint="genre_bp.get_genres"}' in text
+
+    folded = [name for name in os.listdir(tmp_path) if name.endswith('.folded')]
+    assert folded
@@ -0,0 +1,22 @@
+import random
+
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.services.passwords import password_hasher
+from benchmarks.loadtest import PASSWORD, FlaskClientTransport, run_scenario, scenarios, seed, user_id
+
+
+def test_every_scenario_succeeds_on_a_small_seed(app):
+    with app.app_context():
+        seed(50, 30, 5, password_hasher.hash(PASSWORD), random.Random(1))
+        token = create_access_token(identity=user_id(0))
+        db.session.remove()
+
+    # One thread: the in-memory test database shares a single connection
+    transport = FlaskClientTransport(app)
+    for name, make_request in scenarios(50, 30, token).items():
+        result = run_scenario(transport, make_request, 6, 1, seed=3)
+        assert result['requests'] == 6, name
+        assert result['errors'] == 0, name
+        assert result['p50_ms'] <= result['p99_ms']
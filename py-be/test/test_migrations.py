@@ -0,0 +1,133 @@
+import os
+import sqlite3
+
+import pytest
+
+from app import create_app, db
+
+MIGRATIONS = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+
+# The schema db.create_all() made before migrations were introduced
+# (revision 3e92a62b9b7f): title lists are JSON blobs and nothing has a
+# foreign key. The recommendation table only exists where that model was
+# imported before create_all.
+BASELINE_SCHEMA = '''
+CREATE TABLE user (
+    user_id VARCHAR(36) NOT NULL PRIMARY KEY, user_name VARCHAR(80) NOT NULL,
+    user_email VARCHAR(120) NOT NULL UNIQUE, user_password_hash VARCHAR(128) NOT NULL,
+    genre_id VARCHAR(36), user_date_added DATETIME NOT NULL
+);
+CREATE TABLE genre (
+    genre_id VARCHAR(36) NOT NULL PRIMARY KEY, genre_titles TEXT, user_id VARCHAR(36),
+    genre_date_added DATETIME NOT NULL
+);
+'''
+RECOMMENDATION_SCHEMA = '''
+CREATE TABLE recommendation (
+    recommendation_id VARCHAR(36) NOT NULL PRIMARY KEY, recommendation_titles TEXT, user_id VARCHAR(36),
+    recommendation_date_added DATETIME NOT NULL
+);
+'''
+NOW = '2024-01-01 00:00:00'
+
+
+def baseline_database(path, recommendations=True):
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA + (RECOMMENDATION_SCHEMA if recommendations else ''))
+    conn.executemany('INSERT INTO user VALUES (?, ?, ?, ?, ?, ?)', [
+        ('u1', 'ada', 'ada@example.com', 'x', 'g1', NOW),
+        ('u2', 'bob', 'bob@example.com', 'x', 'gone', NOW),
+    ])
+    conn.executemany('INSERT INTO genre VALUES (?, ?, ?, ?)', [
+        ('g1', '["RPG", "Action"]', 'u1', NOW),
+        ('g2', "['Indie']", 'u2', NOW),
+        ('g3', '["Puzzle"]', None, NOW),
+        ('g4', '["Horror"]', 'ghost', NOW),
+    ])
+    if recommendations:
+        conn.executemany('INSERT INTO recommendation VALUES (?, ?, ?, ?)', [
+            ('r1', '["Strategy", "Racing"]', 'u1', NOW),
+            ('r2', '["Sports"]', 'u2', NOW),
+            ('r3', '["Casual"]', 'ghost', NOW),
+        ])
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def migrate(tmp_path, monkeypatch):
+    """
+    Returns a function that runs `flask db <args>` against tmp_path/app.db.
+    """
+    from app import config
+    monkeypatch.setattr(config.TestingConfig, 'SQLALCHEMY_DATABASE_URI', 'sqlite:///%s' % (tmp_path / 'app.db'))
+    monkeypatch.setattr(config.TestingConfig, 'CREATE_ALL', False)
+    app = create_app('testing')
+    runner = app.test_cli_runner()
+
+    def run(*args):
+        result = runner.invoke(args=['db', '-d', MIGRATIONS] + list(args))
+        assert result.exit_code == 0, result.output
+        if result.exception is not None:
+            raise result.exception
+
+    yield run
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _counts(path, *tables):
+    conn = sqlite3.connect(path)
+    try:
+        return {table: conn.execute('SELECT count(*) FROM "%s"' % table).fetchone()[0] for table in tables}
+    finally:
+        conn.close()
+
+
+def test_upgrade_keeps_title_rows(tmp_path, migrate):
+    path = str(tmp_path / 'app.db')
+    baseline_database(path)
+    migrate('stamp', '3e92a62b9b7f')
+    migrate('upgrade')
+
+    assert _counts(path, 'user', 'genre', 'genre_title', 'recommendation', 'recommendation_title') == {
+        'user': 2, 'genre': 4, 'genre_title': 5, 'recommendation': 3, 'recommendation_title': 4,
+    }
+    conn = sqlite3.connect(path)
+    titles = conn.execute(
+        'SELECT v.title FROM genre_title t JOIN genre_vocabulary v ON v.title_id = t.title_id '
+        "WHERE t.genre_id = 'g1' ORDER BY t.position").fetchall()
+    assert titles == [('RPG',), ('Action',)]
+    assert conn.execute('PRAGMA foreign_key_check').fetchall() == []
+    conn.close()
+
+
+def test_upgrade_clears_references_to_missing_rows(tmp_path, migrate):
+    path = str(tmp_path / 'app.db')
+    baseline_database(path)
+    migrate('stamp', '3e92a62b9b7f')
+    migrate('upgrade')
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT user_id FROM genre WHERE genre_id = 'g4'").fetchone() == (None,)
+    assert conn.execute("SELECT user_id FROM genre_title WHERE genre_id = 'g4'").fetchall() == [(None,)]
+    assert conn.execute("SELECT user_id FROM recommendation WHERE recommendation_id = 'r3'").fetchone() == (None,)
+    assert conn.execute("SELECT user_id FROM recommendation_title WHERE recommendation_id = 'r3'").fetchall() == \
+        [(None,)]
+    assert conn.execute("SELECT genre_id FROM user ORDER BY user_id").fetchall() == [('g1',), (None,)]
+    assert not conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '_alembic_tmp%'").fetchall()
+    conn.close()
+
+
+def test_upgrade_without_recommendation_table(tmp_path, migrate):
+    path = str(tmp_path / 'app.db')
+    baseline_database(path, recommendations=False)
+    migrate('stamp', '3e92a62b9b7f')
+    migrate('upgrade')
+
+    assert _counts(path, 'genre', 'genre_title', 'recommendation', 'recommendation_title') == {
+        'genre': 4, 'genre_title': 5, 'recommendation': 0, 'recommendation_title': 0,
+    }
+    columns = [row[1] for row in sqlite3.connect(path).execute('PRAGMA table_info(recommendation)')]
+    assert columns == ['recommendation_id', 'user_id', 'recommendation_date_added', 'recommendation_source']
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from app.models.user import User
+from app.services.passwords import PasswordPoolBusy, password_hasher
+
+CREDENTIALS = {'user_email': 'ada@example.com', 'user_password': 'pw'}
+
+
+@pytest.fixture
+def ada(client):
+    client.post('/api/user/create', json=dict(CREDENTIALS, user_name='Ada'))
+
+
+def _stored_hash(app):
+    with app.app_context():
+        return User.query.filter_by(user_email=CREDENTIALS['user_email']).one().user_password_hash
+
+
+def test_exhausted_pool_returns_503(app, client, ada):
+    taken = 0
+    while password_hasher._slots.acquire(blocking=False):
+        taken += 1
+    try:
+        assert taken == app.config['PASSWORD_POOL_MAX_PENDING']
+        for path, payload in (('/api/user/login', CREDENTIALS),
+                              ('/api/user/create', dict(CREDENTIALS, user_name='Bob', user_email='bob@example.com'))):
+            response = client.post(path, json=payload)
+            assert response.status_code == 503
+            assert response.headers['Retry-After'] == '1'
+            assert 'retry' in response.get_json()['error']
+    finally:
+        for _ in range(taken):
+            password_hasher._slots.release()
+
+    assert client.post('/api/user/login', json=CREDENTIALS).status_code == 200
+    with app.app_context():
+        assert User.query.filter_by(user_email='bob@example.com').count() == 0
+
+
+def test_slow_hash_times_out(app, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(password_hasher, 'timeout', 0.05)
+    with app.app_context(), pytest.raises(PasswordPoolBusy):
+        password_hasher._run('hash', release.wait)
+    release.set()
+
+
+def test_outdated_hash_is_upgraded_on_login(app, client, monkeypatch):
+    monkeypatch.setattr(password_hasher, 'rounds', 5)
+    client.post('/api/user/create', json=dict(CREDENTIALS, user_name='Ada'))
+    old_hash = _stored_hash(app)
+    assert old_hash.startswith('$2b$05$')
+
+    monkeypatch.setattr(password_hasher, 'rounds', 4)
+    assert client.post('/api/user/login', json={**CREDENTIALS, 'user_password': 'wrong'}).status_code == 401
+    assert _stored_hash(app) == old_hash
+
+    assert client.post('/api/user/login', json=CREDENTIALS).status_code == 200
+    new_hash = _stored_hash(app)
+    assert new_hash.startswith('$2b$04$')
+    assert client.post('/api/user/login', json=CREDENTIALS).status_code == 200
+    assert _stored_hash(app) == new_hash
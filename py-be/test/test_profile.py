@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+
+
+@pytest.fixture
+def auth(client):
+    user = client.post('/api/user/create', json={
+        'user_name': 'John Doe', 'user_email': 'john@email.com', 'user_password': 'secret'
+    }).get_json()
+    token = client.post('/api/user/login', json={
+        'user_email': 'john@email.com', 'user_password': 'secret'
+    }).get_json()['access_token']
+    return user['user_id'], {'Authorization': 'Bearer ' + token}
+
+
+def count_queries(app, func):
+    statements = []
+    with app.app_context():
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            result = func()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    return result, statements
+
+
+@pytest.mark.parametrize('n_genres, n_recommendations', [(1, 1), (12, 4)])
+def test_profile_loads_in_constant_queries(app, client, auth, n_genres, n_recommendations):
+    user_id, headers = auth
+    for i in range(n_genres):
+        client.post('/api/genre/create', json={'genre_titles': ['Action', 'RPG %d' % i], 'user_id': user_id})
+    for i in range(n_recommendations):
+        client.post('/api/recommendation/create', json={'recommendation_titles': ['Strategy'], 'user_id': user_id})
+
+    # Resolve the caller once so the identity cache is warm, as in steady state
+    client.get('/api/user/%s/profile' % user_id, headers=headers)
+    response, statements = count_queries(
+        app, lambda: client.get('/api/user/%s/profile?recommendations=10' % user_id, headers=headers)
+    )
+    profile = response.get_json()
+
+    assert response.status_code == 200
+    assert len(profile['genres']) == n_genres
+    assert len(profile['recommendations']) == n_recommendations
+    assert all(g['genre_titles'][0] == 'Action' for g in profile['genres'])
+    # user + genres (joined), genre titles, recommendations, recommendation titles
+    assert len(statements) == 4
+
+
+def test_profile_unknown_user(client, auth):
+    _, headers = auth
+    assert client.get('/api/user/missing/profile', headers=headers).status_code == 404
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+
+from app import db
+from app.models.recap import RecapSummary
+from app.services.recap import recap_service
+
+
+@pytest.fixture
+def auth(client):
+    user = client.post('/api/user/create', json={
+        'user_name': 'Ada', 'user_email': 'ada@example.com', 'user_password': 'pw'
+    }).get_json()
+    token = client.post('/api/user/login', json={
+        'user_email': 'ada@example.com', 'user_password': 'pw'
+    }).get_json()['access_token']
+    return user['user_id'], {'Authorization': 'Bearer ' + token}
+
+
+def test_recap_follows_genre_writes(client, auth):
+    user_id, headers = auth
+    assert client.get('/api/recap/' + user_id, headers=headers).status_code == 404
+
+    created = client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Action'], 'user_id': user_id})
+    client.post('/api/genre/create', json={'genre_titles': ['RPG'], 'user_id': user_id})
+    recap = client.get('/api/recap/' + user_id, headers=headers).get_json()
+    assert recap['genre_count'] == 2
+    assert recap['top_genres'][0] == {'title': 'RPG', 'count': 2, 'share': 0.6667}
+    assert recap['changes'] is None
+
+    client.delete('/api/genre/delete/' + created.get_json()['genre_id'])
+    recap = client.get('/api/recap/' + user_id, headers=headers).get_json()
+    assert recap['genre_count'] == 1
+    assert recap['top_genres'] == [{'title': 'RPG', 'count': 1, 'share': 1.0}]
+
+
+def test_changes_are_reported_after_a_period(app, client, auth):
+    user_id, headers = auth
+    client.post('/api/genre/create', json={'genre_titles': ['Puzzle'], 'user_id': user_id})
+
+    # Pretend the current period started long ago
+    with app.app_context():
+        summary = db.session.get(RecapSummary, user_id)
+        summary.period_start -= recap_service.period + timedelta(days=1)
+        db.session.commit()
+
+    client.post('/api/genre/bulk', json=[{'genre_titles': ['Action'], 'user_id': user_id}])
+    changes = client.get('/api/recap/' + user_id, headers=headers).get_json()['changes']
+    assert changes['new'] == ['Action']
+    assert changes['dropped'] == []
+    assert changes['share_delta'] == {'Action': 0.5, 'Puzzle': -0.5}
+
+
+def test_rebuild_command(app, client, auth):
+    user_id, headers = auth
+    client.post('/api/genre/create', json={'genre_titles': ['Indie'], 'user_id': user_id})
+    with app.app_context():
+        RecapSummary.query.delete()
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['recap', 'rebuild'])
+    assert 'Rebuilt 1 recaps' in result.output
+    assert client.get('/api/recap/' + user_id, headers=headers).get_json()['top_genres'][0]['title'] == 'Indie'
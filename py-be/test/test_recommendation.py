@@ -0,0 +1,23 @@
+import pytest
+
+from app.services.recommender import MAX_RECOMMENDATIONS
+
+
+@pytest.fixture
+def genres(client, users):
+    for user_id, titles in (('u1', ['RPG', 'Action']), ('u2', ['RPG', 'Indie', 'Puzzle']), ('u3', ['Action', 'Indie'])):
+        client.post('/api/genre/create', json={'genre_titles': titles, 'user_id': user_id})
+
+
+@pytest.mark.parametrize('path', ['/api/recommendation/user/u1', '/api/recommendation/user/u1/similar'])
+def test_limit_is_validated(client, genres, path):
+    for limit, error in (('x', 'limit must be an integer'), ('0', 'limit must be positive'),
+                         ('-3', 'limit must be positive')):
+        response = client.get(path + '?limit=' + limit)
+        assert response.status_code == 400
+        assert response.get_json() == {'error': error}
+
+    body = client.get(path + '?limit=1').get_json()
+    assert len(body.get('recommendation_titles', body.get('similar_users'))) == 1
+    body = client.get(path + '?limit=%d' % (MAX_RECOMMENDATIONS * 10)).get_json()
+    assert len(body.get('recommendation_titles', body.get('similar_users'))) <= MAX_RECOMMENDATIONS
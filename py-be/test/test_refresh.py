@@ -0,0 +1,83 @@
+import pytest
+
+from app import db
+from app.models.recommendation import Recommendation
+from app.services.refresh import recommendation_refresher
+
+
+def _recommended(app, user_id):
+    with app.app_context():
+        rows = db.session.query(Recommendation).filter_by(user_id=user_id).all()
+        return [row.recommendation_titles for row in rows]
+
+
+def test_drain_rewrites_and_deletes_dirty_users(app, client, users):
+    client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Action'], 'user_id': 'u1'})
+    created = client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Indie'], 'user_id': 'u2'}).get_json()
+    assert recommendation_refresher.pending == 2
+
+    with app.app_context():
+        assert recommendation_refresher.drain() == 2
+    assert recommendation_refresher.pending == 0
+    assert _recommended(app, 'u1') == [['Indie']]
+    assert _recommended(app, 'u2') == [['Action']]
+
+    client.delete('/api/genre/delete/' + created['genre_id'])
+    with app.app_context():
+        assert recommendation_refresher.drain() == 1
+    assert _recommended(app, 'u2') == []
+    assert _recommended(app, 'u1') == [['Indie']]
+
+
+def test_failed_drain_keeps_users_dirty(app, client, users, monkeypatch):
+    client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Action'], 'user_id': 'u1'})
+    client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Indie'], 'user_id': 'u2'})
+
+    from recom_system import store
+
+    def fail(conn, items, **kwargs):
+        raise RuntimeError('database went away')
+
+    monkeypatch.setattr(store, 'write_recommendations', fail)
+    with app.app_context(), pytest.raises(RuntimeError):
+        recommendation_refresher.drain()
+    assert recommendation_refresher.pending == 2
+
+    monkeypatch.undo()
+    with app.app_context():
+        assert recommendation_refresher.drain() == 2
+    assert _recommended(app, 'u1') == [['Indie']]
+
+
+def test_persistent_failure_stops_retrying(app, client, users, monkeypatch):
+    client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Action'], 'user_id': 'u1'})
+
+    from recom_system import store
+
+    def fail(conn, items, **kwargs):
+        raise RuntimeError('database went away')
+
+    monkeypatch.setattr(store, 'write_recommendations', fail)
+    app.config['RECOMMENDATION_REFRESH_MAX_ATTEMPTS'] = 3
+    for _ in range(3):
+        assert recommendation_refresher.pending == 1
+        with app.app_context(), pytest.raises(RuntimeError):
+            recommendation_refresher.drain()
+    assert recommendation_refresher.pending == 0
+
+
+def test_refresh_keeps_recommendations_created_through_the_api(app, client, users):
+    client.post('/api/recommendation/create', json={'recommendation_titles': ['Portal'], 'user_id': 'u1'})
+    created = client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Action'], 'user_id': 'u1'}).get_json()
+    client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Indie'], 'user_id': 'u2'})
+
+    with app.app_context():
+        recommendation_refresher.drain()
+        recommendation_refresher.mark(['u1'])
+        recommendation_refresher.drain()
+    assert sorted(_recommended(app, 'u1')) == [['Indie'], ['Portal']]
+
+    client.delete('/api/genre/delete/' + created['genre_id'])
+    with app.app_context():
+        recommendation_refresher.drain()
+    assert _recommended(app, 'u1') == [['Portal']]
@@ -0,0 +1,50 @@
+import pytest
+
+from app.services.response_cache import response_cache
+
+
+@pytest.fixture(params=['local', 'shared'])
+def cached_client(request, app, client, users):
+    app.config['RESPONSE_CACHE_BACKEND'] = request.param
+    response_cache.init_app(app)
+    return client
+
+
+def test_etag_and_conditional_get(cached_client):
+    cached_client.post('/api/genre/create', json={'genre_titles': ['Action'], 'user_id': 'u1'})
+
+    first = cached_client.get('/api/genre/get')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert not first.headers['ETag'].startswith('W/')
+
+    again = cached_client.get('/api/genre/get', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+
+
+def test_write_invalidates(cached_client):
+    cached_client.post('/api/genre/create', json={'genre_titles': ['Action'], 'user_id': 'u1'})
+    etag = cached_client.get('/api/genre/get').headers['ETag']
+
+    cached_client.post('/api/genre/create', json={'genre_titles': ['RPG'], 'user_id': 'u2'})
+    response = cached_client.get('/api/genre/get', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == 2
+
+
+def test_cache_key_includes_query(cached_client):
+    for i in range(3):
+        cached_client.post('/api/genre/create', json={'genre_titles': ['Action'], 'user_id': 'u%d' % i})
+    assert len(cached_client.get('/api/genre/get?limit=1').get_json()['items']) == 1
+    assert len(cached_client.get('/api/genre/get?limit=2').get_json()['items']) == 2
+
+
+def test_stream_request_skips_cache(cached_client):
+    cached_client.post('/api/genre/create', json={'genre_titles': ['Action'], 'user_id': 'u1'})
+    page = cached_client.get('/api/genre/get')
+    assert 'Accept' in page.headers['Vary']
+
+    stream = cached_client.get('/api/genre/get', headers={'Accept': 'application/x-ndjson'})
+    assert stream.mimetype == 'application/x-ndjson'
+    assert len(stream.data.splitlines()) == 1
@@ -0,0 +1,37 @@
+import json
+
+from app import db
+from app.models.genre import Genre
+from app.models.recommendation import Recommendation
+
+
+def _seed(app):
+    with app.app_context():
+        db.session.add_all([
+            Genre(user_id='u1', genre_titles=['Action', 'RPG', 'Quote "x"']),
+            Genre(user_id='u2', genre_titles=[]),
+            Recommendation(user_id='u1', recommendation_titles=['Indie', 'Puzzle']),
+        ])
+        db.session.commit()
+        genres = {g.genre_id: g.to_dict() for g in Genre.query.all()}
+        recommendations = [r.to_dict() for r in Recommendation.query.all()]
+    return genres, recommendations
+
+
+def test_genre_page_matches_to_dict(app, client, users):
+    genres, _ = _seed(app)
+    body = client.get('/api/genre/get').get_json()
+    assert {g['genre_id']: g for g in body['items']} == genres
+    assert body['next_cursor'] is None
+
+
+def test_genre_stream_matches_to_dict(app, client, users):
+    genres, _ = _seed(app)
+    response = client.get('/api/genre/get?format=ndjson')
+    lines = [json.loads(line) for line in response.data.splitlines()]
+    assert {g['genre_id']: g for g in lines} == genres
+
+
+def test_recommendation_list_matches_to_dict(app, client, users):
+    _, recommendations = _seed(app)
+    assert client.get('/api/recommendation/get').get_json() == recommendations
@@ -0,0 +1,118 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app import db
+from app.models.genre import Genre, GenreTitle
+from app.models.user import User
+from app.utils.steam_library import PlaytimeAggregator, iter_json_array, iter_records
+
+
+@pytest.fixture
+def users(app):
+    with app.app_context():
+        db.session.add_all([
+            User(user_id='u1', user_name='a', user_email='a@example.com', user_password_hash='x'),
+            User(user_id='u2', user_name='b', user_email='b@example.com', user_password_hash='x'),
+        ])
+        db.session.commit()
+
+
+def test_json_array_reader_handles_buffer_boundaries():
+    records = [{'appid': i, 'name': 'Game [%d] "x"' % i, 'playtime_forever': i * 10} for i in range(50)]
+    text = json.dumps({'response': {'game_count': 50, 'games': records}}, indent=1)
+    for read_size in (1, 7, 64, 1 << 20):
+        assert list(iter_json_array(io.StringIO(text), read_size)) == records
+
+
+def test_aggregates_playtime_per_genre():
+    aggregator = PlaytimeAggregator({'10': ('Action', 'FPS')}, default_user_id='u1')
+    lines = '\n'.join(json.dumps(r) for r in [
+        {'appid': 10, 'playtime_forever': 100},
+        {'appid': 20, 'playtime_forever': 300, 'genres': [{'id': '3', 'description': 'RPG'}]},
+        {'user_id': 'u2', 'games': [{'appid': 10, 'playtime_forever': 5}, {'appid': 99, 'playtime_forever': 0}]},
+    ])
+    for record in iter_records(io.StringIO(lines), 'ndjson'):
+        aggregator.add(record)
+
+    assert dict(aggregator.profiles()) == {'u1': [('RPG', 300), ('Action', 100), ('FPS', 100)],
+                                           'u2': [('Action', 5), ('FPS', 5)]}
+    assert dict(aggregator.profiles(top=1)) == {'u1': [('RPG', 300)], 'u2': [('Action', 5)]}
+    assert aggregator.games == 4
+
+
+def test_skips_malformed_games():
+    aggregator = PlaytimeAggregator({'10': ('Action',)}, default_user_id='u1')
+    for record in [
+        {'games': ['570', None, {'appid': 10, 'playtime_forever': 'lots'}, {'appid': 10, 'playtime_forever': '40'}]},
+        {'appid': 10, 'playtime_forever': None},
+        {'appid': 10, 'playtime_forever': 2.5},
+        {'appid': 10, 'playtime_forever': True},
+        {'appid': 20, 'playtime_forever': 30, 'genres': 'RPG'},
+        {'user_id': 'u2', 'games': 'none'},
+    ]:
+        aggregator.add(record)
+
+    assert dict(aggregator.profiles()) == {'u1': [('Action', 42)]}
+    assert aggregator.games == 3
+    assert aggregator.skipped == 6
+
+
+def test_import_command_creates_then_updates_genres(app, users, tmp_path):
+    export = tmp_path / 'library.ndjson'
+    export.write_text('\n'.join(json.dumps(r) for r in [
+        {'user_id': 'u1', 'appid': 1, 'playtime_forever': 50, 'genres': ['Indie']},
+        {'user_id': 'u1', 'appid': 2, 'playtime_forever': 500, 'genres': ['Strategy']},
+        {'user_id': 'u2', 'appid': 1, 'playtime_forever': 5, 'genres': ['Indie']},
+        {'user_id': 'ghost', 'appid': 1, 'playtime_forever': 5, 'genres': ['Indie']},
+    ]))
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['steam', 'import', str(export), '--chunk-size', '1'])
+    assert result.exit_code == 0, result.output
+    assert 'created: 2' in result.output and 'unknown users: 1' in result.output
+
+    with app.app_context():
+        user = db.session.get(User, 'u1')
+        assert db.session.get(Genre, user.genre_id).genre_titles == ['Strategy', 'Indie']
+        assert _playtime(user.genre_id) == [500, 50]
+
+    owned = tmp_path / 'owned.json'
+    owned.write_text(json.dumps({'response': {'game_count': 1, 'games': [{'appid': 3, 'playtime_forever': 9}]}}))
+    genres = tmp_path / 'appdetails.json'
+    genres.write_text(json.dumps({'3': {'success': True, 'data': {'genres': [{'id': '2', 'description': 'Racing'}]}}}))
+
+    result = runner.invoke(args=['steam', 'import', str(owned), '--user-id', 'u1', '--app-genres', str(genres)])
+    assert result.exit_code == 0, result.output
+    assert 'updated: 1' in result.output
+    with app.app_context():
+        assert Genre.query.count() == 2
+        genre_id = db.session.get(User, 'u1').genre_id
+        assert db.session.get(Genre, genre_id).genre_titles == ['Racing']
+        assert _playtime(genre_id) == [9]
+
+
+def _playtime(genre_id):
+    return db.session.execute(
+        select(GenreTitle.playtime_minutes).where(GenreTitle.genre_id == genre_id).order_by(GenreTitle.position)
+    ).scalars().all()
+
+
+def test_playtime_must_match_titles(app, users):
+    from app.services.vocabulary import genre_vocabulary
+    from app.utils.bulk import TitleListUpsert
+
+    upsert = TitleListUpsert(Genre, GenreTitle, 'genre_id', 'genre_date_added', 'genre_titles', genre_vocabulary,
+                             weights_field='playtime_minutes')
+    with app.app_context():
+        summary, written = upsert.run([
+            {'user_id': 'u1', 'genre_titles': ['RPG', 'Indie'], 'playtime_minutes': [10]},
+            {'user_id': 'u2', 'genre_titles': ['RPG'], 'playtime_minutes': ['ten']},
+            {'genre_id': 'g1', 'user_id': 'u2', 'genre_titles': ['Puzzle']},
+        ])
+        assert [e['index'] for e in summary['errors']] == [0, 1]
+        assert summary['errors'][0]['error'] == 'playtime_minutes must be a list of integers, one per title'
+        assert summary['created'] == 1
+        assert _playtime('g1') == [None]
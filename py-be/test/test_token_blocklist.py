@@ -0,0 +1,75 @@
+import uuid
+
+from app.services.cache import LocalClient
+from app.services.token_blocklist import BloomFilter, SharedStore, TokenBlocklist
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _login(client):
+    client.post('/api/user/create', json={
+        'user_name': 'ada', 'user_email': 'ada@example.com', 'user_password': 'pw'
+    })
+    token = client.post('/api/user/login', json={
+        'user_email': 'ada@example.com', 'user_password': 'pw'
+    }).get_json()['access_token']
+    return {'Authorization': 'Bearer ' + token}
+
+
+def test_logout_revokes_token(client):
+    headers = _login(client)
+    assert client.get('/api/user/get', headers=headers).status_code == 200
+
+    assert client.post('/api/user/logout', headers=headers).status_code == 200
+    response = client.get('/api/user/get', headers=headers)
+    assert response.status_code == 401
+    assert 'revoked' in response.get_json()['msg']
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    added = [str(uuid.uuid4()) for _ in range(1000)]
+    for jti in added:
+        bloom.add(jti)
+    assert all(bloom.might_contain(jti) for jti in added)
+    false_positives = sum(bloom.might_contain(str(uuid.uuid4())) for _ in range(10000))
+    assert false_positives < 300
+
+
+def test_entries_expire_with_their_token():
+    clock = Clock()
+    blocklist = TokenBlocklist(clock)
+    blocklist.revoke({'jti': 'a', 'exp': clock.now + 60})
+    assert blocklist.is_revoked('a')
+    assert not blocklist.is_revoked('b')
+
+    clock.now += 61
+    blocklist.revoke({'jti': 'c', 'exp': clock.now + 60})
+    assert not blocklist.is_revoked('a')
+    assert len(blocklist.store) == 1
+
+
+def test_shared_store_reaches_other_workers_after_sync():
+    clock = Clock()
+    client = LocalClient()
+    workers = []
+    for _ in range(2):
+        blocklist = TokenBlocklist(clock)
+        blocklist.shared = SharedStore(client)
+        blocklist.bloom = BloomFilter(1000, 0.001)
+        workers.append(blocklist)
+    first, second = workers
+
+    assert not second.is_revoked('a')
+    first.revoke({'jti': 'a', 'exp': clock.now + 600})
+    assert first.is_revoked('a')
+
+    clock.now += second.sync_interval
+    assert second.is_revoked('a')
+    assert not second.is_revoked('b')
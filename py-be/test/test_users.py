@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from app.models.user import User
+
+
+@pytest.fixture
+def auth(client):
+    for name in ('ada', 'bob', 'cy'):
+        client.post('/api/user/create', json={
+            'user_name': name, 'user_email': '%s@example.com' % name, 'user_password': 'pw'
+        })
+    token = client.post('/api/user/login', json={
+        'user_email': 'ada@example.com', 'user_password': 'pw'
+    }).get_json()['access_token']
+    return {'Authorization': 'Bearer ' + token}
+
+
+def test_fields_projection(client, auth):
+    items = client.get('/api/user/get', headers=auth).get_json()['items']
+    assert len(items) == 3
+    assert all(list(item) == list(User.PUBLIC_FIELDS) for item in items)
+
+    items = client.get('/api/user/get?fields=user_name', headers=auth).get_json()['items']
+    assert items == [{'user_name': 'ada'}, {'user_name': 'bob'}, {'user_name': 'cy'}]
+
+    items = client.get('/api/user/get?fields=user_email, user_id,user_email', headers=auth).get_json()['items']
+    assert [list(item) for item in items] == [['user_email', 'user_id']] * 3
+    assert items[0]['user_email'] == 'ada@example.com'
+
+
+def test_unknown_fields_are_rejected(client, auth):
+    response = client.get('/api/user/get?fields=user_name,nickname,role', headers=auth)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Unknown fields: nickname, role'}
+    assert client.get('/api/user/get?fields=user_name', headers={}).status_code == 401
+
+
+@pytest.mark.parametrize('fields', ['user_password_hash', 'user_id,user_password_hash', 'genre_id'])
+def test_private_columns_cannot_be_requested(client, auth, fields):
+    for query in ('', '&format=ndjson'):
+        response = client.get('/api/user/get?fields=' + fields + query, headers=auth)
+        assert response.status_code == 400
+        assert b'$2b$' not in response.get_data()
+
+
+def test_password_hash_is_never_returned(client, auth):
+    for query in ('', '?format=ndjson', '?limit=1'):
+        body = client.get('/api/user/get' + query, headers=auth).get_data()
+        assert b'user_password_hash' not in body and b'$2b$' not in body
+
+    lines = client.get('/api/user/get?format=ndjson&fields=user_name', headers=auth).get_data().splitlines()
+    assert [json.loads(line) for line in lines] == [{'user_name': 'ada'}, {'user_name': 'bob'}, {'user_name': 'cy'}]
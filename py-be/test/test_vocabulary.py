@@ -0,0 +1,89 @@
+import numpy as np
+from recom_system import GenreMatrix
+
+from app import db
+from app.models.genre import Genre, GenreTitle, GenreVocabulary
+from app.services.genre_index import GenreIndex, _genre_key
+from app.services.vocabulary import genre_vocabulary
+
+
+def users_with(client, *titles, mode='and'):
+    query = '&'.join('title=%s' % title for title in titles)
+    return client.get('/api/genre/users?%s&mode=%s' % (query, mode)).get_json()['user_ids']
+
+
+def test_titles_are_interned_once(app, client, users):
+    client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Action'], 'user_id': 'u1'})
+    client.post('/api/genre/bulk', json=[{'genre_titles': ['Action', 'Indie'], 'user_id': 'u2'}])
+
+    with app.app_context():
+        rows = dict(db.session.execute(db.select(GenreVocabulary.title, GenreVocabulary.title_id)).all())
+        assert sorted(rows) == ['Action', 'Indie', 'RPG']
+        assert genre_vocabulary.ids(rows) == rows
+        assert db.session.scalar(db.select(db.func.count()).where(GenreTitle.title_id == rows['Action'])) == 2
+
+    genres = client.get('/api/genre/get').get_json()['items']
+    assert sorted(g['genre_titles'] for g in genres) == [['Action', 'Indie'], ['RPG', 'Action']]
+
+
+def test_rolled_back_ids_are_not_cached(app, users):
+    with app.app_context():
+        ids = genre_vocabulary.intern(['Racing'])
+        assert genre_vocabulary.titles(list(ids.values())) == ['Racing']
+        db.session.rollback()
+        assert genre_vocabulary.ids(['Racing']) == {}
+
+        genre = Genre(user_id='u1', genre_titles=['Racing'])
+        db.session.add(genre)
+        db.session.commit()
+        assert genre_vocabulary.ids(['Racing']) == {'Racing': genre.titles[0].title_id}
+
+
+def test_index_follows_genre_writes(client, users):
+    first = client.post('/api/genre/create', json={'genre_titles': ['RPG', 'Action'], 'user_id': 'u1'}).get_json()
+    client.post('/api/genre/create', json={'genre_titles': ['RPG'], 'user_id': 'u1'})
+    client.post('/api/genre/create', json={'genre_titles': ['Action'], 'user_id': 'u2'})
+    assert users_with(client, 'RPG', 'Action') == ['u1']
+    assert users_with(client, 'RPG', 'Puzzle', mode='or') == ['u1']
+    assert users_with(client, 'RPG', 'Puzzle') == []
+
+    # u1 keeps RPG through their second genre
+    client.delete('/api/genre/delete/' + first['genre_id'])
+    assert users_with(client, 'RPG') == ['u1']
+    assert users_with(client, 'Action') == ['u2']
+
+    client.put('/api/genre/userId/u2', json={'genre_titles': ['RPG']})
+    assert users_with(client, 'RPG') == ['u1', 'u2']
+    assert users_with(client, 'Action') == []
+
+
+def test_index_moves_rows_between_users():
+    index = GenreIndex()
+    index.build([('g1', 'u1', [1, 2]), ('g2', 'u1', [2]), ('g3', 'u2', [3])])
+    assert index.user_title_ids() == (['u1', 'u2'], [[1, 2], [3]])
+
+    index._drop('u1', _genre_key('g2'))
+    index._put('u2', _genre_key('g2'), [2])
+    assert index.title_ids_for('u1') == [1, 2]
+    assert index.title_ids_for('u2') == [2, 3]
+    assert list(index._postings[2]) == [0, 1]
+
+    index._drop('u1', _genre_key('g1'))
+    assert index.user_title_ids() == (['u2'], [[2, 3]])
+    assert 1 not in index._postings
+
+
+def test_records_widen_past_16_bit_ids():
+    index = GenreIndex()
+    index.build([('g1', 'u1', [1])])
+    assert index._records[0].typecode == 'H'
+    index._put('u1', _genre_key('g2'), [70000])
+    assert index._records[0].typecode == 'I'
+    assert index.title_ids_for('u1') == [1, 70000]
+
+
+def test_matrix_from_title_ids():
+    matrix = GenreMatrix.from_title_ids(['u1', 'u2'], [[1, 3], [3]], [None, 'Action', None, 'RPG'])
+    assert matrix.shape == (2, 4)
+    assert np.array_equal(matrix.matrix.toarray(), [[0, 1, 0, 1], [0, 0, 0, 1]])
+    assert matrix.encode(['RPG', 'Unknown']).indices.tolist() == [3]
@@ -11,7 +11,7 @@ def test_get_genres():
         print(f"Status Code: {response.status_code}")
         
         # Print the JSON response
-        genres = response.json()
+        genres = response.json()['items']
         print("Genres:", len(genres[0]['genre_titles']))
         
     except requests.exceptions.HTTPError as http_err:
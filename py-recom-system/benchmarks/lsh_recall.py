@@ -0,0 +1,97 @@
+"""
+Recall-vs-exact benchmark for MinHashLSH.
+
+Generates a synthetic user x genre-title matrix with clustered tastes,
+builds an LSH index for each --bands/--rows setting, and compares its
+top-k for a sample of users against exact Jaccard top-k. Reports recall@k,
+query latency percentiles and build time, to help choose band/row values.
+
+    python benchmarks/lsh_recall.py --users 200000 --titles 2000 --config 16x4 --config 32x2
+"""
+#Import Library
+import argparse
+import tempfile
+import time
+import numpy as np
+import scipy.sparse as sp
+
+#Import Dependencies
+from recom_system import GenreMatrix, MinHashLSH, similar_users
+
+
+def synthetic_matrix(n_users, n_titles, titles_per_user, n_clusters, seed):
+    """
+    Users pick most titles from their cluster's favourites and the rest at
+    random, which gives the skewed overlap real libraries have.
+    """
+    rng = np.random.default_rng(seed)
+    favourites = rng.integers(0, n_titles, size=(n_clusters, titles_per_user * 2))
+    cluster = rng.integers(0, n_clusters, size=n_users)
+    from_cluster = favourites[cluster[:, None], rng.integers(0, titles_per_user * 2, size=(n_users, titles_per_user))]
+    noise = rng.integers(0, n_titles, size=(n_users, titles_per_user))
+    cols = np.where(rng.random((n_users, titles_per_user)) < 0.8, from_cluster, noise).ravel()
+    rows = np.repeat(np.arange(n_users), titles_per_user)
+    matrix = sp.csr_matrix((np.ones(len(rows), np.float32), (rows, cols)), shape=(n_users, n_titles))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return GenreMatrix([str(i) for i in range(n_users)], [str(j) for j in range(n_titles)], matrix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--titles-per-user', type=int, default=12)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--config', action='append', help='bandsxrows, e.g. 16x4 (repeatable)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    configs = [tuple(map(int, c.split('x'))) for c in (args.config or ['8x8', '16x4', '32x2'])]
+
+    genre_matrix = synthetic_matrix(args.users, args.titles, args.titles_per_user, args.clusters, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    sample = rng.choice(args.users, size=args.queries, replace=False)
+
+    started = time.perf_counter()
+    _, exact_idx, exact_scores = next(similar_users(genre_matrix.matrix, sample, args.k, 'jaccard',
+                                                    batch_size=len(sample)))
+    exact_seconds = (time.perf_counter() - started) / len(sample)
+    print('%d users x %d titles, exact top-%d: %.2f ms/query' % (
+        args.users, args.titles, args.k, exact_seconds * 1000))
+    print('%-8s %8s %10s %10s %10s %10s' % ('config', 'recall', 'p50 ms', 'p99 ms', 'build s', 'load s'))
+
+    for bands, rows in configs:
+        started = time.perf_counter()
+        index = MinHashLSH(bands, rows).fit(genre_matrix)
+        build_seconds = time.perf_counter() - started
+        with tempfile.TemporaryDirectory() as path:
+            index.save(path)
+            started = time.perf_counter()
+            index = MinHashLSH.load(path)
+            load_seconds = time.perf_counter() - started
+
+            hits, total, latencies = 0, 0, []
+            for i, row in enumerate(sample):
+                user_titles = [genre_matrix.titles[j] for j in genre_matrix.matrix[row].indices]
+                started = time.perf_counter()
+                found = index.query(user_titles, args.k, exclude=str(row))
+                latencies.append(time.perf_counter() - started)
+
+                # Ties at the k-th score make several answers equally exact,
+                # so count a hit for any result scoring at least that much
+                expected = exact_scores[i][exact_idx[i] >= 0]
+                if not len(expected):
+                    continue
+                threshold = expected[-1] - 1e-6
+                hits += min(len(expected), sum(1 for _, score in found if score >= threshold))
+                total += len(expected)
+
+        p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+        print('%-8s %8.3f %10.3f %10.3f %10.2f %10.3f' % (
+            '%dx%d' % (bands, rows), hits / max(total, 1), p50, p99, build_seconds, load_seconds))
+
+
+if __name__ == '__main__':
+    main()
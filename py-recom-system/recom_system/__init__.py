@@ -0,0 +1,10 @@
+from .matrix import GenreMatrix
+from .engine import Recommender
+from .lsh import MinHashLSH
+from .parallel import Checkpoint, matrix_fingerprint, recommend_parallel
+from .similarity import recommend_titles, similar_users, title_similarity
+
+__all__ = [
+    'Checkpoint', 'GenreMatrix', 'MinHashLSH', 'Recommender', 'matrix_fingerprint', 'recommend_parallel',
+    'recommend_titles', 'similar_users', 'title_similarity',
+]
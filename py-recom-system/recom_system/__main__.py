@@ -0,0 +1,33 @@
+#Import Library
+import argparse
+import time
+import sqlalchemy as sa
+
+#Import Dependencies
+from .engine import Recommender
+from .similarity import METRICS
+from .store import load_genre_matrix, write_recommendations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='recom_system', description='Recompute recommendations for every user.')
+    parser.add_argument('--database-url', required=True, help='e.g. sqlite:///instance/steam_recap.db')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--metric', choices=METRICS, default='cosine')
+    parser.add_argument('--batch-size', type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    engine = sa.create_engine(args.database_url)
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        genre_matrix = load_genre_matrix(conn)
+        users, titles = genre_matrix.shape
+        print('Loaded %d users x %d titles in %.1fs' % (users, titles, time.perf_counter() - started))
+
+        recommender = Recommender(genre_matrix, args.metric)
+        written = write_recommendations(conn, recommender.recommend_all(args.top_k, args.batch_size))
+    print('Wrote recommendations for %d users in %.1fs' % (written, time.perf_counter() - started))
+
+
+if __name__ == '__main__':
+    main()
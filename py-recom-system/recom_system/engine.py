@@ -0,0 +1,62 @@
+#Import Library
+import numpy as np
+
+#Import Dependencies
+from .similarity import DEFAULT_BATCH_SIZE, recommend_titles, similar_users, title_similarity
+
+
+class Recommender:
+    """
+    Genre-title recommender over a GenreMatrix.
+
+    Titles are scored item-to-item: a user's score for a title is the sum of
+    its similarity to every title the user already has. The title x title
+    similarity is computed once on construction.
+    """
+
+    def __init__(self, genre_matrix, metric='cosine'):
+        self.genre_matrix = genre_matrix
+        self.metric = metric
+        self.sim = title_similarity(genre_matrix.matrix, metric)
+
+    def recommend_all(self, k=10, batch_size=DEFAULT_BATCH_SIZE, rows=None):
+        """
+        Yield (user_id, [titles]) for every user (or the given matrix rows).
+        """
+        user_ids, titles = self.genre_matrix.user_ids, self.genre_matrix.titles
+        for batch_rows, top_idx, _ in recommend_titles(self.genre_matrix.matrix, self.sim, k, batch_size, rows):
+            for row, idx in zip(batch_rows, top_idx):
+                yield user_ids[row], [titles[j] for j in idx if j >= 0]
+
+    def recommend_for(self, owned_titles, k=10):
+        """
+        Recommend titles for an arbitrary title set, e.g. a user whose genres
+        changed after the matrix was built.
+        """
+        query = self.genre_matrix.encode(owned_titles)
+        _, top_idx, _ = next(recommend_titles(query, self.sim, k))
+        return [self.genre_matrix.titles[j] for j in top_idx[0] if j >= 0]
+
+    def similar_to(self, owned_titles, k=10, exclude=None):
+        """
+        Return [(user_id, score)] for the k users whose titles are most
+        similar to `owned_titles`, skipping `exclude` (usually the user
+        the titles belong to).
+        """
+        query = self.genre_matrix.encode(owned_titles)
+        _, top_idx, top_scores = next(similar_users(self.genre_matrix.matrix, np.array([-1]), k + 1, self.metric,
+                                                    queries=query))
+        user_ids = self.genre_matrix.user_ids
+        found = [(user_ids[j], float(s)) for j, s in zip(top_idx[0], top_scores[0]) if j >= 0]
+        return [(u, s) for u, s in found if u != exclude][:k]
+
+    def similar_users(self, user_id, k=10):
+        """
+        Return [(user_id, score)] for the k users most similar to `user_id`.
+        """
+        row = self.genre_matrix.user_index.get(user_id)
+        if row is None:
+            return []
+        _, top_idx, top_scores = next(similar_users(self.genre_matrix.matrix, np.array([row]), k, self.metric))
+        user_ids = self.genre_matrix.user_ids
+        return [(user_ids[j], float(s)) for j, s in zip(top_idx[0], top_scores[0]) if j >= 0]
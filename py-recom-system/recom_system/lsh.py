@@ -0,0 +1,171 @@
+#Import Library
+import json
+import os
+import numpy as np
+
+_PRIME = np.uint64((1 << 31) - 1)
+_EMPTY = np.uint32(0xFFFFFFFF)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with banded LSH over users' genre-title sets, for
+    approximate top-k similar-user lookup.
+
+    Each user gets bands * rows MinHash values. Every band is reduced to a
+    64-bit key, and per band the keys are stored sorted next to the user
+    rows they came from, so a lookup is one binary search per band. Two
+    users with Jaccard similarity s share at least one band with
+    probability 1 - (1 - s**rows)**bands. Candidates are then re-ranked by
+    exact Jaccard from the stored CSR arrays.
+
+    save() writes plain .npy files and load() memory-maps them, so a large
+    index opens instantly and is shared by every process via the page cache.
+    """
+
+    def __init__(self, bands=32, rows=2, seed=1):
+        self.bands = bands
+        self.rows = rows
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        num_perm = bands * rows
+        self.hash_a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self.hash_b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self.mix = rng.integers(1, 1 << 63, size=rows, dtype=np.uint64) | np.uint64(1)
+
+        self.titles = []
+        self.title_index = {}
+        self.user_ids = None
+        self.indptr = None
+        self.indices = None
+        self.band_keys = None
+        self.band_rows = None
+
+    def fit(self, genre_matrix, batch_size=65536):
+        """
+        Build the index from a GenreMatrix.
+        """
+        self.titles = list(genre_matrix.titles)
+        self.title_index = dict(genre_matrix.title_index)
+        self.user_ids = np.array([str(u) for u in genre_matrix.user_ids], dtype=np.bytes_)
+        matrix = genre_matrix.matrix
+        self.indptr = matrix.indptr.astype(np.int64)
+        self.indices = matrix.indices.astype(np.int32)
+
+        n_users = matrix.shape[0]
+        title_hashes = self._title_hashes(len(self.titles))
+        keys = np.empty((self.bands, n_users), dtype=np.uint64)
+        for start in range(0, n_users, batch_size):
+            stop = min(start + batch_size, n_users)
+            signatures = _signatures(title_hashes, self.indptr[start:stop + 1], self.indices)
+            keys[:, start:stop] = self._band_keys(signatures).T
+
+        order = np.argsort(keys, axis=1, kind='stable')
+        self.band_rows = order.astype(np.int32)
+        self.band_keys = np.take_along_axis(keys, order, axis=1)
+        return self
+
+    def query(self, titles, k=10, exclude=None, max_candidates=2000):
+        """
+        Return [(user_id, jaccard)] for up to k users similar to `titles`.
+        Titles unknown to the index are ignored.
+        """
+        cols = np.array(sorted({self.title_index[t] for t in titles if t in self.title_index}), dtype=np.int32)
+        if not len(cols):
+            return []
+
+        title_hashes = self._title_hashes(len(self.titles), cols)
+        signature = title_hashes.min(axis=0)
+        keys = self._band_keys(signature[None, :])[0]
+
+        candidates = []
+        per_band = max(1, max_candidates // self.bands)
+        for band, key in enumerate(keys):
+            band_keys = self.band_keys[band]
+            lo = np.searchsorted(band_keys, key, side='left')
+            hi = np.searchsorted(band_keys, key, side='right')
+            if hi > lo:
+                candidates.append(self.band_rows[band, lo:min(hi, lo + per_band)])
+        if not candidates:
+            return []
+
+        rows = np.unique(np.concatenate(candidates))
+        scores = self._jaccard(cols, rows)
+        order = np.argsort(-scores, kind='stable')
+        exclude = exclude.encode('utf-8') if isinstance(exclude, str) else exclude
+        found = []
+        for i in order:
+            user_id = self.user_ids[rows[i]]
+            if user_id == exclude:
+                continue
+            found.append((user_id.decode('utf-8'), float(scores[i])))
+            if len(found) == k:
+                break
+        return found
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in ('hash_a', 'hash_b', 'mix', 'user_ids', 'indptr', 'indices', 'band_keys', 'band_rows'):
+            np.save(os.path.join(path, name + '.npy'), getattr(self, name))
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'bands': self.bands, 'rows': self.rows, 'seed': self.seed, 'titles': self.titles}, f)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        index = cls(meta['bands'], meta['rows'], meta['seed'])
+        index.titles = meta['titles']
+        index.title_index = {t: j for j, t in enumerate(index.titles)}
+        for name in ('hash_a', 'hash_b', 'mix', 'user_ids', 'indptr', 'indices', 'band_keys', 'band_rows'):
+            setattr(index, name, np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode))
+        return index
+
+    def _title_hashes(self, n_titles, cols=None):
+        cols = np.arange(n_titles, dtype=np.uint64) if cols is None else cols.astype(np.uint64)
+        return ((cols[:, None] * self.hash_a[None, :] + self.hash_b[None, :]) % _PRIME).astype(np.uint32)
+
+    def _band_keys(self, signatures):
+        # Reduce each band of `rows` values to one 64-bit key; multiplication
+        # wraps modulo 2**64, which is what we want for mixing
+        banded = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        with np.errstate(over='ignore'):
+            return (banded * self.mix).sum(axis=2, dtype=np.uint64)
+
+    def _jaccard(self, cols, rows):
+        """
+        Exact Jaccard between the query columns and each candidate row,
+        vectorised by gathering every candidate's columns in one array.
+        """
+        starts, stops = self.indptr[rows], self.indptr[rows + 1]
+        lengths = stops - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(len(rows), dtype=np.float32)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        gather = np.arange(total) - np.repeat(offsets - starts, lengths)
+
+        in_query = np.zeros(len(self.titles), dtype=np.int32)
+        in_query[cols] = 1
+        hits = in_query[self.indices[gather]]
+        inter = np.zeros(len(rows), dtype=np.int64)
+        nonempty = lengths > 0
+        inter[nonempty] = np.add.reduceat(hits, offsets[nonempty])
+        union = len(cols) + lengths - inter
+        return (inter / np.maximum(union, 1)).astype(np.float32)
+
+
+def _signatures(title_hashes, indptr, indices):
+    """
+    MinHash signatures for the CSR rows described by `indptr`, computed as
+    a segmented minimum over the precomputed per-title hash rows.
+    """
+    n_rows = len(indptr) - 1
+    signatures = np.full((n_rows, title_hashes.shape[1]), _EMPTY, dtype=np.uint32)
+    lengths = np.diff(indptr)
+    nonempty = lengths > 0
+    if nonempty.any():
+        values = title_hashes[indices[indptr[0]:indptr[-1]]]
+        offsets = (indptr[:-1] - indptr[0])[nonempty]
+        signatures[nonempty] = np.minimum.reduceat(values, offsets, axis=0)
+    return signatures
@@ -0,0 +1,76 @@
+#Import Library
+from array import array
+import numpy as np
+import scipy.sparse as sp
+
+
+class GenreMatrix:
+    """
+    Binary user x genre-title matrix in CSR form.
+
+    Row i is user_ids[i], column j is titles[j]; a 1 means the user has that
+    title in any of their Genre rows.
+    """
+
+    def __init__(self, user_ids, titles, matrix):
+        self.user_ids = list(user_ids)
+        self.titles = list(titles)
+        self.matrix = matrix.tocsr()
+        self.user_index = {u: i for i, u in enumerate(self.user_ids)}
+        self.title_index = {t: j for j, t in enumerate(self.titles) if t is not None}
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """
+        Build from an iterable of (user_id, title) pairs, e.g. a streamed
+        SELECT user_id, title FROM genre_title. Duplicates are collapsed.
+        """
+        user_index, title_index = {}, {}
+        rows, cols = array('i'), array('i')
+        for user_id, title in pairs:
+            rows.append(user_index.setdefault(user_id, len(user_index)))
+            cols.append(title_index.setdefault(title, len(title_index)))
+
+        rows = np.frombuffer(rows, dtype=np.int32) if rows else np.zeros(0, np.int32)
+        cols = np.frombuffer(cols, dtype=np.int32) if cols else np.zeros(0, np.int32)
+        data = np.ones(len(rows), dtype=np.float32)
+        matrix = sp.csr_matrix((data, (rows, cols)), shape=(len(user_index), len(title_index)))
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0
+        return cls(user_index, title_index, matrix)
+
+    @classmethod
+    def from_user_titles(cls, user_titles):
+        """
+        Build from a mapping or iterable of (user_id, titles).
+        """
+        items = user_titles.items() if hasattr(user_titles, 'items') else user_titles
+        return cls.from_pairs((user_id, title) for user_id, titles in items for title in titles)
+
+    @classmethod
+    def from_title_ids(cls, user_ids, title_ids, titles):
+        """
+        Build from integer title ids: title_ids[i] holds the sorted, distinct
+        ids of user_ids[i], and column j is titles[j] (None for ids in no
+        use). The CSR arrays are assembled directly, without a pass over
+        (user, title) pairs.
+        """
+        lengths = np.fromiter((len(ids) for ids in title_ids), dtype=np.int64, count=len(title_ids))
+        indptr = np.zeros(len(title_ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.fromiter((j for ids in title_ids for j in ids), dtype=np.int32, count=int(indptr[-1]))
+        data = np.ones(len(indices), dtype=np.float32)
+        matrix = sp.csr_matrix((data, indices, indptr), shape=(len(user_ids), len(titles)))
+        return cls(user_ids, titles, matrix)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def encode(self, titles):
+        """
+        Encode a title set as a 1 x n_titles CSR row, ignoring unknown titles.
+        """
+        cols = sorted({self.title_index[t] for t in titles if t in self.title_index})
+        data = np.ones(len(cols), dtype=np.float32)
+        return sp.csr_matrix((data, (np.zeros(len(cols), np.int32), cols)), shape=(1, len(self.titles)))
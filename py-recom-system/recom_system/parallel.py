@@ -0,0 +1,113 @@
+#Import Library
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import scipy.sparse as sp
+
+#Import Dependencies
+from .similarity import recommend_titles
+
+DEFAULT_SHARD_SIZE = 20000
+
+# Set in each worker by _init_worker; the arrays are read-only memory maps
+_worker_state = {}
+
+
+def recommend_parallel(genre_matrix, sim, k, workers=None, shard_size=DEFAULT_SHARD_SIZE, skip_shards=(),
+                       batch_size=4096):
+    """
+    Compute top-k title recommendations for every user across a pool of
+    processes and yield (shard_id, [(user_id, titles)]) as shards finish,
+    in completion order.
+
+    The CSR arrays and the similarity matrix are written once to .npy files
+    and memory-mapped by every worker, so they are shared through the page
+    cache instead of being pickled into each process. Shards listed in
+    `skip_shards` are not computed (used to resume an interrupted run).
+    """
+    n_users = genre_matrix.shape[0]
+    shards = [(shard_id, start, min(start + shard_size, n_users))
+              for shard_id, start in enumerate(range(0, n_users, shard_size))
+              if shard_id not in skip_shards]
+    if not shards:
+        return
+
+    tmpdir = tempfile.mkdtemp(prefix='recom_system_')
+    try:
+        matrix = genre_matrix.matrix
+        for name, values in (('data', matrix.data), ('indices', matrix.indices), ('indptr', matrix.indptr),
+                             ('sim', sim)):
+            np.save(os.path.join(tmpdir, name + '.npy'), values)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(tmpdir, matrix.shape)) as pool:
+            futures = [pool.submit(_recommend_shard, shard_id, start, stop, k, batch_size)
+                       for shard_id, start, stop in shards]
+            user_ids, titles = genre_matrix.user_ids, genre_matrix.titles
+            for future in as_completed(futures):
+                shard_id, start, top_idx = future.result()
+                yield shard_id, [
+                    (user_ids[start + i], [titles[j] for j in row if j >= 0])
+                    for i, row in enumerate(top_idx)
+                ]
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def matrix_fingerprint(genre_matrix, *params):
+    """
+    Stable digest of the matrix contents and run parameters, used to check
+    that a checkpoint belongs to the same input before resuming from it.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([list(genre_matrix.shape), list(params)]).encode('utf-8'))
+    digest.update('\0'.join(map(str, genre_matrix.user_ids)).encode('utf-8'))
+    digest.update(np.ascontiguousarray(genre_matrix.matrix.indptr).tobytes())
+    digest.update(np.ascontiguousarray(genre_matrix.matrix.indices).tobytes())
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Records finished shard ids in a JSON file, rewritten atomically after
+    each shard so an interrupted run can resume where it stopped.
+    """
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.done = set()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            if state.get('fingerprint') == fingerprint:
+                self.done = set(state.get('done', []))
+
+    def mark(self, shard_id):
+        self.done.add(shard_id)
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprint': self.fingerprint, 'done': sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+
+    def finish(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _init_worker(tmpdir, shape):
+    load = lambda name: np.load(os.path.join(tmpdir, name + '.npy'), mmap_mode='r')
+    _worker_state['matrix'] = sp.csr_matrix((load('data'), load('indices'), load('indptr')), shape=shape, copy=False)
+    _worker_state['sim'] = load('sim')
+
+
+def _recommend_shard(shard_id, start, stop, k, batch_size):
+    top = [idx for _, idx, _ in recommend_titles(_worker_state['matrix'], _worker_state['sim'], k, batch_size,
+                                                 rows=np.arange(start, stop))]
+    return shard_id, start, np.vstack(top).astype(np.int32)
@@ -0,0 +1,106 @@
+#Import Library
+import numpy as np
+
+METRICS = ('cosine', 'jaccard')
+DEFAULT_BATCH_SIZE = 4096
+
+
+def title_similarity(matrix, metric='cosine'):
+    """
+    Dense n_titles x n_titles similarity between genre titles, computed from
+    their co-occurrence across users. The diagonal is zeroed.
+
+    This is the only pairwise step, and it is over titles (a few thousand),
+    never over users, so it stays cheap at any user count.
+    """
+    _check_metric(metric)
+    co = (matrix.T @ matrix).toarray().astype(np.float32)
+    counts = np.diag(co).copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if metric == 'cosine':
+            sim = co / np.sqrt(np.outer(counts, counts))
+        else:
+            sim = co / (counts[:, None] + counts[None, :] - co)
+    sim = np.nan_to_num(sim, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    np.fill_diagonal(sim, 0.0)
+    return sim
+
+
+def recommend_titles(matrix, sim, k, batch_size=DEFAULT_BATCH_SIZE, rows=None):
+    """
+    Score every title for each user as the sum of its similarity to the
+    titles the user already has, and yield (row_ids, top_idx, top_scores)
+    per batch. Owned titles and zero scores are never recommended; missing
+    slots are padded with index -1.
+    """
+    n_rows, n_titles = matrix.shape
+    rows = np.arange(n_rows) if rows is None else np.asarray(rows)
+    k = min(k, n_titles)
+
+    for start in range(0, len(rows), batch_size):
+        batch_rows = rows[start:start + batch_size]
+        owned = matrix[batch_rows]
+        scores = np.asarray(owned @ sim)
+        if k == 0:
+            yield batch_rows, np.zeros((len(batch_rows), 0), np.int64), scores[:, :0]
+            continue
+        # Owned titles are excluded by forcing their score below any real one
+        r, c = owned.nonzero()
+        scores[r, c] = -np.inf
+        top_idx, top_scores = _top_k(scores, k)
+        top_idx[top_scores <= 0] = -1
+        yield batch_rows, top_idx, top_scores
+
+
+def similar_users(matrix, rows, k, metric='cosine', batch_size=DEFAULT_BATCH_SIZE, queries=None):
+    """
+    Exact top-k most similar users for the given matrix rows (or for the
+    1 x n_titles `queries` rows when given). Yields (row_ids, top_idx,
+    top_scores) per batch, padded with -1 where fewer than k users overlap.
+
+    The product is sparse, so cost is driven by how many users share a
+    title with the query rows; use it for a bounded set of rows, not all.
+    """
+    _check_metric(metric)
+    rows = np.asarray(rows)
+    counts = np.diff(matrix.indptr).astype(np.float32)
+    matrix_t = matrix.T.tocsr()
+
+    for start in range(0, len(rows), batch_size):
+        batch_rows = rows[start:start + batch_size]
+        query = matrix[batch_rows] if queries is None else queries[start:start + batch_size]
+        query_counts = np.diff(query.indptr).astype(np.float32)
+        inter = (query @ matrix_t).tocsr()
+
+        top_idx = np.full((len(batch_rows), k), -1, dtype=np.int64)
+        top_scores = np.zeros((len(batch_rows), k), dtype=np.float32)
+        for i in range(len(batch_rows)):
+            lo, hi = inter.indptr[i], inter.indptr[i + 1]
+            cols, values = inter.indices[lo:hi], inter.data[lo:hi]
+            if queries is None:
+                keep = cols != batch_rows[i]
+                cols, values = cols[keep], values[keep]
+            if not len(cols):
+                continue
+            if metric == 'cosine':
+                values = values / np.sqrt(query_counts[i] * counts[cols])
+            else:
+                values = values / (query_counts[i] + counts[cols] - values)
+            n = min(k, len(cols))
+            best = np.argpartition(-values, n - 1)[:n]
+            best = best[np.argsort(-values[best], kind='stable')]
+            top_idx[i, :n] = cols[best]
+            top_scores[i, :n] = values[best]
+        yield batch_rows, top_idx, top_scores
+
+
+def _top_k(scores, k):
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def _check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError('metric must be one of %s' % ', '.join(METRICS))
@@ -0,0 +1,106 @@
+#Import Library
+import uuid
+from datetime import datetime, timezone
+import sqlalchemy as sa
+
+#Import Dependencies
+from .matrix import GenreMatrix
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# recommendation.recommendation_source of the rows written here. Only these
+# are replaced or deleted; rows created through the API are left alone
+SOURCE = 'recommender'
+
+# Lightweight views of the py-be tables; only the columns used here
+genre_title = sa.table('genre_title', sa.column('user_id'), sa.column('title_id'))
+genre_vocabulary = sa.table('genre_vocabulary', sa.column('title_id'), sa.column('title'))
+recommendation = sa.table(
+    'recommendation', sa.column('recommendation_id'), sa.column('user_id'), sa.column('recommendation_date_added'),
+    sa.column('recommendation_source')
+)
+recommendation_title = sa.table(
+    'recommendation_title', sa.column('recommendation_id'), sa.column('position'), sa.column('title'),
+    sa.column('user_id')
+)
+
+
+def load_genre_matrix(conn, batch_size=50000):
+    """
+    Stream every (user_id, title) pair out of genre_title, with titles
+    resolved through genre_vocabulary, into a GenreMatrix.
+    """
+    # Ordered so that user rows (and therefore shard boundaries) are stable
+    # between runs, which resuming a batch job relies on
+    query = sa.select(genre_title.c.user_id, genre_vocabulary.c.title) \
+        .select_from(genre_title.join(genre_vocabulary, genre_title.c.title_id == genre_vocabulary.c.title_id)) \
+        .where(genre_title.c.user_id.is_not(None)) \
+        .order_by(genre_title.c.user_id, genre_vocabulary.c.title)
+    result = conn.execution_options(yield_per=batch_size).execute(query)
+    return GenreMatrix.from_pairs(result)
+
+
+def write_recommendations(conn, items, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Replace the generated recommendations of every user in `items`
+    ((user_id, titles) pairs) with one new Recommendation row each. Writes are executemany
+    batches of `chunk_size` users, each batch committed on its own.
+    Returns the number of users written.
+    """
+    written = 0
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            written += _write_chunk(conn, chunk)
+            chunk = []
+    if chunk:
+        written += _write_chunk(conn, chunk)
+    return written
+
+
+def delete_recommendations(conn, user_ids):
+    """
+    Remove the generated recommendations of the given users.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    try:
+        _delete_generated(conn, user_ids)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _write_chunk(conn, chunk):
+    now = datetime.now(timezone.utc)
+    user_ids = [user_id for user_id, _ in chunk]
+    parents, children = [], []
+    for user_id, titles in chunk:
+        recommendation_id = str(uuid.uuid4())
+        parents.append({'recommendation_id': recommendation_id, 'user_id': user_id, 'recommendation_date_added': now,
+                        'recommendation_source': SOURCE})
+        children.extend(
+            {'recommendation_id': recommendation_id, 'position': i, 'title': title, 'user_id': user_id}
+            for i, title in enumerate(titles)
+        )
+
+    try:
+        _delete_generated(conn, user_ids)
+        conn.execute(recommendation.insert(), parents)
+        if children:
+            conn.execute(recommendation_title.insert(), children)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(chunk)
+
+
+def _delete_generated(conn, user_ids):
+    generated = sa.and_(recommendation.c.user_id.in_(user_ids), recommendation.c.recommendation_source == SOURCE)
+    stale = sa.select(recommendation.c.recommendation_id).where(generated)
+    conn.execute(recommendation_title.delete().where(recommendation_title.c.recommendation_id.in_(stale)))
+    conn.execute(recommendation.delete().where(generated))
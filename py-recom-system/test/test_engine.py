@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from recom_system import GenreMatrix, Recommender, recommend_titles, similar_users, title_similarity
+
+# A and B share user a, A and C share user b, B and C share nobody:
+#   cosine  A-B 1/sqrt(2*2) = 0.5,  A-C 1/sqrt(2*1) = 0.7071, B-C 0
+#   jaccard A-B 1/(2+2-1)   = 1/3,  A-C 1/(2+1-1)   = 0.5,    B-C 0
+USER_TITLES = {'a': ['A', 'B'], 'b': ['A', 'C'], 'c': ['B']}
+
+
+@pytest.fixture
+def genre_matrix():
+    return GenreMatrix.from_user_titles(USER_TITLES)
+
+
+@pytest.mark.parametrize('metric, ab, ac', [('cosine', 0.5, 2 ** -0.5), ('jaccard', 1 / 3, 0.5)])
+def test_title_similarity(genre_matrix, metric, ab, ac):
+    sim = title_similarity(genre_matrix.matrix, metric)
+    np.testing.assert_allclose(sim, [[0, ab, ac], [ab, 0, 0], [ac, 0, 0]], rtol=1e-6)
+
+
+def test_title_similarity_rejects_unknown_metric(genre_matrix):
+    with pytest.raises(ValueError):
+        title_similarity(genre_matrix.matrix, 'euclidean')
+
+
+def test_recommend_titles_orders_and_pads(genre_matrix):
+    sim = title_similarity(genre_matrix.matrix)
+    rows, top_idx, top_scores = next(recommend_titles(genre_matrix.matrix, sim, 2))
+    assert rows.tolist() == [0, 1, 2]
+    # a owns A and B, b owns A and C, c owns B: only A scores for c
+    assert top_idx.tolist() == [[2, -1], [1, -1], [0, -1]]
+    np.testing.assert_allclose(top_scores[:, 0], [2 ** -0.5, 0.5, 0.5], rtol=1e-6)
+
+    # A query owning only A ranks C (0.7071) above B (0.5)
+    query = genre_matrix.encode(['A'])
+    _, top_idx, top_scores = next(recommend_titles(query, sim, 3))
+    assert top_idx.tolist() == [[2, 1, -1]]
+    _, top_idx, _ = next(recommend_titles(query, sim, 1))
+    assert top_idx.tolist() == [[2]]
+
+
+def test_recommend_titles_batches(genre_matrix):
+    sim = title_similarity(genre_matrix.matrix)
+    whole = next(recommend_titles(genre_matrix.matrix, sim, 2))[1]
+    batches = list(recommend_titles(genre_matrix.matrix, sim, 2, batch_size=2, rows=[2, 0, 1]))
+    assert [b[0].tolist() for b in batches] == [[2, 0], [1]]
+    assert np.vstack([b[1] for b in batches]).tolist() == whole[[2, 0, 1]].tolist()
+
+
+@pytest.mark.parametrize('metric, to_b, to_c', [('cosine', 0.5, 2 ** -0.5), ('jaccard', 1 / 3, 0.5)])
+def test_similar_users(genre_matrix, metric, to_b, to_c):
+    _, top_idx, top_scores = next(similar_users(genre_matrix.matrix, [0, 2], 3, metric))
+    # a overlaps c more than b; c only overlaps a
+    assert top_idx.tolist() == [[2, 1, -1], [0, -1, -1]]
+    np.testing.assert_allclose(top_scores[0, :2], [to_c, to_b], rtol=1e-6)
+
+
+def test_recommender(genre_matrix):
+    recommender = Recommender(genre_matrix)
+    assert dict(recommender.recommend_all(k=2)) == {'a': ['C'], 'b': ['B'], 'c': ['A']}
+    assert recommender.recommend_for(['A', 'Unknown'], k=5) == ['C', 'B']
+    assert recommender.recommend_for([]) == []
+
+    assert [u for u, _ in recommender.similar_users('a')] == ['c', 'b']
+    assert recommender.similar_users('missing') == []
+    assert [u for u, _ in recommender.similar_to(['A', 'B'], exclude='a')] == ['c', 'b']
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from recom_system import GenreMatrix, MinHashLSH, similar_users
+
+
+@pytest.fixture(scope='module')
+def genre_matrix():
+    # Users draw most titles from one of a few clusters, as real libraries do
+    rng = np.random.default_rng(11)
+    n_users, n_titles, per_user = 600, 120, 8
+    favourites = rng.integers(0, n_titles, size=(12, per_user * 2))
+    cluster = rng.integers(0, len(favourites), size=n_users)
+    picks = favourites[cluster[:, None], rng.integers(0, per_user * 2, size=(n_users, per_user))]
+    noise = rng.integers(0, n_titles, size=(n_users, per_user))
+    cols = np.where(rng.random((n_users, per_user)) < 0.8, picks, noise).ravel()
+    rows = np.repeat(np.arange(n_users), per_user)
+    matrix = sp.csr_matrix((np.ones(len(rows), np.float32), (rows, cols)), shape=(n_users, n_titles))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return GenreMatrix(['u%d' % i for i in range(n_users)], ['t%d' % j for j in range(n_titles)], matrix)
+
+
+@pytest.fixture(scope='module')
+def index(genre_matrix):
+    return MinHashLSH(bands=32, rows=2).fit(genre_matrix)
+
+
+def _titles(genre_matrix, row):
+    return [genre_matrix.titles[j] for j in genre_matrix.matrix[row].indices]
+
+
+def test_recall_against_exact_jaccard(genre_matrix, index):
+    k = 10
+    sample = np.arange(0, genre_matrix.shape[0], 15)
+    _, exact_idx, exact_scores = next(similar_users(genre_matrix.matrix, sample, k, 'jaccard'))
+    owned = [set(_titles(genre_matrix, row)) for row in range(genre_matrix.shape[0])]
+
+    hits = total = 0
+    for i, row in enumerate(sample):
+        found = index.query(owned[row], k, exclude=genre_matrix.user_ids[row])
+        assert len(found) <= k
+        assert genre_matrix.user_ids[row] not in dict(found)
+        # Candidates are re-ranked by exact Jaccard
+        for user_id, score in found:
+            other = owned[genre_matrix.user_index[user_id]]
+            assert score == pytest.approx(len(owned[row] & other) / len(owned[row] | other))
+        assert [s for _, s in found] == sorted((s for _, s in found), reverse=True)
+
+        # Ties at the k-th score make several answers equally exact
+        expected = exact_scores[i][exact_idx[i] >= 0]
+        threshold = expected[-1] - 1e-6
+        hits += min(len(expected), sum(1 for _, score in found if score >= threshold))
+        total += len(expected)
+    assert hits / total >= 0.9
+
+
+def test_identical_users_are_always_found(genre_matrix, index):
+    titles = _titles(genre_matrix, 7)
+    assert index.query(titles, 1)[0] == ('u7', 1.0)
+    assert index.query(['unknown']) == []
+
+
+def test_save_and_load_round_trip(tmp_path, genre_matrix, index):
+    index.save(str(tmp_path))
+    assert (tmp_path / 'band_keys.npy').exists() and (tmp_path / 'meta.json').exists()
+
+    loaded = MinHashLSH.load(str(tmp_path))
+    assert (loaded.bands, loaded.rows, loaded.seed) == (32, 2, 1)
+    assert loaded.titles == index.titles
+    for name in ('hash_a', 'hash_b', 'mix', 'user_ids', 'indptr', 'indices', 'band_keys', 'band_rows'):
+        assert isinstance(getattr(loaded, name), np.memmap)
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(index, name))
+
+    for row in range(0, genre_matrix.shape[0], 50):
+        titles = _titles(genre_matrix, row)
+        assert loaded.query(titles, 5, exclude='u%d' % row) == index.query(titles, 5, exclude='u%d' % row)
+
+    in_memory = MinHashLSH.load(str(tmp_path), mmap_mode=None)
+    assert not isinstance(in_memory.band_keys, np.memmap)
+    assert in_memory.query(_titles(genre_matrix, 3), 5) == index.query(_titles(genre_matrix, 3), 5)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from recom_system import GenreMatrix
+
+
+def test_from_pairs_collapses_duplicates():
+    genre_matrix = GenreMatrix.from_pairs([('a', 'RPG'), ('a', 'Action'), ('b', 'RPG'), ('a', 'RPG')])
+    assert genre_matrix.user_ids == ['a', 'b']
+    assert genre_matrix.titles == ['RPG', 'Action']
+    assert genre_matrix.shape == (2, 2)
+    assert genre_matrix.matrix.toarray().tolist() == [[1, 1], [1, 0]]
+    assert genre_matrix.matrix.nnz == 3
+
+
+def test_from_pairs_empty():
+    genre_matrix = GenreMatrix.from_pairs([])
+    assert genre_matrix.shape == (0, 0)
+    assert genre_matrix.user_ids == [] and genre_matrix.titles == []
+
+
+def test_constructors_agree():
+    user_titles = {'a': ['RPG', 'Action'], 'b': ['RPG'], 'c': ['Indie', 'Action']}
+    from_titles = GenreMatrix.from_user_titles(user_titles)
+    assert from_titles.titles == ['RPG', 'Action', 'Indie']
+    assert from_titles.matrix.toarray().tolist() == [[1, 1, 0], [1, 0, 0], [0, 1, 1]]
+
+    # Vocabulary ids, with id 1 unused
+    titles = ['RPG', None, 'Action', 'Indie']
+    from_ids = GenreMatrix.from_title_ids(['a', 'b', 'c'], [[0, 2], [0], [2, 3]], titles)
+    assert from_ids.shape == (3, 4)
+    assert from_ids.title_index == {'RPG': 0, 'Action': 2, 'Indie': 3}
+    assert from_ids.matrix.toarray()[:, [0, 2, 3]].tolist() == from_titles.matrix.toarray().tolist()
+    assert not from_ids.matrix[:, 1].nnz
+
+
+def test_encode_ignores_unknown_titles():
+    genre_matrix = GenreMatrix.from_user_titles({'a': ['RPG', 'Action'], 'b': ['Indie']})
+    row = genre_matrix.encode(['Indie', 'Puzzle', 'RPG', 'RPG'])
+    assert row.shape == (1, 3)
+    assert row.toarray().tolist() == [[1, 0, 1]]
+    assert genre_matrix.encode([]).nnz == 0
+    assert row.dtype == np.float32
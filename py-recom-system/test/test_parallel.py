@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from recom_system import Checkpoint, GenreMatrix, Recommender, matrix_fingerprint, recommend_parallel
+
+
+@pytest.fixture
+def genre_matrix():
+    rng = np.random.default_rng(3)
+    matrix = sp.csr_matrix((rng.random((23, 12)) < 0.3).astype(np.float32))
+    return GenreMatrix(['u%02d' % i for i in range(23)], ['t%02d' % j for j in range(12)], matrix)
+
+
+@pytest.fixture
+def recommender(genre_matrix):
+    return Recommender(genre_matrix)
+
+
+def test_parallel_matches_serial(genre_matrix, recommender):
+    shards = dict(recommend_parallel(genre_matrix, recommender.sim, 4, workers=2, shard_size=5))
+    assert sorted(shards) == [0, 1, 2, 3, 4]
+    assert [len(items) for _, items in sorted(shards.items())] == [5, 5, 5, 5, 3]
+    parallel = [item for _, items in sorted(shards.items()) for item in items]
+    assert parallel == list(recommender.recommend_all(4))
+
+
+def test_finished_shards_are_skipped(genre_matrix, recommender):
+    shards = dict(recommend_parallel(genre_matrix, recommender.sim, 4, workers=2, shard_size=5, skip_shards={0, 3}))
+    assert sorted(shards) == [1, 2, 4]
+    assert shards[1][0][0] == 'u05'
+    assert list(recommend_parallel(genre_matrix, recommender.sim, 4, shard_size=5, skip_shards=range(5))) == []
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path, genre_matrix, recommender):
+    path = str(tmp_path / 'rebuild.json')
+    fingerprint = matrix_fingerprint(genre_matrix, 'cosine', 4, 5)
+    written = {}
+
+    progress = Checkpoint(path, fingerprint)
+    for shard_id, items in recommend_parallel(genre_matrix, recommender.sim, 4, workers=2, shard_size=5):
+        written.update(items)
+        progress.mark(shard_id)
+        break
+    first = set(progress.done)
+
+    progress = Checkpoint(path, fingerprint)
+    assert progress.done == first
+    resumed = []
+    for shard_id, items in recommend_parallel(genre_matrix, recommender.sim, 4, workers=2, shard_size=5,
+                                              skip_shards=progress.done):
+        written.update(items)
+        progress.mark(shard_id)
+        resumed.append(shard_id)
+    assert first.isdisjoint(resumed)
+    assert progress.done == {0, 1, 2, 3, 4}
+    assert written == dict(recommender.recommend_all(4))
+
+    progress.finish()
+    assert not (tmp_path / 'rebuild.json').exists()
+    assert Checkpoint(path, fingerprint).done == set()
+
+
+def test_fingerprint_mismatch_restarts(tmp_path, genre_matrix):
+    path = str(tmp_path / 'rebuild.json')
+    fingerprint = matrix_fingerprint(genre_matrix, 'cosine', 4, 5)
+    progress = Checkpoint(path, fingerprint)
+    progress.mark(0)
+    progress.mark(2)
+    assert Checkpoint(path, fingerprint).done == {0, 2}
+
+    # Other run parameters, or a matrix that changed since the checkpoint
+    assert Checkpoint(path, matrix_fingerprint(genre_matrix, 'cosine', 10, 5)).done == set()
+    changed = genre_matrix.matrix.tolil()
+    changed[0, 0] = 0 if changed[0, 0] else 1
+    changed = GenreMatrix(genre_matrix.user_ids, genre_matrix.titles, changed.tocsr())
+    assert matrix_fingerprint(changed, 'cosine', 4, 5) != fingerprint
+    assert Checkpoint(path, matrix_fingerprint(changed, 'cosine', 4, 5)).done == set()